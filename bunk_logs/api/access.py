@@ -0,0 +1,108 @@
+"""
+Cached access scope: which bunks and units a user can reach.
+
+Permission classes and querysets resolve a user's bunks through
+``get_access_scope`` instead of querying the counselor and unit head
+relations on every request. Scopes are cached per user under a global
+version; any change to counselor assignments, unit heads or which unit a
+bunk belongs to bumps the version (see api/signals.py), which retires
+every cached scope at once. Those changes are rare admin edits, so a
+global version keeps invalidation simple without costing many rebuilds.
+"""
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from bunks.models import Bunk
+from bunks.models import Unit
+
+ACCESS_SCOPE_PREFIX = "access_scope"
+ACCESS_SCOPE_VERSION_KEY = f"{ACCESS_SCOPE_PREFIX}:version"
+
+
+@dataclass(frozen=True)
+class AccessScope:
+    """The bunks a user counsels, the units they head and those units' bunks."""
+
+    user_id: int
+    bunk_ids: frozenset
+    unit_ids: frozenset
+    unit_bunk_ids: frozenset
+
+    @property
+    def visible_bunk_ids(self):
+        return self.bunk_ids | self.unit_bunk_ids
+
+    def counsels_bunk(self, bunk_id):
+        return _as_id(bunk_id) in self.bunk_ids
+
+    def heads_bunk(self, bunk_id):
+        return _as_id(bunk_id) in self.unit_bunk_ids
+
+
+def _as_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _get_version():
+    version = cache.get(ACCESS_SCOPE_VERSION_KEY)
+    if version is None:
+        # Seed with a timestamp so an evicted version never reuses an old key
+        cache.add(ACCESS_SCOPE_VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(ACCESS_SCOPE_VERSION_KEY)
+    return version
+
+
+def get_access_scope_version():
+    """The global scope version; it moves whenever any cached scope may be stale."""
+    return _get_version()
+
+
+def _bump_version():
+    try:
+        cache.incr(ACCESS_SCOPE_VERSION_KEY)
+    except ValueError:
+        cache.set(ACCESS_SCOPE_VERSION_KEY, int(time.time() * 1000), timeout=None)
+
+
+def invalidate_access_scopes():
+    """Retire every cached scope, now and again once the change commits."""
+    _bump_version()
+    transaction.on_commit(_bump_version)
+
+
+def build_access_scope(user_id):
+    """Load a user's scope from the database (three small id-only queries)."""
+    unit_ids = frozenset(Unit.objects.filter(unit_head_id=user_id).values_list("id", flat=True))
+    return AccessScope(
+        user_id=user_id,
+        bunk_ids=frozenset(
+            Bunk.counselors.through.objects.filter(user_id=user_id).values_list("bunk_id", flat=True),
+        ),
+        unit_ids=unit_ids,
+        unit_bunk_ids=frozenset(
+            Bunk.objects.filter(unit_id__in=unit_ids).values_list("id", flat=True),
+        ) if unit_ids else frozenset(),
+    )
+
+
+def get_access_scope(request):
+    """Return the scope of ``request.user`` from the cache, building it on a miss."""
+    scope = getattr(request, "_access_scope", None)
+    if scope is not None:
+        return scope
+    user_id = request.user.pk
+    key = f"{ACCESS_SCOPE_PREFIX}:{_get_version()}:{user_id}"
+    scope = cache.get(key)
+    if scope is None:
+        scope = build_access_scope(user_id)
+        cache.set(key, scope, timeout=settings.ACCESS_SCOPE_CACHE_TIMEOUT)
+    # Permission checks and the queryset share one lookup per request
+    request._access_scope = scope
+    return scope
@@ -1,6 +1,12 @@
+import contextlib
+
 from django.apps import AppConfig
 
 
 class ApiConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "api"
+
+    def ready(self):
+        with contextlib.suppress(ImportError):
+            import bunk_logs.api.signals  # noqa: F401
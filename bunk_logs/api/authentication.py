@@ -0,0 +1,118 @@
+"""
+JWT authentication that skips the user lookup on most requests.
+
+simplejwt's JWTAuthentication loads the User row for every request after
+decoding the token. CachedJWTAuthentication caches a compact principal of
+the few fields the API reads off ``request.user`` instead, keyed by the
+user, a per-user version and the token's ``jti``. Saving or deleting a
+user bumps their version (see api/signals.py), which retires every cached
+principal of that user at once. A principal also records the access scope
+version it was built under and is rebuilt once that moves, so a cached
+principal never outlives a change to who can reach which bunks.
+
+On a hit ``request.user`` is a User built from the principal with the
+other fields deferred: reading one of them loads it from the database, so
+code that needs more than the principal still works, just without the
+saving. Views that serialize the whole user load it with ``full_user``.
+
+Only saves and deletes go through the signals, so a queryset ``update()``
+or raw SQL that changes a user, such as bulk deactivation, leaves their
+principals cached: a deactivated user keeps authenticating for up to
+AUTH_PRINCIPAL_CACHE_TIMEOUT. Call ``invalidate_principal`` for each user
+after such an update.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router
+from django.db import transaction
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from bunk_logs.users.models import User
+
+from .access import ACCESS_SCOPE_VERSION_KEY
+from .access import get_access_scope_version
+
+PRINCIPAL_PREFIX = "auth_principal"
+PRINCIPAL_FIELDS = ("id", "email", "first_name", "last_name", "role", "is_staff", "is_superuser", "is_active")
+
+
+def _user_version_key(user_id):
+    return f"{PRINCIPAL_PREFIX}:user:{user_id}:version"
+
+
+def _get_user_version(user_id):
+    key = _user_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        # Seed with a timestamp so an evicted version never reuses an old key
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def _bump_user_version(user_id):
+    try:
+        cache.incr(_user_version_key(user_id))
+    except ValueError:
+        cache.set(_user_version_key(user_id), int(time.time() * 1000), timeout=None)
+
+
+def invalidate_principal(user_id):
+    """Retire every cached principal of a user, now and again once the change commits."""
+    _bump_user_version(user_id)
+    transaction.on_commit(lambda: _bump_user_version(user_id))
+
+
+def build_principal(user, scope_version):
+    return {
+        **{name: getattr(user, name) for name in PRINCIPAL_FIELDS},
+        "scope_version": scope_version,
+    }
+
+
+def principal_user(principal):
+    """A User holding the principal's fields, with every other field deferred."""
+    names = [field.attname for field in User._meta.concrete_fields if field.attname in PRINCIPAL_FIELDS]
+    return User.from_db(router.db_for_read(User), names, [principal[name] for name in names])
+
+
+def full_user(user):
+    """The user with every field loaded, re-read if it was built from a principal."""
+    if not user.get_deferred_fields():
+        return user
+    return User.objects.get(pk=user.pk)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that resolves the token's user from a cached principal."""
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        jti = validated_token.get(api_settings.JTI_CLAIM)
+        if user_id is None or jti is None:
+            return super().get_user(validated_token)
+
+        version_key = _user_version_key(user_id)
+        # Both versions in one round trip; either is seeded on a miss
+        versions = cache.get_many([version_key, ACCESS_SCOPE_VERSION_KEY])
+        user_version = versions.get(version_key) or _get_user_version(user_id)
+        scope_version = versions.get(ACCESS_SCOPE_VERSION_KEY) or get_access_scope_version()
+        key = f"{PRINCIPAL_PREFIX}:{user_id}:{user_version}:{jti}"
+
+        principal = cache.get(key)
+        if principal is not None and principal["scope_version"] == scope_version:
+            return principal_user(principal)
+
+        # The parent checks that the user exists and is active, so only
+        # principals of active users are ever cached
+        user = super().get_user(validated_token)
+        timeout = min(
+            int(validated_token.get("exp", 0) - time.time()),
+            settings.AUTH_PRINCIPAL_CACHE_TIMEOUT,
+        )
+        if timeout > 0:
+            cache.set(key, build_principal(user, scope_version), timeout=timeout)
+        return user
@@ -0,0 +1,86 @@
+"""
+Response cache for the per-bunk/per-date roster endpoint.
+
+Rosters are cached under a key built from the bunk id, a per-bunk version
+and the date. Log writes delete the key for their (bunk, date) pair, while
+changes that affect every date of a bunk (assignments, counselors, bunk
+details) bump the bunk version so all of its cached dates are dropped at once.
+Keys are built from an int bunk id and a ``date``, never from raw URL text,
+so every spelling of a bunk and date reads and invalidates the same entry.
+"""
+import time
+from datetime import date as date_cls
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+ROSTER_CACHE_PREFIX = "bunklog_roster"
+
+
+def _normalize_date(date):
+    return date if isinstance(date, date_cls) else date_cls.fromisoformat(str(date))
+
+
+def _bunk_version_key(bunk_id):
+    return f"{ROSTER_CACHE_PREFIX}:bunk:{int(bunk_id)}:version"
+
+
+def _get_bunk_version(bunk_id):
+    key = _bunk_version_key(bunk_id)
+    version = cache.get(key)
+    if version is None:
+        # Seed with a timestamp so an evicted version never reuses an old key
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def roster_cache_key(bunk_id, date):
+    """Return the cache key for a bunk roster on a date."""
+    return f"{ROSTER_CACHE_PREFIX}:{int(bunk_id)}:{_get_bunk_version(bunk_id)}:{_normalize_date(date).isoformat()}"
+
+
+def _roster_timeout(date):
+    """Past dates rarely change, so they are kept much longer than today's roster."""
+    if _normalize_date(date) < timezone.localdate():
+        return settings.BUNKLOG_ROSTER_CACHE_PAST_TIMEOUT
+    return settings.BUNKLOG_ROSTER_CACHE_TIMEOUT
+
+
+def get_cached_roster(bunk_id, date):
+    """Return the cached roster payload, or None on a miss."""
+    return cache.get(roster_cache_key(bunk_id, date))
+
+
+def set_cached_roster(bunk_id, date, data):
+    """Store a roster payload for a bunk and date."""
+    cache.set(roster_cache_key(bunk_id, date), data, timeout=_roster_timeout(date))
+
+
+def _delete_roster(bunk_id, date):
+    cache.delete(roster_cache_key(bunk_id, date))
+
+
+def _bump_bunk_version(bunk_id):
+    key = _bunk_version_key(bunk_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Version key was missing or evicted; start a fresh one
+        cache.set(key, int(time.time() * 1000), timeout=None)
+
+
+def invalidate_roster(bunk_id, date):
+    """Drop the cached roster for a single bunk and date."""
+    # Drop it now and again once the write commits, so a roster read between
+    # the two cannot keep serving pre-commit data.
+    _delete_roster(bunk_id, date)
+    transaction.on_commit(lambda: _delete_roster(bunk_id, date))
+
+
+def invalidate_bunk_rosters(bunk_id):
+    """Drop every cached roster for a bunk by bumping its version."""
+    _bump_bunk_version(bunk_id)
+    transaction.on_commit(lambda: _bump_bunk_version(bunk_id))
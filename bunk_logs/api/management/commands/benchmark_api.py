@@ -0,0 +1,196 @@
+import json
+import statistics
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db import transaction
+from django.test.utils import CaptureQueriesContext
+from django.test.utils import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from bunk_logs.api.cache import invalidate_bunk_rosters
+from bunklogs.models import BunkLog
+from bunklogs.services.seed import generate_camp
+from bunks.models import Bunk
+from campers.models import CamperBunkAssignment
+
+
+def _percentile(values, percent):
+    ordered = sorted(values)
+    index = max(round(percent / 100 * len(ordered)) - 1, 0)
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay the main API flows (roster load, batch log entry, unit head overview, "
+        "camper history) and report p50/p95 latency and query counts"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20, help="Requests per flow")
+        parser.add_argument(
+            "--seed",
+            action="store_true",
+            help="Run against a generated camp that is rolled back afterwards",
+        )
+        parser.add_argument("--save-baseline", type=Path, help="Write the results to this JSON file")
+        parser.add_argument("--baseline", type=Path, help="Compare the results to this JSON file")
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=20.0,
+            help="Allowed p95 slowdown against the baseline, in percent",
+        )
+
+    def handle(self, *args, **options):
+        # Writes made by the batch flow (and --seed data) are always rolled back
+        with transaction.atomic(), override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+        ):
+            if options["seed"]:
+                self.stdout.write("Generating camp dataset...")
+                generate_camp(label="Benchmark")
+            results = self._run(options["iterations"])
+            transaction.set_rollback(True)
+
+        self._report(results)
+        if options["save_baseline"]:
+            options["save_baseline"].write_text(json.dumps(results, indent=2, sort_keys=True))
+            self.stdout.write(f"Baseline written to {options['save_baseline']}")
+        if options["baseline"]:
+            self._compare(results, json.loads(options["baseline"].read_text()), options["tolerance"])
+
+    def _fixtures(self):
+        bunk = (
+            Bunk.objects.filter(
+                counselors__isnull=False,
+                unit__unit_head__isnull=False,
+                camper_assignments__is_active=True,
+            )
+            .select_related("unit__unit_head", "session")
+            .order_by("-session__start_date", "id")
+            .first()
+        )
+        if bunk is None:
+            msg = "No bunk with counselors, a unit head and campers; run seed_camp or pass --seed."
+            raise CommandError(msg)
+        assignments = list(
+            CamperBunkAssignment.objects.filter(bunk=bunk, is_active=True).order_by("id"),
+        )
+        log_date = (
+            BunkLog.objects.filter(bunk_assignment__bunk=bunk)
+            .order_by("-date")
+            .values_list("date", flat=True)
+            .first()
+        ) or bunk.session.start_date
+        return {
+            "bunk": bunk,
+            "counselor": bunk.counselors.order_by("id").first(),
+            "unit_head": bunk.unit.unit_head,
+            "camper_id": assignments[0].camper_id,
+            "camper_ids": [assignment.camper_id for assignment in assignments],
+            "date": log_date.isoformat(),
+        }
+
+    def _flows(self, fixtures):
+        bunk = fixtures["bunk"]
+        roster_url = reverse("bunklog-by-date", kwargs={"bunk_id": bunk.id, "date": fixtures["date"]})
+        batch_url = reverse("bunklog-batch", kwargs={"bunk_id": bunk.id, "date": fixtures["date"]})
+        batch_payload = {
+            "logs": [
+                {
+                    "camper_id": camper_id,
+                    "social_score": 4,
+                    "behavior_score": 4,
+                    "participation_score": 4,
+                    "description": "Benchmark entry",
+                }
+                for camper_id in fixtures["camper_ids"]
+            ],
+        }
+
+        def roster_cold(client):
+            invalidate_bunk_rosters(bunk.id)
+            return client.get(roster_url)
+
+        return [
+            ("roster (cold cache)", fixtures["counselor"], roster_cold),
+            ("roster (warm cache)", fixtures["counselor"], lambda client: client.get(roster_url)),
+            (
+                "batch log entry",
+                fixtures["counselor"],
+                lambda client: client.post(batch_url, batch_payload, format="json"),
+            ),
+            (
+                "unit head overview",
+                fixtures["unit_head"],
+                lambda client: client.get(reverse("bunklog-list") + "?page_size=100"),
+            ),
+            (
+                "camper history",
+                fixtures["unit_head"],
+                lambda client: client.get(
+                    reverse("camper-history", kwargs={"camper_id": fixtures["camper_id"]}),
+                ),
+            ),
+        ]
+
+    def _run(self, iterations):
+        results = {}
+        for name, user, request in self._flows(self._fixtures()):
+            client = APIClient()
+            client.force_authenticate(user=user)
+            timings = []
+            queries = []
+            for _ in range(iterations):
+                with CaptureQueriesContext(connection) as context:
+                    started = time.perf_counter()
+                    response = request(client)
+                    elapsed = (time.perf_counter() - started) * 1000
+                if response.status_code >= 400:
+                    msg = f"{name} returned {response.status_code}: {response.content[:200]!r}"
+                    raise CommandError(msg)
+                timings.append(elapsed)
+                queries.append(len(context.captured_queries))
+            results[name] = {
+                "p50_ms": round(statistics.median(timings), 2),
+                "p95_ms": round(_percentile(timings, 95), 2),
+                "queries": max(queries),
+            }
+        return results
+
+    def _report(self, results):
+        self.stdout.write(f"\n{'flow':<24}{'p50 ms':>10}{'p95 ms':>10}{'queries':>10}")
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<24}{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}{result['queries']:>10}",
+            )
+
+    def _compare(self, results, baseline, tolerance):
+        regressions = []
+        self.stdout.write("\nAgainst baseline:")
+        for name, result in results.items():
+            previous = baseline.get(name)
+            if previous is None:
+                self.stdout.write(f"  {name}: no baseline")
+                continue
+            change = (result["p95_ms"] - previous["p95_ms"]) / previous["p95_ms"] * 100 if previous["p95_ms"] else 0
+            line = (
+                f"  {name}: p95 {previous['p95_ms']:.2f} -> {result['p95_ms']:.2f} ms ({change:+.1f}%), "
+                f"queries {previous['queries']} -> {result['queries']}"
+            )
+            if change > tolerance or result["queries"] > previous["queries"]:
+                regressions.append(name)
+                self.stdout.write(self.style.ERROR(line))
+            else:
+                self.stdout.write(self.style.SUCCESS(line))
+        if regressions:
+            msg = f"Regressions against baseline: {', '.join(regressions)}"
+            raise CommandError(msg)
+
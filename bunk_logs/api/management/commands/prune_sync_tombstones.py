@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from bunk_logs.api.sync import SYNC_TOMBSTONE_RETENTION
+from bunk_logs.api.sync import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = "Delete sync tombstones older than the sync cursor retention window"
+
+    def handle(self, *args, **options):
+        deleted = prune_tombstones()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Deleted {deleted} tombstones older than {SYNC_TOMBSTONE_RETENTION.days} days",
+            ),
+        )
@@ -0,0 +1,174 @@
+"""
+Per-endpoint query and latency instrumentation.
+
+QueryMetricsMiddleware times every API request and records, per URL name,
+the number of SQL queries, time spent in the database, in view code (mostly
+serialization) and rendering the response, and the response size. Each
+response carries the numbers in a ``Server-Timing`` header, and the running
+totals are exposed in Prometheus text format at ``/api/v1/metrics``.
+
+Views can declare ``query_budget = <int>``; requests that run more queries
+than that are logged as a warning so N+1 regressions show up in the logs.
+"""
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+METRIC_PREFIX = "bunklogs_api"
+INSTRUMENTED_PATH_PREFIX = "/api/"
+
+# (metric suffix, help text, aggregate key)
+METRICS = [
+    ("requests_total", "Requests handled.", "requests"),
+    ("db_queries_total", "SQL queries run.", "queries"),
+    ("db_seconds_total", "Time spent in SQL queries.", "db_seconds"),
+    ("app_seconds_total", "Time spent in view code outside SQL, mostly serialization.", "app_seconds"),
+    ("render_seconds_total", "Time spent rendering responses.", "render_seconds"),
+    ("response_seconds_total", "Total time spent handling requests.", "total_seconds"),
+    ("response_bytes_total", "Response body bytes.", "response_bytes"),
+    ("query_budget_exceeded_total", "Requests that ran more queries than their budget.", "over_budget"),
+]
+
+
+class MetricsRegistry:
+    """In-process running totals keyed by URL name; one registry per worker process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = defaultdict(lambda: defaultdict(float))
+
+    def record(self, endpoint, **values):
+        with self._lock:
+            totals = self._endpoints[endpoint]
+            for key, value in values.items():
+                totals[key] += value
+
+    def snapshot(self):
+        with self._lock:
+            return {endpoint: dict(totals) for endpoint, totals in self._endpoints.items()}
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+    def render(self):
+        """Return the totals in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = []
+        for suffix, help_text, key in METRICS:
+            name = f"{METRIC_PREFIX}_{suffix}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for endpoint in sorted(snapshot):
+                value = snapshot[endpoint].get(key, 0)
+                lines.append(f'{name}{{endpoint="{endpoint}"}} {value:g}')
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+class _QueryRecorder:
+    """connection.execute_wrapper hook that counts queries and their duration."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.count += 1
+
+
+def _view_class(resolver_match):
+    func = resolver_match.func
+    # DRF views expose the class as .cls, Django class-based views as .view_class
+    return getattr(func, "cls", None) or getattr(func, "view_class", None)
+
+
+def _response_size(response):
+    if response.streaming:
+        return 0
+    return len(response.content)
+
+
+class QueryMetricsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not request.path.startswith(INSTRUMENTED_PATH_PREFIX):
+            return self.get_response(request)
+
+        recorder = _QueryRecorder()
+        request._metrics_render = [0.0, 0.0]
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+
+        resolver_match = getattr(request, "resolver_match", None)
+        if resolver_match is None:
+            return response
+
+        render_started, render_finished = request._metrics_render
+        render = max(render_finished - render_started, 0.0)
+        app = max(total - recorder.seconds - render, 0.0)
+        response["Server-Timing"] = ", ".join(
+            [
+                f'db;dur={recorder.seconds * 1000:.1f};desc="{recorder.count} queries"',
+                f"app;dur={app * 1000:.1f}",
+                f"render;dur={render * 1000:.1f}",
+                f"total;dur={total * 1000:.1f}",
+            ],
+        )
+
+        endpoint = resolver_match.view_name
+        budget = getattr(_view_class(resolver_match), "query_budget", None)
+        over_budget = budget is not None and recorder.count > budget
+        if over_budget:
+            logger.warning(
+                "%s ran %d queries, over its budget of %d (%s %s)",
+                endpoint,
+                recorder.count,
+                budget,
+                request.method,
+                request.path,
+            )
+        registry.record(
+            endpoint,
+            requests=1,
+            queries=recorder.count,
+            db_seconds=recorder.seconds,
+            app_seconds=app,
+            render_seconds=render,
+            total_seconds=total,
+            response_bytes=_response_size(response),
+            over_budget=int(over_budget),
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after the view returns; time that step
+        timings = getattr(request, "_metrics_render", None)
+        if timings is None:
+            return response
+        timings[0] = time.perf_counter()
+
+        def _rendered(rendered_response):
+            timings[1] = time.perf_counter()
+
+        response.add_post_render_callback(_rendered)
+        return response
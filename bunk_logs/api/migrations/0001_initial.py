@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_type', models.CharField(choices=[('bunk', 'Bunk'), ('camper', 'Camper'), ('assignment', 'Camper bunk assignment'), ('bunk_log', 'Bunk log')], max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('bunk_id', models.BigIntegerField(blank=True, null=True)),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'tombstone',
+                'verbose_name_plural': 'tombstones',
+                'indexes': [models.Index(fields=['deleted_at'], name='tombstone_deleted_at_idx')],
+            },
+        ),
+    ]
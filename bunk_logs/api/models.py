@@ -1 +1,37 @@
-# Create your models here.
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class Tombstone(models.Model):
+    """
+    Record of a deleted row, so delta sync clients can drop it from their
+    local copy. ``bunk_id`` is the bunk the row belonged to and is used to
+    scope tombstones to the users who could see the row.
+    """
+
+    BUNK = "bunk"
+    CAMPER = "camper"
+    ASSIGNMENT = "assignment"
+    BUNK_LOG = "bunk_log"
+
+    OBJECT_TYPE_CHOICES = [
+        (BUNK, "Bunk"),
+        (CAMPER, "Camper"),
+        (ASSIGNMENT, "Camper bunk assignment"),
+        (BUNK_LOG, "Bunk log"),
+    ]
+
+    object_type = models.CharField(max_length=20, choices=OBJECT_TYPE_CHOICES)
+    object_id = models.BigIntegerField()
+    bunk_id = models.BigIntegerField(null=True, blank=True)
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("tombstone")
+        verbose_name_plural = _("tombstones")
+        indexes = [
+            models.Index(fields=["deleted_at"], name="tombstone_deleted_at_idx"),
+        ]
+
+    def __str__(self):
+        return f"Deleted {self.object_type} {self.object_id}"
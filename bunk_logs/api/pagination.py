@@ -0,0 +1,142 @@
+import json
+from itertools import islice
+
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.pagination import _reverse_ordering
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Cursor (keyset) pagination used by every ModelViewSet in the API.
+
+    Views set ``cursor_ordering`` to a stable ordering ending in a unique
+    field, e.g. ``("-date", "id")``. DRF's CursorPagination only encodes the
+    first field and pages through ties with an OFFSET; here the cursor holds
+    the values of every ordering field and the next page is found with a
+    tuple comparison on all of them, written out as
+    ``date < d OR (date = d AND id > i)`` so mixed directions work. Pages
+    never need an offset, however many rows share a date.
+
+    Page size defaults to REST_FRAMEWORK["PAGE_SIZE"] and can be changed per
+    request with ``?page_size=`` up to ``max_page_size``.
+    """
+    ordering = ("id",)
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, "cursor_ordering", self.ordering)
+        if isinstance(ordering, str):
+            return (ordering,)
+        return tuple(ordering)
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for field in ordering:
+            attr = field.lstrip("-")
+            values.append(instance[attr] if isinstance(instance, dict) else getattr(instance, attr))
+        return json.dumps(values, cls=JSONEncoder)
+
+    def _keyset_filter(self, position, reverse):
+        """Rows after ``position`` in the ordering (before it for reverse cursors)."""
+        try:
+            values = json.loads(position)
+        except ValueError:
+            values = None
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        after = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, values, strict=True):
+            attr = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") != reverse else "gt"
+            after |= equal & Q(**{f"{attr}__{lookup}": value})
+            equal &= Q(**{attr: value})
+        return after
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # CursorPagination.paginate_queryset with the keyset filter; positions
+        # are unique, so the offset stays 0 unless a client sends one
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        offset, reverse, current_position = self.cursor or (0, False, None)
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if current_position is not None:
+            queryset = queryset.filter(self._keyset_filter(current_position, reverse))
+
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = results[:self.page_size]
+        following_position = None
+        if len(results) > len(self.page):
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = current_position is not None or offset > 0
+            self.has_previous = following_position is not None
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next = following_position is not None
+            self.has_previous = current_position is not None or offset > 0
+            self.next_position = following_position
+            self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+
+def _batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class StreamingListMixin:
+    """
+    Adds an opt-in ``?stream=1`` mode to ``list``.
+
+    Instead of a page, the whole (filtered) queryset is streamed as a JSON array.
+    Rows are read through a server-side cursor and serialized in chunks, so
+    memory stays bounded no matter how many rows are returned.
+    """
+    stream_chunk_size = 500
+
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get("stream") in ("1", "true"):
+            return self.stream_list(request)
+        return super().list(request, *args, **kwargs)
+
+    def stream_list(self, request):
+        ordering = self.paginator.get_ordering(request, None, self) if self.paginator else ("id",)
+        queryset = self.filter_queryset(self.get_queryset()).order_by(*ordering)
+        serializer_class = self.get_serializer_class()
+        context = self.get_serializer_context()
+        chunk_size = self.stream_chunk_size
+
+        def generate():
+            yield "["
+            separator = ""
+            rows = queryset.iterator(chunk_size=chunk_size)
+            for batch in _batched(rows, chunk_size):
+                for item in serializer_class(batch, many=True, context=context).data:
+                    yield separator + json.dumps(item, cls=JSONEncoder)
+                    separator = ","
+            yield "]"
+
+        return StreamingHttpResponse(generate(), content_type="application/json")
@@ -1,6 +1,8 @@
 from rest_framework import permissions
 import logging
 
+from .access import get_access_scope
+
 logger = logging.getLogger(__name__)
 
 class IsCounselorForBunk(permissions.BasePermission):
@@ -35,30 +37,20 @@ class IsCounselorForBunk(permissions.BasePermission):
         
         logger.debug(f"Found bunk_id: {bunk_id}")
         
+        # Bunk access comes from the cached scope, not a per-request query
+        scope = get_access_scope(request)
+
         # Unit heads can access bunks in their units
         if request.user.role == 'Unit Head':
-            from bunks.models import Bunk
-            has_access = Bunk.objects.filter(
-                id=bunk_id, 
-                unit__unit_head=request.user
-            ).exists()
+            has_access = scope.heads_bunk(bunk_id)
             logger.debug(f"Unit Head access to bunk {bunk_id}: {has_access}")
             return has_access
         
         # Counselors can access their assigned bunks
         if request.user.role == 'Counselor':
-            from bunks.models import Bunk
-            has_access = Bunk.objects.filter(
-                id=bunk_id, 
-                counselors__id=request.user.id
-            ).exists()
-            
+            has_access = scope.counsels_bunk(bunk_id)
             logger.debug(f"Counselor access to bunk {bunk_id}: {has_access}")
-            
-            # Log all assigned bunks for debugging
-            assigned_bunk_ids = list(Bunk.objects.filter(counselors__id=request.user.id).values_list('id', flat=True))
-            logger.debug(f"User is assigned to bunk IDs: {assigned_bunk_ids}")
-            
+            logger.debug(f"User is assigned to bunk IDs: {sorted(scope.bunk_ids)}")
             return has_access
         
         # Default deny
@@ -118,11 +110,7 @@ class UnitHeadPermission(permissions.BasePermission):
             return False
         
         # Check if the bunk belongs to a unit managed by this unit head
-        from bunks.models import Bunk
-        return Bunk.objects.filter(
-            id=bunk_id, 
-            unit__unit_head=request.user
-        ).exists()
+        return get_access_scope(request).heads_bunk(bunk_id)
 
 
 class CamperCarePermission(permissions.BasePermission):
@@ -7,7 +7,9 @@ from bunks.models import Bunk
 from bunks.models import Cabin
 from bunks.models import Session
 from bunks.models import Unit
+from bunklogs.models import BunkDailySummary
 from bunklogs.models import BunkLog
+from bunklogs.models import UnitDailySummary
 
 
 class CabinSerializer(serializers.ModelSerializer):
@@ -172,3 +174,141 @@ class CamperBunkLogSerializer(serializers.ModelSerializer):
     def get_bunk(self, obj):
         return SimpleBunkSerializer(obj.bunk_assignment.bunk).data  # Use SimpleBunkSerializer
 
+
+
+SCORE_RANGE_ERROR = "Score must be between 1 and 5"
+
+
+def _score_field():
+    return serializers.IntegerField(
+        min_value=1,
+        max_value=5,
+        required=False,
+        allow_null=True,
+        default=None,
+        error_messages={"min_value": SCORE_RANGE_ERROR, "max_value": SCORE_RANGE_ERROR},
+    )
+
+
+class BunkLogBatchItemSerializer(serializers.Serializer):
+    """
+    One camper's entry in a batch bunk log submission.
+    Only validates the payload; assignment lookups and duplicate checks are
+    done by the view against a single prefetch for the whole bunk.
+    """
+    camper_id = serializers.IntegerField()
+    not_on_camp = serializers.BooleanField(required=False, default=False)
+    social_score = _score_field()
+    behavior_score = _score_field()
+    participation_score = _score_field()
+    request_camper_care_help = serializers.BooleanField(required=False, default=False)
+    request_unit_head_help = serializers.BooleanField(required=False, default=False)
+    description = serializers.CharField(required=False, allow_blank=True, default="")
+
+
+DAILY_SUMMARY_FIELDS = [
+    "date",
+    "log_count",
+    "not_on_camp_count",
+    "avg_social_score",
+    "avg_behavior_score",
+    "avg_participation_score",
+    "camper_care_help_count",
+    "unit_head_help_count",
+]
+
+
+class BunkDailySummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = BunkDailySummary
+        fields = ["bunk", *DAILY_SUMMARY_FIELDS]
+
+
+class UnitDailySummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UnitDailySummary
+        fields = ["unit", "bunk_count", *DAILY_SUMMARY_FIELDS]
+
+
+# Output key -> BunkLog lookup, in the order camper history log rows are read
+HISTORY_LOG_COLUMNS = {
+    "id": "id",
+    "date": "date",
+    "assignment_id": "bunk_assignment_id",
+    "bunk_id": "bunk_assignment__bunk_id",
+    "counselor_id": "counselor_id",
+    "not_on_camp": "not_on_camp",
+    "social_score": "social_score",
+    "behavior_score": "behavior_score",
+    "participation_score": "participation_score",
+    "request_camper_care_help": "request_camper_care_help",
+    "request_unit_head_help": "request_unit_head_help",
+    "description": "description",
+}
+
+
+def _history_user(user):
+    return {
+        "id": user.id,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "email": user.email,
+    }
+
+
+class CamperHistorySerializer(serializers.BaseSerializer):
+    """
+    Normalized camper history: the camper, their bunks and the counselors
+    involved are listed once, and each log refers to them by id.
+
+    Hand-written rather than nested ModelSerializers so each log costs one
+    dict build. Takes a dict with ``camper``, ``assignments`` (with bunk,
+    cabin, session, unit and counselors loaded), ``logs`` (value tuples in
+    HISTORY_LOG_COLUMNS order) and ``authors`` (users who wrote logs).
+    """
+
+    def to_representation(self, instance):
+        camper = instance["camper"]
+        bunks = {}
+        counselors = {user.id: _history_user(user) for user in instance["authors"]}
+        assignments = []
+        for assignment in instance["assignments"]:
+            bunk = assignment.bunk
+            if bunk.id not in bunks:
+                bunk_counselors = list(bunk.counselors.all())
+                counselors.update((user.id, _history_user(user)) for user in bunk_counselors)
+                bunks[bunk.id] = {
+                    "id": bunk.id,
+                    "name": bunk.name,
+                    "cabin": {"id": bunk.cabin.id, "name": bunk.cabin.name} if bunk.cabin else None,
+                    "session": {
+                        "id": bunk.session.id,
+                        "name": bunk.session.name,
+                        "start_date": bunk.session.start_date,
+                        "end_date": bunk.session.end_date,
+                    },
+                    "unit": {"id": bunk.unit.id, "name": bunk.unit.name} if bunk.unit else None,
+                    "counselor_ids": [user.id for user in bunk_counselors],
+                }
+            assignments.append({
+                "id": assignment.id,
+                "bunk_id": bunk.id,
+                "start_date": assignment.start_date,
+                "end_date": assignment.end_date,
+                "is_active": assignment.is_active,
+            })
+        return {
+            "camper": {
+                "id": camper.id,
+                "first_name": camper.first_name,
+                "last_name": camper.last_name,
+                "date_of_birth": camper.date_of_birth,
+                "camper_notes": camper.camper_notes,
+                "parent_notes": camper.parent_notes,
+                "status_note": camper.status_note,
+            },
+            "bunks": list(bunks.values()),
+            "assignments": assignments,
+            "counselors": list(counselors.values()),
+            "logs": [dict(zip(HISTORY_LOG_COLUMNS, row)) for row in instance["logs"]],
+        }
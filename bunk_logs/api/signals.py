@@ -0,0 +1,269 @@
+from django.db.models.signals import m2m_changed
+from django.db.models.signals import post_delete
+from django.db.models.signals import post_save
+from django.db.models.signals import pre_delete
+from django.db.models.signals import pre_save
+from django.dispatch import receiver
+
+from api.models import Tombstone
+from bunk_logs.users.models import User
+from bunklogs.models import BunkLog
+from bunklogs.signals import bunk_logs_bulk_saved
+from bunklogs.signals import refresh_bunk_summaries_on_commit
+from bunklogs.signals import refresh_moved_bunk_summaries
+from bunks.models import Bunk
+from bunks.models import Cabin
+from bunks.models import Session
+from bunks.models import Unit
+from bunks.signals import reference_data_bulk_saved
+from campers.models import Camper
+from campers.models import CamperBunkAssignment
+from campers.signals import camper_bunk_assignments_bulk_saved
+from campers.signals import campers_bulk_saved
+
+from .access import invalidate_access_scopes
+from .authentication import invalidate_principal
+from .cache import invalidate_bunk_rosters
+from .cache import invalidate_roster
+from .watchlist import invalidate_camper_risk
+
+
+def _invalidate_bunks(bunk_ids):
+    for bunk_id in set(bunk_ids):
+        if bunk_id is not None:
+            invalidate_bunk_rosters(bunk_id)
+
+
+# Every single save or delete goes through one receiver per model and
+# signal: the bunk (and date) a row is in before and after the write is
+# worked out once, then handed to the rosters, access scopes, watchlist
+# scores, daily summaries and sync tombstones that depend on it.
+
+# BunkLog: a log moved to another date or assignment must leave no trace in
+# its old (bunk, date).
+@receiver(pre_save, sender=BunkLog)
+def remember_previous_bunk_log_key(sender, instance, **kwargs):
+    instance._previous_key = None
+    if instance.pk:
+        instance._previous_key = BunkLog.objects.filter(pk=instance.pk).values_list(
+            "bunk_assignment__bunk_id", "date",
+        ).first()
+
+
+def _bunk_log_key(instance):
+    """The (bunk_id, date) of a log; no query when its assignment is loaded."""
+    if BunkLog.bunk_assignment.is_cached(instance):
+        return instance.bunk_assignment.bunk_id, instance.date
+    bunk_id = CamperBunkAssignment.objects.filter(
+        pk=instance.bunk_assignment_id,
+    ).values_list("bunk_id", flat=True).first()
+    return bunk_id, instance.date
+
+
+@receiver(post_save, sender=BunkLog)
+@receiver(post_delete, sender=BunkLog)
+def bunk_log_changed(sender, instance, signal, **kwargs):
+    key = _bunk_log_key(instance)
+    keys = {key}
+    previous = getattr(instance, "_previous_key", None)
+    if previous:
+        keys.add(previous)
+    for bunk_id, date in keys:
+        if bunk_id is not None:
+            invalidate_roster(bunk_id, date)
+    invalidate_camper_risk(bunk_id for bunk_id, _ in keys)
+    refresh_bunk_summaries_on_commit(keys)
+    if signal is post_delete:
+        # Tagged with the bunk the log belonged to, so clients that could
+        # see it drop their copy on their next sync
+        Tombstone.objects.create(object_type=Tombstone.BUNK_LOG, object_id=instance.pk, bunk_id=key[0])
+
+
+@receiver(bunk_logs_bulk_saved)
+def invalidate_bulk_saved_rosters(sender, keys, **kwargs):
+    for bunk_id, date in keys:
+        invalidate_roster(bunk_id, date)
+
+
+# Assignments change the camper list of every date for a bunk.
+@receiver(pre_save, sender=CamperBunkAssignment)
+def remember_previous_assignment_bunk(sender, instance, **kwargs):
+    instance._previous_bunk_id = None
+    if instance.pk:
+        instance._previous_bunk_id = CamperBunkAssignment.objects.filter(
+            pk=instance.pk,
+        ).values_list("bunk_id", flat=True).first()
+
+
+@receiver(post_save, sender=CamperBunkAssignment)
+def assignment_saved(sender, instance, created, **kwargs):
+    previous_bunk_id = getattr(instance, "_previous_bunk_id", None)
+    _invalidate_bunks([instance.bunk_id, previous_bunk_id])
+    if created or previous_bunk_id in (None, instance.bunk_id):
+        return
+    # Moved to another bunk, taking its logs along: clients of the old bunk
+    # lose the assignment and its logs, and both bunks' scores and daily
+    # summaries change
+    bunk_ids = (previous_bunk_id, instance.bunk_id)
+    logs = list(BunkLog.objects.filter(bunk_assignment=instance).values_list("id", "date"))
+    invalidate_camper_risk(bunk_ids)
+    refresh_bunk_summaries_on_commit({(bunk_id, day) for bunk_id in bunk_ids for _, day in logs})
+    Tombstone.objects.bulk_create([
+        Tombstone(object_type=Tombstone.ASSIGNMENT, object_id=instance.pk, bunk_id=previous_bunk_id),
+        *(
+            Tombstone(object_type=Tombstone.BUNK_LOG, object_id=log_id, bunk_id=previous_bunk_id)
+            for log_id, _ in logs
+        ),
+    ])
+
+
+@receiver(post_delete, sender=CamperBunkAssignment)
+def assignment_deleted(sender, instance, **kwargs):
+    _invalidate_bunks([instance.bunk_id, getattr(instance, "_previous_bunk_id", None)])
+    Tombstone.objects.create(object_type=Tombstone.ASSIGNMENT, object_id=instance.pk, bunk_id=instance.bunk_id)
+
+
+@receiver(camper_bunk_assignments_bulk_saved)
+def invalidate_bulk_saved_assignment_rosters(sender, bunk_ids, **kwargs):
+    _invalidate_bunks(bunk_ids)
+
+
+@receiver(post_save, sender=Camper)
+def invalidate_camper_rosters(sender, instance, created, **kwargs):
+    if created:
+        return
+    _invalidate_bunks(
+        instance.bunk_assignments.filter(is_active=True).values_list("bunk_id", flat=True),
+    )
+
+
+@receiver(campers_bulk_saved)
+def invalidate_bulk_saved_camper_rosters(sender, camper_ids, **kwargs):
+    _invalidate_bunks(
+        CamperBunkAssignment.objects.filter(
+            camper_id__in=list(camper_ids),
+            is_active=True,
+        ).values_list("bunk_id", flat=True),
+    )
+
+
+# Bunk details and counselors are part of every roster payload, and the
+# unit a bunk belongs to decides who can reach it and which unit totals
+# its summaries count towards.
+@receiver(pre_save, sender=Bunk)
+def remember_previous_bunk_unit(sender, instance, **kwargs):
+    instance._previous_unit_id = None
+    if instance.pk:
+        instance._previous_unit_id = Bunk.objects.filter(
+            pk=instance.pk,
+        ).values_list("unit_id", flat=True).first()
+
+
+@receiver(post_save, sender=Bunk)
+def bunk_saved(sender, instance, created, **kwargs):
+    invalidate_bunk_rosters(instance.pk)
+    previous_unit_id = getattr(instance, "_previous_unit_id", None)
+    if instance.unit_id == previous_unit_id:
+        return
+    invalidate_access_scopes()
+    if not created:
+        refresh_moved_bunk_summaries(instance, previous_unit_id)
+
+
+@receiver(post_delete, sender=Bunk)
+def bunk_deleted(sender, instance, **kwargs):
+    invalidate_bunk_rosters(instance.pk)
+    invalidate_access_scopes()
+    Tombstone.objects.create(object_type=Tombstone.BUNK, object_id=instance.pk, bunk_id=instance.pk)
+
+
+@receiver(m2m_changed, sender=Bunk.counselors.through)
+def invalidate_bunk_counselors(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            invalidate_bunk_rosters(instance.pk)
+    elif action in ("post_add", "post_remove"):
+        _invalidate_bunks(pk_set or [])
+    elif action == "pre_clear":
+        # Clearing from the user side: collect the bunks before they are unlinked
+        _invalidate_bunks(instance.assigned_bunks.values_list("id", flat=True))
+
+
+@receiver(post_save, sender=Unit)
+@receiver(post_save, sender=Cabin)
+@receiver(post_save, sender=Session)
+def invalidate_related_bunks(sender, instance, **kwargs):
+    _invalidate_bunks(instance.bunks.values_list("id", flat=True))
+
+
+@receiver(reference_data_bulk_saved)
+def invalidate_bulk_saved_reference_rosters(sender, pks, **kwargs):
+    if sender is Bunk:
+        _invalidate_bunks(pks)
+    else:
+        related = sender._meta.get_field("bunks").field.name
+        _invalidate_bunks(Bunk.objects.filter(**{f"{related}__in": list(pks)}).values_list("id", flat=True))
+
+
+# Access scopes: counselor assignments and unit heads decide which bunks a
+# user can reach, as does the unit a bunk belongs to (see bunk_saved).
+@receiver(m2m_changed, sender=Bunk.counselors.through)
+def invalidate_counselor_access(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_access_scopes()
+
+
+@receiver(pre_save, sender=Unit)
+def remember_previous_unit_head(sender, instance, **kwargs):
+    instance._previous_unit_head_id = None
+    if instance.pk:
+        instance._previous_unit_head_id = Unit.objects.filter(
+            pk=instance.pk,
+        ).values_list("unit_head_id", flat=True).first()
+
+
+@receiver(post_save, sender=Unit)
+def invalidate_unit_head_access(sender, instance, **kwargs):
+    if instance.unit_head_id != getattr(instance, "_previous_unit_head_id", None):
+        invalidate_access_scopes()
+
+
+@receiver(post_delete, sender=Unit)
+def invalidate_deleted_unit_access(sender, instance, **kwargs):
+    invalidate_access_scopes()
+
+
+# Bulk imports may have changed unit heads or moved bunks between units
+@receiver(reference_data_bulk_saved)
+def invalidate_bulk_saved_access(sender, **kwargs):
+    if sender in (Unit, Bunk):
+        invalidate_access_scopes()
+
+
+# Cached JWT principals: any saved change to a user may touch their role,
+# staff flag or active state
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_principal(sender, instance, **kwargs):
+    invalidate_principal(instance.pk)
+
+
+# Camper care watchlist: bulk writes skip the receivers above
+@receiver(bunk_logs_bulk_saved)
+def invalidate_bulk_saved_risk(sender, keys, **kwargs):
+    invalidate_camper_risk(bunk_id for bunk_id, _ in keys)
+
+
+# Delta sync: a deleted camper is recorded once for each bunk it was
+# assigned to, so clients that could see it can drop their copy.
+@receiver(pre_delete, sender=Camper)
+def remember_camper_bunks(sender, instance, **kwargs):
+    instance._sync_bunk_ids = set(instance.bunk_assignments.values_list("bunk_id", flat=True))
+
+
+@receiver(post_delete, sender=Camper)
+def record_camper_tombstones(sender, instance, **kwargs):
+    bunk_ids = getattr(instance, "_sync_bunk_ids", None) or {None}
+    Tombstone.objects.bulk_create(
+        [Tombstone(object_type=Tombstone.CAMPER, object_id=instance.pk, bunk_id=bunk_id) for bunk_id in bunk_ids],
+    )
@@ -0,0 +1,226 @@
+"""
+Delta sync for offline-capable clients.
+
+A client calls ``/api/v1/sync`` without a cursor once to get every row it
+can see, then passes the returned cursor back to receive only the bunks,
+campers, assignments and logs changed since, plus tombstones for deletions.
+
+The cursor is opaque to clients. It carries the sync time and the bunk ids
+the user could see, so bunks that come into scope later are sent in full
+and bunks that leave scope are reported for the client to drop. The sync
+time is moved back by SYNC_CURSOR_OVERLAP so rows written by transactions
+still open when the cursor was issued are picked up next time; clients
+upsert by id, so the occasional repeat row is harmless.
+
+Each response holds at most SYNC_PAGE_SIZE rows of each kind. When any kind
+has more, ``has_more`` is true and the cursor continues every kind from its
+last (updated_at, id); the client keeps calling with it until ``has_more``
+is false. Deletions and bunks that left scope come with the first page.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from datetime import timedelta
+
+from django.db.models import F
+from django.db.models import Q
+from django.utils import timezone
+
+from api.models import Tombstone
+from bunklogs.models import BunkLog
+from bunks.models import Bunk
+from campers.models import Camper
+from campers.models import CamperBunkAssignment
+
+from .access import get_access_scope
+
+SYNC_CURSOR_OVERLAP = timedelta(seconds=30)
+
+# Rows of each kind (bunks, campers, assignments, logs) per response
+SYNC_PAGE_SIZE = 500
+
+# Cursors older than this fall back to a full sync; tombstones are kept this long
+SYNC_TOMBSTONE_RETENTION = timedelta(days=30)
+
+BUNK_FIELDS = ["id", "cabin_id", "session_id", "unit_id", "is_active", "updated_at"]
+BUNK_NAME_FIELDS = {"cabin_name": F("cabin__name"), "session_name": F("session__name")}
+CAMPER_FIELDS = ["id", "first_name", "last_name", "date_of_birth", "status_note", "updated_at"]
+ASSIGNMENT_FIELDS = ["id", "camper_id", "bunk_id", "start_date", "end_date", "is_active", "updated_at"]
+LOG_FIELDS = [
+    "id",
+    "bunk_assignment_id",
+    "date",
+    "counselor_id",
+    "not_on_camp",
+    "social_score",
+    "behavior_score",
+    "participation_score",
+    "request_camper_care_help",
+    "request_unit_head_help",
+    "description",
+    "updated_at",
+]
+SYNC_KINDS = ("bunks", "campers", "assignments", "logs")
+TOMBSTONE_KEYS = {
+    Tombstone.BUNK: "bunks",
+    Tombstone.CAMPER: "campers",
+    Tombstone.ASSIGNMENT: "assignments",
+    Tombstone.BUNK_LOG: "logs",
+}
+
+
+class InvalidCursor(ValueError):
+    """Raised when a sync cursor cannot be decoded."""
+
+    MESSAGE = "Invalid sync cursor."
+
+
+def encode_cursor(synced_at, bunk_ids, started_at=None, positions=None):
+    """
+    ``synced_at`` and ``bunk_ids`` describe the last completed sync. A cursor
+    in the middle of a paged sync also carries when that sync started and,
+    for each kind with rows left, the (updated_at, id) of the last row sent.
+    """
+    payload = {
+        "t": synced_at.isoformat() if synced_at is not None else None,
+        "b": sorted(bunk_ids) if bunk_ids is not None else None,
+    }
+    if started_at is not None:
+        payload["s"] = started_at.isoformat()
+        payload["p"] = {
+            key: [updated_at.isoformat(), pk] for key, (updated_at, pk) in positions.items()
+        }
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode()
+
+
+def decode_cursor(cursor):
+    """
+    Return (synced_at, bunk_ids, started_at, positions); bunk_ids is None for
+    users who see every bunk, started_at and positions are None unless the
+    cursor continues a paged sync.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        started_at = positions = None
+        if "s" in payload:
+            started_at = datetime.fromisoformat(payload["s"])
+            positions = {
+                key: (datetime.fromisoformat(updated_at), int(pk))
+                for key, (updated_at, pk) in payload["p"].items()
+                if key in SYNC_KINDS
+            }
+        synced_at = payload["t"]
+        if synced_at is not None or started_at is None:
+            synced_at = datetime.fromisoformat(synced_at)
+        bunk_ids = payload["b"]
+    except (binascii.Error, ValueError, KeyError, TypeError, AttributeError) as e:
+        raise InvalidCursor(InvalidCursor.MESSAGE) from e
+    return synced_at, (frozenset(bunk_ids) if bunk_ids is not None else None), started_at, positions
+
+
+def _sees_every_bunk(user):
+    return user.is_staff or user.role in ("Admin", "Camper Care")
+
+
+def _page(queryset, position, page_size):
+    """Up to ``page_size`` rows after ``position`` in (updated_at, id) order, and whether more follow."""
+    if position is not None:
+        updated_at, pk = position
+        queryset = queryset.filter(Q(updated_at__gt=updated_at) | Q(updated_at=updated_at, id__gt=pk))
+    rows = list(queryset.order_by("updated_at", "id")[:page_size + 1])
+    return rows[:page_size], len(rows) > page_size
+
+
+def build_sync_payload(request, cursor=None):
+    """Collect one page of everything visible to ``request.user`` that changed since ``cursor``."""
+    now = timezone.now()
+    bunk_ids = None if _sees_every_bunk(request.user) else get_access_scope(request).visible_bunk_ids
+
+    since = None
+    previous_bunk_ids = None
+    started_at = None
+    positions = None
+    if cursor:
+        since, previous_bunk_ids, started_at, positions = decode_cursor(cursor)
+        # Start over when tombstones may have been pruned since the cursor, or
+        # when a user who saw every bunk is now limited to some of them
+        if since is not None and (
+            since < now - SYNC_TOMBSTONE_RETENTION or (previous_bunk_ids is None and bunk_ids is not None)
+        ):
+            since = previous_bunk_ids = started_at = positions = None
+    first_page = started_at is None
+    if first_page:
+        started_at = now
+
+    # Bunks newly in scope are sent in full; bunks that left scope are dropped
+    new_bunk_ids = frozenset()
+    removed_bunk_ids = frozenset()
+    if since is not None and bunk_ids is not None:
+        new_bunk_ids = bunk_ids - previous_bunk_ids
+        removed_bunk_ids = previous_bunk_ids - bunk_ids
+
+    def in_scope(lookup):
+        return Q() if bunk_ids is None else Q(**{f"{lookup}__in": bunk_ids})
+
+    def changed(updated_lookup, bunk_lookup):
+        if since is None:
+            return Q()
+        condition = Q(**{f"{updated_lookup}__gt": since})
+        if new_bunk_ids:
+            condition |= Q(**{f"{bunk_lookup}__in": new_bunk_ids})
+        return condition
+
+    bunks = Bunk.objects.filter(in_scope("id"), changed("updated_at", "id")).values(
+        *BUNK_FIELDS, **BUNK_NAME_FIELDS,
+    )
+    assignments = CamperBunkAssignment.objects.filter(
+        in_scope("bunk_id"), changed("updated_at", "bunk_id"),
+    ).values(*ASSIGNMENT_FIELDS)
+    # A camper is resent when they or one of their assignments changed, so a
+    # camper joining a bunk reaches clients even if the camper row is old
+    camper_changes = changed("updated_at", "bunk_assignments__bunk_id")
+    if since is not None:
+        camper_changes |= Q(bunk_assignments__updated_at__gt=since)
+    campers = Camper.objects.filter(
+        in_scope("bunk_assignments__bunk_id"), camper_changes,
+    ).values(*CAMPER_FIELDS).distinct()
+    logs = BunkLog.objects.filter(
+        in_scope("bunk_assignment__bunk_id"), changed("updated_at", "bunk_assignment__bunk_id"),
+    ).values(*LOG_FIELDS)
+    querysets = {"bunks": bunks, "campers": campers, "assignments": assignments, "logs": logs}
+
+    payload = {"full": since is None}
+    next_positions = {}
+    for key in SYNC_KINDS:
+        # Kinds missing from a continuing cursor were sent in full already
+        if not first_page and key not in positions:
+            payload[key] = []
+            continue
+        rows, more = _page(querysets[key], None if first_page else positions[key], SYNC_PAGE_SIZE)
+        payload[key] = rows
+        if more:
+            next_positions[key] = (rows[-1]["updated_at"], rows[-1]["id"])
+
+    deleted = {key: [] for key in TOMBSTONE_KEYS.values()}
+    if since is not None and first_page:
+        tombstones = Tombstone.objects.filter(in_scope("bunk_id"), deleted_at__gt=since)
+        for object_type, object_id in tombstones.values_list("object_type", "object_id"):
+            deleted[TOMBSTONE_KEYS[object_type]].append(object_id)
+    payload["deleted"] = deleted
+    payload["removed_bunk_ids"] = sorted(removed_bunk_ids) if first_page else []
+
+    payload["has_more"] = bool(next_positions)
+    if next_positions:
+        payload["cursor"] = encode_cursor(since, previous_bunk_ids, started_at, next_positions)
+    else:
+        payload["cursor"] = encode_cursor(started_at - SYNC_CURSOR_OVERLAP, bunk_ids)
+    return payload
+
+
+def prune_tombstones():
+    """Delete tombstones older than any cursor that is still honoured."""
+    deleted, _ = Tombstone.objects.filter(
+        deleted_at__lt=timezone.now() - SYNC_TOMBSTONE_RETENTION,
+    ).delete()
+    return deleted
@@ -0,0 +1,73 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from bunk_logs.users.models import User
+from bunks.models import Bunk, Cabin, Session, Unit
+from bunklogs.models import BunkLog
+from campers.models import Camper, CamperBunkAssignment
+
+
+class AccessScopeTest(TestCase):
+    date = "2025-06-15"
+
+    def setUp(self):
+        cache.clear()
+        self.counselor = User.objects.create_user(
+            email="counselor@example.com",
+            password="password123",
+            role="Counselor"
+        )
+        self.unit_head = User.objects.create_user(
+            email="unithead@example.com",
+            password="password123",
+            role="Unit Head"
+        )
+        session = Session.objects.create(
+            name="Summer 2025",
+            start_date="2025-06-01",
+            end_date="2025-08-31"
+        )
+        self.unit = Unit.objects.create(name="Unit A")
+        self.bunk = Bunk.objects.create(
+            cabin=Cabin.objects.create(name="Cabin 1", capacity=10),
+            session=session,
+            unit=self.unit,
+        )
+        assignment = CamperBunkAssignment.objects.create(
+            camper=Camper.objects.create(first_name="Camper", last_name="Test"),
+            bunk=self.bunk,
+        )
+        BunkLog.objects.create(bunk_assignment=assignment, date=self.date, counselor=self.unit_head)
+        self.client = APIClient()
+
+    def _list_ids(self, user):
+        self.client.force_authenticate(user=user)
+        response = self.client.get(reverse('bunklog-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item["id"] for item in response.data["results"]]
+
+    def test_scope_is_cached_between_requests(self):
+        self.bunk.counselors.add(self.counselor)
+        self.assertEqual(len(self._list_ids(self.counselor)), 1)
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(len(self._list_ids(self.counselor)), 1)
+        counselor_table = Bunk.counselors.through._meta.db_table
+        self.assertFalse(any(counselor_table in query["sql"] for query in context.captured_queries))
+
+    def test_counselor_changes_invalidate_scope(self):
+        self.assertEqual(self._list_ids(self.counselor), [])
+        self.bunk.counselors.add(self.counselor)
+        self.assertEqual(len(self._list_ids(self.counselor)), 1)
+        self.counselor.assigned_bunks.clear()
+        self.assertEqual(self._list_ids(self.counselor), [])
+
+    def test_unit_head_change_invalidates_scope(self):
+        self.assertEqual(self._list_ids(self.unit_head), [])
+        self.unit.unit_head = self.unit_head
+        self.unit.save()
+        self.assertEqual(len(self._list_ids(self.unit_head)), 1)
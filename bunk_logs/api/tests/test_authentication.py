@@ -0,0 +1,56 @@
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from bunk_logs.api.authentication import CachedJWTAuthentication
+from bunk_logs.api.authentication import full_user
+from bunk_logs.users.models import User
+from bunks.models import Unit
+
+
+class CachedJWTAuthenticationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="counselor@example.com",
+            password="password123",
+            role="Counselor",
+            first_name="Casey",
+            last_name="Jones",
+        )
+        self.token = AccessToken.for_user(self.user)
+
+    def _authenticate(self, token=None):
+        request = APIRequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token or self.token}")
+        user, _ = CachedJWTAuthentication().authenticate(request)
+        return user
+
+    def test_principal_is_cached_per_token(self):
+        self.assertEqual(self._authenticate(), self.user)
+        with self.assertNumQueries(0):
+            user = self._authenticate()
+            self.assertEqual((user.pk, user.role, user.is_staff), (self.user.pk, "Counselor", False))
+            self.assertEqual(user.name, "Casey Jones")
+        # A new token for the same user builds its own principal
+        with self.assertNumQueries(1):
+            self._authenticate(AccessToken.for_user(self.user))
+
+    def test_user_save_and_scope_changes_drop_the_principal(self):
+        self._authenticate()
+        self.user.role = "Unit Head"
+        self.user.save()
+        self.assertEqual(self._authenticate().role, "Unit Head")
+
+        Unit.objects.create(name="Unit A", unit_head=self.user)
+        with self.assertNumQueries(1):
+            self._authenticate()
+
+    def test_full_user_loads_the_deferred_fields_once(self):
+        self._authenticate()
+        user = self._authenticate()
+        with self.assertNumQueries(1):
+            user = full_user(user)
+            self.assertEqual((user.profile_complete, user.date_joined), (False, self.user.date_joined))
+        with self.assertNumQueries(0):
+            self.assertIs(full_user(user), user)
@@ -0,0 +1,128 @@
+from unittest import mock
+
+from django.db import IntegrityError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from bunk_logs.users.models import User
+from bunks.models import Bunk, Cabin, Session
+from bunklogs.models import BunkLog
+from campers.models import Camper, CamperBunkAssignment
+
+
+class BunkLogBatchTest(TestCase):
+    date = "2025-06-15"
+
+    def setUp(self):
+        self.counselor = User.objects.create_user(
+            email="counselor1@example.com",
+            password="password123",
+            role="Counselor"
+        )
+        self.other_counselor = User.objects.create_user(
+            email="counselor2@example.com",
+            password="password123",
+            role="Counselor"
+        )
+        session = Session.objects.create(
+            name="Summer 2025",
+            start_date="2025-06-01",
+            end_date="2025-08-31"
+        )
+        self.bunk = Bunk.objects.create(
+            cabin=Cabin.objects.create(name="Cabin 1", capacity=10),
+            session=session,
+        )
+        self.bunk.counselors.add(self.counselor)
+        self.campers = []
+        for i in range(3):
+            camper = Camper.objects.create(first_name=f"Camper{i}", last_name="Test")
+            CamperBunkAssignment.objects.create(camper=camper, bunk=self.bunk)
+            self.campers.append(camper)
+        self.url = reverse('bunklog-batch', kwargs={'bunk_id': self.bunk.id, 'date': self.date})
+        self.client = APIClient()
+
+    def _payload(self, score=4):
+        return {"logs": [
+            {"camper_id": camper.id, "social_score": score, "behavior_score": score,
+             "participation_score": score, "description": "Good day"}
+            for camper in self.campers
+        ]}
+
+    def test_creates_then_updates_logs_for_whole_bunk(self):
+        self.client.force_authenticate(user=self.counselor)
+        response = self.client.post(self.url, self._payload(), format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["created"], 3)
+        self.assertEqual(BunkLog.objects.filter(date=self.date).count(), 3)
+
+        response = self.client.post(self.url, self._payload(score=2), format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["updated"], 3)
+        self.assertEqual(
+            set(BunkLog.objects.filter(date=self.date).values_list("social_score", flat=True)),
+            {2},
+        )
+
+    def test_partial_resubmission_keeps_omitted_fields(self):
+        self.client.force_authenticate(user=self.counselor)
+        payload = self._payload()
+        payload["logs"][0]["request_camper_care_help"] = True
+        self.client.post(self.url, payload, format='json')
+
+        response = self.client.post(self.url, {"logs": [
+            {"camper_id": self.campers[0].id, "description": "Updated"},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["updated"], 1)
+        log = BunkLog.objects.get(bunk_assignment__camper=self.campers[0], date=self.date)
+        self.assertEqual(log.description, "Updated")
+        self.assertEqual((log.social_score, log.behavior_score, log.participation_score), (4, 4, 4))
+        self.assertTrue(log.request_camper_care_help)
+
+    def test_batches_for_a_bunk_take_turns(self):
+        self.client.force_authenticate(user=self.counselor)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(self.url, self._payload(), format='json')
+        self.assertTrue(any(
+            query["sql"].endswith("FOR UPDATE") and "campers_camperbunkassignment" in query["sql"]
+            for query in queries.captured_queries
+        ))
+
+    def test_log_saved_meanwhile_gives_a_conflict(self):
+        self.client.force_authenticate(user=self.counselor)
+        with mock.patch.object(BunkLog.objects, "bulk_create", side_effect=IntegrityError("duplicate key")):
+            response = self.client.post(self.url, self._payload(), format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(BunkLog.objects.exists())
+
+    def test_update_writes_only_the_fields_entries_sent(self):
+        self.client.force_authenticate(user=self.counselor)
+        self.client.post(self.url, self._payload(), format='json')
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(self.url, {"logs": [
+                {"camper_id": camper.id, "description": "Later"} for camper in self.campers
+            ]}, format='json')
+        [update] = [query["sql"] for query in queries.captured_queries if query["sql"].startswith("UPDATE")]
+        self.assertIn('"description"', update)
+        self.assertNotIn('"social_score"', update)
+
+    def test_invalid_entry_reports_camper_and_writes_nothing(self):
+        self.client.force_authenticate(user=self.counselor)
+        payload = self._payload()
+        payload["logs"][1]["social_score"] = 9
+        response = self.client.post(self.url, payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(response.data["errors"]), 1)
+        self.assertEqual(response.data["errors"][0]["camper_id"], self.campers[1].id)
+        self.assertIn("social_score", response.data["errors"][0]["errors"])
+        self.assertFalse(BunkLog.objects.exists())
+
+    def test_counselor_cannot_submit_for_other_bunk(self):
+        self.client.force_authenticate(user=self.other_counselor)
+        response = self.client.post(self.url, self._payload(), format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,129 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from bunk_logs.users.models import User
+from bunks.models import Bunk, Unit, Cabin, Session
+from bunklogs.models import BunkLog
+from campers.models import Camper, CamperBunkAssignment
+
+
+class BunkRosterTestCase(TestCase):
+    date = "2025-06-15"
+
+    def setUp(self):
+        cache.clear()
+        self.session = Session.objects.create(
+            name="Summer 2025",
+            start_date="2025-06-01",
+            end_date="2025-08-31"
+        )
+        self.unit = Unit.objects.create(name="Unit A")
+        self.counselors = [
+            User.objects.create_user(
+                email=f"counselor{i}@example.com",
+                password="password123",
+                role="Counselor"
+            )
+            for i in range(2)
+        ]
+        self.client = APIClient()
+
+    def _create_bunk(self, name, camper_count):
+        cabin = Cabin.objects.create(name=name, capacity=camper_count)
+        bunk = Bunk.objects.create(
+            cabin=cabin,
+            session=self.session,
+            unit=self.unit,
+            is_active=True
+        )
+        bunk.counselors.add(*self.counselors)
+        for i in range(camper_count):
+            camper = Camper.objects.create(first_name=f"{name}{i}", last_name="Camper")
+            assignment = CamperBunkAssignment.objects.create(
+                camper=camper,
+                bunk=bunk,
+                is_active=True
+            )
+            BunkLog.objects.create(
+                bunk_assignment=assignment,
+                date=self.date,
+                counselor=self.counselors[0],
+                social_score=4,
+                behavior_score=4,
+                participation_score=4,
+            )
+        return bunk
+
+    def _get(self, bunk, *, bunk_id=None, date=None, expected_status=status.HTTP_200_OK):
+        url = reverse('bunklog-by-date', kwargs={'bunk_id': bunk_id or bunk.id, 'date': date or self.date})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, expected_status)
+        return response, [query["sql"] for query in queries.captured_queries]
+
+
+class BunkLogsInfoByDateQueryCountTest(BunkRosterTestCase):
+
+    def test_response_includes_every_camper_and_log(self):
+        bunk = self._create_bunk("Small", 3)
+        response, _ = self._get(bunk)
+        self.assertEqual(len(response.data["campers"]), 3)
+        self.assertTrue(all(c["bunk_log"] for c in response.data["campers"]))
+        self.assertEqual(len(response.data["counselors"]), 2)
+        self.assertEqual(response.data["unit"]["name"], "Unit A")
+
+    def test_query_count_does_not_grow_with_campers(self):
+        small = self._create_bunk("Small", 2)
+        large = self._create_bunk("Large", 14)
+        _, small_queries = self._get(small)
+        _, large_queries = self._get(large)
+        self.assertEqual(len(small_queries), len(large_queries))
+
+
+class BunkLogsInfoByDateCacheTest(BunkRosterTestCase):
+
+    def test_second_request_is_served_from_cache(self):
+        bunk = self._create_bunk("Cached", 3)
+        self._get(bunk)
+        _, queries = self._get(bunk)
+        # ATOMIC_REQUESTS still wraps the request in a savepoint
+        self.assertEqual([sql for sql in queries if sql.lstrip().upper().startswith("SELECT")], [])
+
+    def test_log_write_invalidates_cached_roster(self):
+        bunk = self._create_bunk("Cached", 1)
+        response, _ = self._get(bunk)
+        self.assertEqual(response.data["campers"][0]["bunk_log"]["social_score"], 4)
+        log = BunkLog.objects.get(bunk_assignment__bunk=bunk, date=self.date)
+        log.social_score = 2
+        log.save()
+        response, _ = self._get(bunk)
+        self.assertEqual(response.data["campers"][0]["bunk_log"]["social_score"], 2)
+
+    def test_new_assignment_invalidates_cached_roster(self):
+        bunk = self._create_bunk("Cached", 1)
+        self._get(bunk)
+        camper = Camper.objects.create(first_name="Late", last_name="Arrival")
+        CamperBunkAssignment.objects.create(camper=camper, bunk=bunk, is_active=True)
+        response, _ = self._get(bunk)
+        self.assertEqual(len(response.data["campers"]), 2)
+
+    def test_every_spelling_of_a_bunk_and_date_shares_one_entry(self):
+        bunk = self._create_bunk("Cached", 1)
+        response, _ = self._get(bunk, bunk_id=f"00{bunk.id}")
+        self.assertEqual(response.data["date"], self.date)
+        log = BunkLog.objects.get(bunk_assignment__bunk=bunk, date=self.date)
+        log.social_score = 2
+        log.save()
+        # The write dropped the entry the padded spelling filled
+        response, _ = self._get(bunk, bunk_id=f"00{bunk.id}")
+        self.assertEqual(response.data["campers"][0]["bunk_log"]["social_score"], 2)
+
+    def test_rejects_malformed_bunk_ids_and_dates(self):
+        bunk = self._create_bunk("Cached", 1)
+        self._get(bunk, date="2025-6-15", expected_status=status.HTTP_400_BAD_REQUEST)
+        self._get(bunk, bunk_id="seven", expected_status=status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,119 @@
+import datetime
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from bunk_logs.users.models import User
+from bunks.models import Bunk, Cabin, Session, Unit
+from bunklogs.models import BunkLog
+from campers.models import Camper, CamperBunkAssignment
+
+
+class CamperCareWatchlistTest(TestCase):
+    start = datetime.date(2025, 6, 1)
+
+    def setUp(self):
+        cache.clear()
+        self.counselor = User.objects.create_user(
+            email="counselor@example.com",
+            password="password123",
+            role="Counselor"
+        )
+        self.camper_care = User.objects.create_user(
+            email="care@example.com",
+            password="password123",
+            role="Camper Care"
+        )
+        session = Session.objects.create(
+            name="Summer 2025",
+            start_date="2025-06-01",
+            end_date="2025-08-31"
+        )
+        self.bunk = Bunk.objects.create(
+            cabin=Cabin.objects.create(name="Cabin 1", capacity=10),
+            session=session,
+            unit=Unit.objects.create(name="Unit A"),
+        )
+        self.bunk.counselors.add(self.counselor)
+        self.assignments = {
+            name: CamperBunkAssignment.objects.create(
+                camper=Camper.objects.create(first_name=name, last_name="Test"),
+                bunk=self.bunk,
+            )
+            for name in ("Steady", "Falling", "Helped")
+        }
+        self.client = APIClient()
+        self.url = reverse('camper-care-watchlist')
+
+    def _log(self, name, day, score, **extra):
+        return BunkLog.objects.create(
+            bunk_assignment=self.assignments[name],
+            date=self.start + datetime.timedelta(days=day),
+            counselor=self.counselor,
+            social_score=score,
+            behavior_score=score,
+            participation_score=score,
+            **extra,
+        )
+
+    def _watchlist(self, user, **params):
+        self.client.force_authenticate(user=user)
+        return self.client.get(self.url, {"to": "2025-06-05", "days": 5, **params})
+
+    def test_ranks_falling_scores_and_help_streaks(self):
+        for day in range(5):
+            self._log("Steady", day, 4)
+            self._log("Falling", day, 5 - day)
+            self._log("Helped", day, 4, request_camper_care_help=day >= 2)
+
+        response = self._watchlist(self.camper_care)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ranked = {row["camper_first_name"]: row for row in response.data["campers"]}
+        self.assertNotIn("Steady", ranked)
+        self.assertEqual(response.data["campers"][0]["camper_first_name"], "Falling")
+        self.assertEqual(ranked["Falling"]["slope"], -1.0)
+        self.assertLess(ranked["Falling"]["peer_z"], 0)
+        self.assertEqual(ranked["Helped"]["help_streak"], 3)
+        self.assertEqual(ranked["Helped"]["help_count"], 3)
+
+    def test_new_logs_rescore_the_bunk(self):
+        for day in range(4):
+            self._log("Steady", day, 4)
+            self._log("Helped", day, 4)
+        self.assertEqual(self._watchlist(self.counselor).data["campers"], [])
+
+        self._log("Helped", 4, 4, request_camper_care_help=True)
+        campers = self._watchlist(self.counselor).data["campers"]
+        self.assertEqual([row["camper_first_name"] for row in campers], ["Helped"])
+
+    def test_moved_log_rescores_both_bunks_from_the_shared_key(self):
+        log = self._log("Helped", 0, 4)
+        other = Bunk.objects.create(cabin=Cabin.objects.create(name="Cabin 2", capacity=10), session=self.bunk.session)
+        log.bunk_assignment = CamperBunkAssignment.objects.create(
+            camper=Camper.objects.create(first_name="Moved", last_name="Test"),
+            bunk=other,
+        )
+        with mock.patch("bunk_logs.api.signals.invalidate_camper_risk") as invalidate, \
+                CaptureQueriesContext(connection) as queries:
+            log.save()
+        self.assertEqual(set(invalidate.call_args.args[0]), {self.bunk.pk, other.pk})
+        # Only the previous (bunk, date) is looked up; the new bunk comes
+        # from the loaded assignment
+        self.assertEqual(len([query for query in queries.captured_queries if query["sql"].startswith("SELECT")]), 1)
+
+    def test_scoped_to_visible_bunks_and_validates_params(self):
+        self._log("Helped", 0, 4, request_camper_care_help=True)
+        outsider = User.objects.create_user(
+            email="other@example.com",
+            password="password123",
+            role="Counselor"
+        )
+        self.assertEqual(self._watchlist(outsider).data["campers"], [])
+        response = self._watchlist(self.counselor, days=0)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
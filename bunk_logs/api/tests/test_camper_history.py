@@ -0,0 +1,81 @@
+from datetime import date, timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from bunk_logs.users.models import User
+from bunks.models import Bunk, Cabin, Session, Unit
+from bunklogs.models import BunkLog
+from campers.models import Camper, CamperBunkAssignment
+
+
+class CamperHistoryTest(TestCase):
+    def setUp(self):
+        self.counselor = User.objects.create_user(
+            email="counselor@example.com",
+            password="password123",
+            role="Counselor"
+        )
+        self.camper = Camper.objects.create(first_name="Camper", last_name="Test")
+        unit = Unit.objects.create(name="Unit A")
+        self.bunks = []
+        for i, start in enumerate([date(2025, 6, 1), date(2025, 7, 1)]):
+            bunk = Bunk.objects.create(
+                cabin=Cabin.objects.create(name=f"Cabin {i}", capacity=10),
+                session=Session.objects.create(
+                    name=f"Session {i}",
+                    start_date=start,
+                    end_date=start + timedelta(days=20),
+                ),
+                unit=unit,
+            )
+            bunk.counselors.add(self.counselor)
+            self.bunks.append(bunk)
+        self.client = APIClient()
+
+    def _add_logs(self, bunk, days):
+        assignment = CamperBunkAssignment.objects.create(
+            camper=self.camper,
+            bunk=bunk,
+            is_active=False,
+        )
+        for day in range(days):
+            BunkLog.objects.create(
+                bunk_assignment=assignment,
+                date=bunk.session.start_date + timedelta(days=day),
+                counselor=self.counselor,
+                social_score=4,
+            )
+
+    def _get(self):
+        url = reverse('camper-history', kwargs={'camper_id': self.camper.id})
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, len(context.captured_queries)
+
+    def test_bunks_and_counselors_listed_once(self):
+        self._add_logs(self.bunks[0], 3)
+        self._add_logs(self.bunks[1], 2)
+        response, _ = self._get()
+        self.assertEqual(response.data["camper"]["id"], self.camper.id)
+        self.assertEqual([bunk["id"] for bunk in response.data["bunks"]], [b.id for b in self.bunks])
+        self.assertEqual(len(response.data["counselors"]), 1)
+        self.assertEqual(len(response.data["logs"]), 5)
+        self.assertEqual(response.data["logs"][-1]["bunk_id"], self.bunks[1].id)
+        self.assertEqual(response.data["logs"][0]["counselor_id"], self.counselor.id)
+
+    def test_query_count_does_not_grow_with_history(self):
+        self._add_logs(self.bunks[0], 2)
+        _, short_history = self._get()
+        self._add_logs(self.bunks[1], 15)
+        _, long_history = self._get()
+        self.assertEqual(short_history, long_history)
+
+    def test_unknown_camper_returns_404(self):
+        response = self.client.get(reverse('camper-history', kwargs={'camper_id': 999999}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
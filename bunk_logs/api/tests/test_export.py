@@ -0,0 +1,58 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from bunk_logs.users.models import User
+from bunks.models import Bunk, Cabin, Session
+from bunklogs.models import BunkLog
+from campers.models import Camper, CamperBunkAssignment
+
+
+class BunkLogExportTest(TestCase):
+    def setUp(self):
+        self.counselor = User.objects.create_user(
+            email="counselor@example.com",
+            password="password123",
+            role="Counselor"
+        )
+        session = Session.objects.create(
+            name="Summer 2025",
+            start_date="2025-06-01",
+            end_date="2025-08-31"
+        )
+        self.bunks = []
+        for i in range(2):
+            bunk = Bunk.objects.create(
+                cabin=Cabin.objects.create(name=f"Cabin {i}", capacity=10),
+                session=session,
+            )
+            assignment = CamperBunkAssignment.objects.create(
+                camper=Camper.objects.create(first_name=f"Camper{i}", last_name="Test"),
+                bunk=bunk,
+            )
+            for day in ("2025-06-02", "2025-06-03"):
+                BunkLog.objects.create(bunk_assignment=assignment, date=day, counselor=self.counselor)
+            self.bunks.append(bunk)
+        self.bunks[0].counselors.add(self.counselor)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.counselor)
+
+    def _export(self, **params):
+        response = self.client.get(reverse('bunklog-export'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_csv_export_is_limited_to_visible_bunks(self):
+        lines = self._export(output="csv").splitlines()
+        self.assertEqual(len(lines), 1 + 2)
+        self.assertTrue(all("Cabin 0 - Summer 2025" in line for line in lines[1:]))
+
+    def test_ndjson_export_filters_by_date(self):
+        lines = self._export(output="ndjson", **{"from": "2025-06-03"}).splitlines()
+        self.assertEqual(len(lines), 1)
+
+    def test_unknown_format_returns_400(self):
+        response = self.client.get(reverse('bunklog-export'), {"output": "xlsx"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
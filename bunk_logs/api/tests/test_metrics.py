@@ -0,0 +1,57 @@
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from bunk_logs.api.middleware import registry
+from bunk_logs.api.views import UnitViewSet
+from bunk_logs.users.models import User
+from bunks.models import Unit
+
+
+class QueryMetricsMiddlewareTest(TestCase):
+    def setUp(self):
+        registry.reset()
+        Unit.objects.create(name="Unit A")
+        self.client = APIClient()
+
+    def test_response_has_server_timing_and_is_recorded(self):
+        response = self.client.get(reverse('unit-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("db;dur=", response["Server-Timing"])
+        self.assertIn("render;dur=", response["Server-Timing"])
+
+        totals = registry.snapshot()["unit-list"]
+        self.assertEqual(totals["requests"], 1)
+        self.assertGreaterEqual(totals["queries"], 1)
+        self.assertEqual(totals["response_bytes"], len(response.content))
+
+    def test_over_budget_request_logs_warning(self):
+        with mock.patch.object(UnitViewSet, "query_budget", 0), \
+                self.assertLogs("bunk_logs.api.middleware", level="WARNING") as logs:
+            self.client.get(reverse('unit-list'))
+        self.assertIn("unit-list", logs.output[0])
+        self.assertEqual(registry.snapshot()["unit-list"]["over_budget"], 1)
+
+    def test_metrics_endpoint_is_admin_only(self):
+        self.client.get(reverse('unit-list'))
+        url = reverse('api-metrics')
+        counselor = User.objects.create_user(
+            email="counselor@example.com",
+            password="password123",
+            role="Counselor",
+        )
+        self.client.force_authenticate(user=counselor)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+        admin = User.objects.create_user(
+            email="admin@example.com",
+            password="password123",
+            is_staff=True,
+        )
+        self.client.force_authenticate(user=admin)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('bunklogs_api_requests_total{endpoint="unit-list"} 1', response.content.decode())
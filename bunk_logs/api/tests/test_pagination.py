@@ -0,0 +1,82 @@
+import json
+from datetime import date, timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from bunk_logs.users.models import User
+from bunks.models import Bunk, Cabin, Session
+from bunklogs.models import BunkLog
+from campers.models import Camper, CamperBunkAssignment
+
+
+class BunkLogPaginationTest(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            email="admin@example.com",
+            password="password123",
+            role="Admin"
+        )
+        session = Session.objects.create(
+            name="Summer 2025",
+            start_date="2025-06-01",
+            end_date="2025-08-31"
+        )
+        bunk = Bunk.objects.create(
+            cabin=Cabin.objects.create(name="Cabin 1", capacity=10),
+            session=session,
+        )
+        self.log_ids = []
+        for i in range(2):
+            assignment = CamperBunkAssignment.objects.create(
+                camper=Camper.objects.create(first_name=f"Camper{i}", last_name="Test"),
+                bunk=bunk,
+            )
+            for day in range(3):
+                log = BunkLog.objects.create(
+                    bunk_assignment=assignment,
+                    date=date(2025, 6, 1) + timedelta(days=day),
+                    counselor=self.admin,
+                )
+                self.log_ids.append(log.id)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def test_cursor_pages_cover_every_log_once(self):
+        url = reverse('bunklog-list') + '?page_size=2'
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data["results"]), 2)
+            seen.extend(item["id"] for item in response.data["results"])
+            url = response.data["next"]
+        self.assertCountEqual(seen, self.log_ids)
+        dates_by_id = dict(BunkLog.objects.values_list("id", "date"))
+        seen_dates = [dates_by_id[log_id] for log_id in seen]
+        self.assertEqual(seen_dates, sorted(seen_dates, reverse=True))
+
+    def test_logs_sharing_a_date_are_paged_without_offset(self):
+        url = reverse('bunklog-list') + '?page_size=1'
+        pages = []
+        with CaptureQueriesContext(connection) as queries:
+            while url:
+                response = self.client.get(url)
+                pages.append(response.data)
+                url = response.data["next"]
+        self.assertEqual(len(pages), len(self.log_ids))
+        self.assertFalse(any("OFFSET" in query["sql"] for query in queries.captured_queries))
+
+        # Going back from the last page returns the page before it
+        response = self.client.get(pages[-1]["previous"])
+        self.assertEqual(response.data["results"], pages[-2]["results"])
+
+    def test_stream_mode_returns_all_rows_as_array(self):
+        response = self.client.get(reverse('bunklog-list') + '?stream=1')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = json.loads(b"".join(response.streaming_content))
+        self.assertCountEqual([item["id"] for item in data], self.log_ids)
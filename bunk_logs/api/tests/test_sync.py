@@ -0,0 +1,171 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from bunk_logs.api import sync
+from bunk_logs.api.sync import encode_cursor
+from bunk_logs.users.models import User
+from bunks.models import Bunk, Cabin, Session, Unit
+from bunklogs.models import BunkLog
+from campers.models import Camper, CamperBunkAssignment
+
+
+class SyncTest(TestCase):
+    date = "2025-06-15"
+
+    def setUp(self):
+        cache.clear()
+        self.counselor = User.objects.create_user(
+            email="counselor@example.com",
+            password="password123",
+            role="Counselor"
+        )
+        session = Session.objects.create(
+            name="Summer 2025",
+            start_date="2025-06-01",
+            end_date="2025-08-31"
+        )
+        unit = Unit.objects.create(name="Unit A")
+        self.bunk, self.other_bunk = [
+            Bunk.objects.create(
+                cabin=Cabin.objects.create(name=f"Cabin {i}", capacity=10),
+                session=session,
+                unit=unit,
+            )
+            for i in range(2)
+        ]
+        self.bunk.counselors.add(self.counselor)
+        self.assignment = CamperBunkAssignment.objects.create(
+            camper=Camper.objects.create(first_name="Camper", last_name="Test"),
+            bunk=self.bunk,
+        )
+        CamperBunkAssignment.objects.create(
+            camper=Camper.objects.create(first_name="Other", last_name="Test"),
+            bunk=self.other_bunk,
+        )
+        self.log = BunkLog.objects.create(
+            bunk_assignment=self.assignment,
+            date=self.date,
+            counselor=self.counselor,
+            social_score=3,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.counselor)
+
+    def _sync(self, since=None):
+        params = {"since": since} if since else {}
+        response = self.client.get(reverse('api-sync'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def _cursor_before_now(self):
+        # Cursor as if the last sync happened a minute ago
+        return encode_cursor(timezone.now() - timedelta(minutes=1), {self.bunk.id})
+
+    def test_full_sync_is_limited_to_visible_bunks(self):
+        data = self._sync()
+        self.assertTrue(data["full"])
+        self.assertEqual([bunk["id"] for bunk in data["bunks"]], [self.bunk.id])
+        self.assertEqual([camper["id"] for camper in data["campers"]], [self.assignment.camper_id])
+        self.assertEqual([log["id"] for log in data["logs"]], [self.log.id])
+
+    def test_incremental_sync_returns_only_changes(self):
+        cursor = self._cursor_before_now()
+        BunkLog.objects.filter(pk=self.log.pk).update(updated_at=timezone.now() - timedelta(hours=1))
+        CamperBunkAssignment.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        Camper.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        Bunk.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+
+        data = self._sync(cursor)
+        self.assertFalse(data["full"])
+        self.assertEqual(data["logs"], [])
+        self.assertEqual(data["campers"], [])
+
+        self.log.social_score = 5
+        self.log.save()
+        data = self._sync(cursor)
+        self.assertEqual([log["id"] for log in data["logs"]], [self.log.id])
+        self.assertEqual(data["bunks"], [])
+
+    def test_deletes_are_reported_as_tombstones(self):
+        cursor = self._cursor_before_now()
+        log_id = self.log.id
+        self.log.delete()
+        CamperBunkAssignment.objects.get(bunk=self.other_bunk).delete()
+
+        data = self._sync(cursor)
+        self.assertEqual(data["deleted"]["logs"], [log_id])
+        # The other bunk's assignment is outside the counselor's scope
+        self.assertEqual(data["deleted"]["assignments"], [])
+
+    def test_bunk_leaving_scope_is_reported(self):
+        cursor = self._cursor_before_now()
+        self.counselor.assigned_bunks.clear()
+        data = self._sync(cursor)
+        self.assertEqual(data["removed_bunk_ids"], [self.bunk.id])
+
+    def test_invalid_cursor_returns_400(self):
+        response = self.client.get(reverse('api-sync'), {"since": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @mock.patch.object(sync, "SYNC_PAGE_SIZE", 1)
+    def test_full_sync_is_paged(self):
+        admin = User.objects.create_user(email="admin@example.com", password="password123", role="Admin")
+        self.client.force_authenticate(user=admin)
+        BunkLog.objects.create(
+            bunk_assignment=CamperBunkAssignment.objects.get(bunk=self.other_bunk),
+            date=self.date,
+            counselor=self.counselor,
+            social_score=4,
+        )
+
+        seen = {key: [] for key in ("bunks", "campers", "assignments", "logs")}
+        data = {"has_more": True}
+        cursor = None
+        while data["has_more"]:
+            data = self._sync(cursor)
+            self.assertTrue(data["full"])
+            for key, ids in seen.items():
+                self.assertLessEqual(len(data[key]), 1)
+                ids.extend(row["id"] for row in data[key])
+            cursor = data["cursor"]
+        self.assertEqual(sorted(seen["bunks"]), sorted(Bunk.objects.values_list("id", flat=True)))
+        self.assertEqual(sorted(seen["campers"]), sorted(Camper.objects.values_list("id", flat=True)))
+        self.assertEqual(len(seen["assignments"]), CamperBunkAssignment.objects.count())
+        self.assertEqual(sorted(seen["logs"]), sorted(BunkLog.objects.values_list("id", flat=True)))
+
+        # The last page's cursor starts the next incremental sync
+        self.assertFalse(self._sync(cursor)["full"])
+
+    @mock.patch.object(sync, "SYNC_PAGE_SIZE", 1)
+    def test_deletes_come_with_the_first_page(self):
+        cursor = self._cursor_before_now()
+        BunkLog.objects.create(
+            bunk_assignment=self.assignment,
+            date="2025-06-16",
+            counselor=self.counselor,
+            social_score=4,
+        )
+        CamperBunkAssignment.objects.get(bunk=self.other_bunk).delete()
+        removed = BunkLog.objects.create(
+            bunk_assignment=self.assignment,
+            date="2025-06-17",
+            counselor=self.counselor,
+        )
+        removed_id = removed.id
+        removed.delete()
+
+        first = self._sync(cursor)
+        self.assertTrue(first["has_more"])
+        self.assertEqual(first["deleted"]["logs"], [removed_id])
+        second = self._sync(first["cursor"])
+        self.assertFalse(second["full"])
+        self.assertFalse(second["has_more"])
+        self.assertEqual(second["deleted"]["logs"], [])
+        self.assertEqual(len(first["logs"] + second["logs"]), 2)
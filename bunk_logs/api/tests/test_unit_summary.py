@@ -0,0 +1,118 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from bunk_logs.users.models import User
+from bunks.models import Bunk, Cabin, Session, Unit
+from bunklogs.models import BunkDailySummary, BunkLog, UnitDailySummary
+from campers.models import Camper, CamperBunkAssignment
+
+
+class UnitSummaryTest(TestCase):
+    date = "2025-06-15"
+
+    def setUp(self):
+        self.counselor = User.objects.create_user(
+            email="counselor@example.com",
+            password="password123",
+            role="Counselor"
+        )
+        session = Session.objects.create(
+            name="Summer 2025",
+            start_date="2025-06-01",
+            end_date="2025-08-31"
+        )
+        self.unit = Unit.objects.create(name="Unit A")
+        self.bunk = Bunk.objects.create(
+            cabin=Cabin.objects.create(name="Cabin 1", capacity=10),
+            session=session,
+            unit=self.unit,
+        )
+        self.bunk.counselors.add(self.counselor)
+        self.assignments = [
+            CamperBunkAssignment.objects.create(
+                camper=Camper.objects.create(first_name=f"Camper{i}", last_name="Test"),
+                bunk=self.bunk,
+            )
+            for i in range(2)
+        ]
+        self.client = APIClient()
+
+    def _log(self, assignment, score, **extra):
+        return BunkLog.objects.create(
+            bunk_assignment=assignment,
+            date=self.date,
+            counselor=self.counselor,
+            social_score=score,
+            behavior_score=score,
+            participation_score=score,
+            **extra,
+        )
+
+    def test_summaries_follow_log_saves_and_deletes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            first = self._log(self.assignments[0], 2)
+            self._log(self.assignments[1], 4, request_camper_care_help=True)
+
+        summary = BunkDailySummary.objects.get(bunk=self.bunk, date=self.date)
+        self.assertEqual(summary.log_count, 2)
+        self.assertEqual(summary.avg_social_score, 3)
+        self.assertEqual(summary.camper_care_help_count, 1)
+        self.assertEqual(UnitDailySummary.objects.get(unit=self.unit, date=self.date).bunk_count, 1)
+
+        first.social_score = 4
+        with self.captureOnCommitCallbacks(execute=True):
+            first.save()
+        self.assertEqual(BunkDailySummary.objects.get(bunk=self.bunk, date=self.date).avg_social_score, 4)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            BunkLog.objects.all().delete()
+        self.assertFalse(BunkDailySummary.objects.exists())
+        self.assertFalse(UnitDailySummary.objects.exists())
+
+    def test_summary_endpoint_includes_batch_submissions(self):
+        self.client.force_authenticate(user=self.counselor)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse('bunklog-batch', kwargs={'bunk_id': self.bunk.id, 'date': self.date}),
+                {"logs": [
+                    {"camper_id": assignment.camper_id, "social_score": 5,
+                     "behavior_score": 3, "participation_score": 4}
+                    for assignment in self.assignments
+                ]},
+                format='json',
+            )
+
+        url = reverse('unit-summary', kwargs={'pk': self.unit.id})
+        response = self.client.get(url, {"from": "2025-06-01", "to": "2025-06-30"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["days"]), 1)
+        self.assertEqual(response.data["days"][0]["log_count"], 2)
+        self.assertEqual(response.data["days"][0]["avg_social_score"], 5)
+        self.assertEqual(response.data["bunks"][0]["bunk"], self.bunk.id)
+
+        response = self.client.get(url, {"from": "2025-06-30", "to": "2025-06-01"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_saving_a_log_looks_up_its_bunk_once(self):
+        self._log(self.assignments[0], 2)
+        for log, selects in [
+            # The previous (bunk, date) and the assignment's bunk
+            (BunkLog.objects.get(), 2),
+            # The loaded assignment already has its bunk
+            (BunkLog.objects.select_related("bunk_assignment").get(), 1),
+        ]:
+            log.social_score = 3
+            with self.captureOnCommitCallbacks() as callbacks, CaptureQueriesContext(connection) as queries:
+                log.save()
+            sql = [query["sql"] for query in queries.captured_queries]
+            self.assertEqual(len([query for query in sql if query.startswith("SELECT")]), selects)
+            # The summaries are refreshed once the save commits
+            self.assertFalse([query for query in sql if "dailysummary" in query])
+            with CaptureQueriesContext(connection) as queries:
+                for callback in callbacks:
+                    callback()
+            self.assertTrue([query for query in queries.captured_queries if "dailysummary" in query["sql"]])
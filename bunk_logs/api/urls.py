@@ -17,6 +17,15 @@ urlpatterns = [
     # Add dedicated endpoint for email-based user retrieval
     path('users/email/<str:email>/', views.get_user_by_email, name='user-by-email'),
     
+    # Delta sync for offline clients
+    path('sync', views.SyncView.as_view(), name='api-sync'),
+
+    # Camper care watchlist ranked by risk score
+    path('camper-care/watchlist', views.CamperCareWatchlistView.as_view(), name='camper-care-watchlist'),
+
+    # Per-endpoint query/latency metrics (admin only)
+    path('metrics', views.metrics, name='api-metrics'),
+
     # Debug endpoints
     path('debug/user-bunks/', views.debug_user_bunks, name='debug-user-bunks'),
     path('debug/fix-social-apps/', views.fix_social_apps, name='fix-social-apps'),
@@ -24,7 +33,9 @@ urlpatterns = [
     
     # Add a URL pattern for the BunkLogsInfoByDateViewSet
     path('bunklogs/<str:bunk_id>/logs/<str:date>/', views.BunkLogsInfoByDateViewSet.as_view(), name='bunklog-by-date'),
+    path('bunklogs/<str:bunk_id>/logs/<str:date>/batch/', views.BunkLogBatchView.as_view(), name='bunklog-batch'),
     
     # URL for camper bunk logs
     path('campers/<str:camper_id>/logs/', views.CamperBunkLogViewSet.as_view(), name='camper-bunklogs'),
+    path('campers/<str:camper_id>/history/', views.CamperHistoryView.as_view(), name='camper-history'),
 ]
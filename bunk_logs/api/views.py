@@ -1,29 +1,59 @@
+import datetime
+
 from campers.models import Camper
 from campers.models import CamperBunkAssignment
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.renderers import JSONRenderer
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.exceptions import PermissionDenied
 
 from bunks.models import Bunk
 from bunks.models import Unit
+from bunklogs.models import BunkDailySummary
 from bunklogs.models import BunkLog
+from bunklogs.models import UnitDailySummary
+from bunklogs.services.exports import BunkLogExportError
+from bunklogs.services.exports import filter_bunk_logs
+from bunklogs.services.exports import get_export_format
+from bunklogs.services.exports import parse_export_filters
+from bunklogs.signals import bunk_logs_bulk_saved
 
 #from .permissions import BunkAccessPermission
 from .permissions import IsCounselorForBunk
 from .permissions import DebugPermission
 
+from .access import get_access_scope
+from .authentication import full_user
+from .middleware import registry as metrics_registry
+from .sync import InvalidCursor
+from .sync import build_sync_payload
+from .watchlist import build_watchlist
+from .cache import get_cached_roster
+from .cache import set_cached_roster
+from .pagination import StreamingListMixin
+from .serializers import BunkDailySummarySerializer
+from .serializers import BunkLogBatchItemSerializer
 from .serializers import BunkLogSerializer
 from .serializers import BunkSerializer
 from .serializers import CamperBunkAssignmentSerializer
 from .serializers import CamperSerializer
 from .serializers import UnitSerializer, SimpleBunkSerializer
 from .serializers import CamperBunkLogSerializer
+from .serializers import CamperHistorySerializer
+from .serializers import HISTORY_LOG_COLUMNS
+from .serializers import UnitDailySummarySerializer
 from .serializers import UserSerializer
 
+from django.db import IntegrityError
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
+from django.http import HttpResponse
 from django.http import JsonResponse
+from django.http import StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework.decorators import api_view, permission_classes
 from django.conf import settings
@@ -43,7 +73,8 @@ class UserDetailsView(viewsets.ViewSet):
     permission_classes = [IsAuthenticated]
     
     def list(self, request):
-        user = request.user
+        # The serializer reads fields a cached principal defers
+        user = full_user(request.user)
         serializer = UserSerializer(user)
         data = serializer.data
         
@@ -153,11 +184,15 @@ def get_user_by_email(request, email):
     except User.DoesNotExist:
         return Response({"error": "User not found"}, status=404)
 
-class BunkViewSet(viewsets.ModelViewSet):
+class BunkViewSet(StreamingListMixin, viewsets.ModelViewSet):
     renderer_classes = [JSONRenderer]
     permission_classes = [AllowAny]
-    queryset = Bunk.objects.all()
+    query_budget = 8
+    queryset = Bunk.objects.select_related(
+        'unit', 'cabin', 'session'
+    ).prefetch_related('counselors')
     serializer_class = BunkSerializer
+    cursor_ordering = ('id',)
 
 class BunkLogsInfoByDateViewSet(APIView):
     """         
@@ -168,34 +203,55 @@ class BunkLogsInfoByDateViewSet(APIView):
     Then, it will search for all of the bunk logs for those assignments.
     The response will include the bunk assignment ID and the bunk log ID.
     If no bunk logs are found, the response will return an empty list.
+    Responses are cached per bunk and date; see api/cache.py for invalidation.
     """
     renderer_classes = [JSONRenderer]
     permission_classes = [AllowAny]
+    query_budget = 10
     def get(self, request, bunk_id, date):
+        # Cache keys are built from the parsed values, so '007' and '7', or
+        # '2025-6-15' and '2025-06-15', share one entry
         try:
-            # Get the bunk
-            bunk = Bunk.objects.get(id=bunk_id)
+            bunk_id = int(bunk_id)
+        except ValueError:
+            return Response({"error": f"Bunk with ID {bunk_id} not found"}, status=404)
+        try:
+            date = datetime.date.fromisoformat(date)
+        except ValueError:
+            return Response({"error": f"Invalid date: {date}. Expected YYYY-MM-DD."}, status=400)
+        cached = get_cached_roster(bunk_id, date)
+        if cached is not None:
+            return Response(cached)
+        try:
+            # Load the bunk, its unit/cabin/session, counselors, active assignments
+            # and that day's logs up front so the query count does not grow with
+            # the number of campers in the bunk.
+            bunk = Bunk.objects.select_related(
+                'unit', 'cabin', 'session'
+            ).prefetch_related(
+                'counselors',
+                Prefetch(
+                    'camper_assignments',
+                    queryset=CamperBunkAssignment.objects.filter(
+                        is_active=True,
+                    ).select_related('camper').prefetch_related(
+                        Prefetch(
+                            'bunk_logs',
+                            queryset=BunkLog.objects.filter(date=date),
+                            to_attr='logs_for_date',
+                        )
+                    ),
+                    to_attr='active_assignments',
+                ),
+            ).get(id=bunk_id)
             serialized_bunk = BunkSerializer(bunk).data
-            # Get the unit
-            unit = Unit.objects.filter(bunks=bunk).first()
-            serialized_unit = UnitSerializer(unit).data if unit else None
-            # Get camper assignments for this bunk
-            assignments = CamperBunkAssignment.objects.filter(
-                bunk=bunk,
-                is_active=True,
-            ).select_related('camper')
+            serialized_unit = UnitSerializer(bunk.unit).data if bunk.unit else None
             # Get bunk logs for these assignments on the given date
             campers_data = []
-            for assignment in assignments:
-                # Get bunk log for this assignment and date (if exists)
-                try:
-                    bunk_log = BunkLog.objects.get(
-                        bunk_assignment=assignment,
-                        date=date
-                    )
-                    serialized_log = BunkLogSerializer(bunk_log).data
-                except BunkLog.DoesNotExist:
-                    serialized_log = None
+            for assignment in bunk.active_assignments:
+                # At most one log per assignment and date (unique_together)
+                bunk_log = assignment.logs_for_date[0] if assignment.logs_for_date else None
+                serialized_log = BunkLogSerializer(bunk_log).data if bunk_log else None
                 # Add to campers list
                 campers_data.append({
                     "camper_id": str(assignment.camper.id),
@@ -203,8 +259,8 @@ class BunkLogsInfoByDateViewSet(APIView):
                     "camper_last_name": assignment.camper.last_name,
                     "bunk_log": serialized_log,
                 })
-            # Get counselors for this bunk
-            counselors_data = []  # You'll need to implement this part
+            # Counselors come from the prefetch above
+            counselors_data = []
             for counselor in bunk.counselors.all():
                 counselors_data.append({
                     "id": str(counselor.id),
@@ -213,40 +269,85 @@ class BunkLogsInfoByDateViewSet(APIView):
                     "email": counselor.email,
                 })
             response_data = {
-                "date": date,
+                "date": date.isoformat(),
                 "bunk": serialized_bunk,
                 "unit": serialized_unit,
                 "campers": campers_data,
                 "counselors": counselors_data
             }
+            set_cached_roster(bunk_id, date, response_data)
             return Response(response_data)
         except Bunk.DoesNotExist:
             return Response({"error": f"Bunk with ID {bunk_id} not found"}, status=404)
         except Exception as e:
             return Response({"error": str(e)}, status=500)
 
-class UnitViewSet(viewsets.ModelViewSet):
+class UnitViewSet(StreamingListMixin, viewsets.ModelViewSet):
     renderer_classes = [JSONRenderer]
     permission_classes = [AllowAny]
+    query_budget = 8
     queryset = Unit.objects.all()
     serializer_class = UnitSerializer
+    cursor_ordering = ('id',)
 
-class CamperViewSet(viewsets.ModelViewSet):
+    @action(detail=True, methods=['get'], url_path='summary')
+    def summary(self, request, pk=None):
+        """
+        Daily score averages for the unit and each of its bunks, read from the
+        precomputed summary tables. '?from=' and '?to=' (YYYY-MM-DD) bound the
+        range, which defaults to the last two weeks.
+        """
+        unit = self.get_object()
+        to_param = request.query_params.get('to')
+        from_param = request.query_params.get('from')
+        try:
+            date_to = datetime.date.fromisoformat(to_param) if to_param else timezone.localdate()
+            date_from = (
+                datetime.date.fromisoformat(from_param) if from_param
+                else date_to - datetime.timedelta(days=13)
+            )
+        except ValueError:
+            return Response({"error": "'from' and 'to' must be dates in YYYY-MM-DD format."}, status=400)
+        if date_from > date_to:
+            return Response({"error": "'from' must not be after 'to'."}, status=400)
+
+        unit_days = UnitDailySummary.objects.filter(unit=unit, date__range=(date_from, date_to))
+        bunk_days = BunkDailySummary.objects.filter(
+            bunk__unit=unit, date__range=(date_from, date_to),
+        ).order_by('bunk_id', 'date')
+        return Response({
+            "unit_id": unit.id,
+            "from": date_from,
+            "to": date_to,
+            "days": UnitDailySummarySerializer(unit_days, many=True).data,
+            "bunks": BunkDailySummarySerializer(bunk_days, many=True).data,
+        })
+
+class CamperViewSet(StreamingListMixin, viewsets.ModelViewSet):
     renderer_classes = [JSONRenderer]
     permission_classes = [AllowAny]
+    query_budget = 8
     queryset = Camper.objects.all()
     serializer_class = CamperSerializer
+    cursor_ordering = ('last_name', 'first_name', 'id')
 
-class CamperBunkAssignmentViewSet(viewsets.ModelViewSet):
+class CamperBunkAssignmentViewSet(StreamingListMixin, viewsets.ModelViewSet):
     renderer_classes = [JSONRenderer]
     permission_classes = [AllowAny]
-    queryset = CamperBunkAssignment.objects.all()
+    query_budget = 8
+    queryset = CamperBunkAssignment.objects.select_related(
+        'camper', 'bunk__unit', 'bunk__cabin', 'bunk__session'
+    ).prefetch_related('bunk__counselors')
     serializer_class = CamperBunkAssignmentSerializer
+    cursor_ordering = ('id',)
 
-class BunkLogViewSet(viewsets.ModelViewSet):
+class BunkLogViewSet(StreamingListMixin, viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
+    query_budget = 10
     queryset = BunkLog.objects.all()
     serializer_class = BunkLogSerializer
+    # Newest first; id breaks ties between logs on the same date
+    cursor_ordering = ('-date', 'id')
     def get_queryset(self):
         user = self.request.user
         # Admin/staff can see all
@@ -255,29 +356,185 @@ class BunkLogViewSet(viewsets.ModelViewSet):
         # Unit heads can see logs for bunks in their units
         if user.role == 'Unit Head':
             return BunkLog.objects.filter(
-                bunk_assignment__bunk__unit__in=user.managed_units.all()
+                bunk_assignment__bunk_id__in=get_access_scope(self.request).unit_bunk_ids
             )
         # Counselors can only see logs for their bunks
         if user.role == 'Counselor':
             return BunkLog.objects.filter(
-                bunk_assignment__bunk__in=user.assigned_bunks.all()
+                bunk_assignment__bunk_id__in=get_access_scope(self.request).bunk_ids
             )
         # Default: see nothing
         return BunkLog.objects.none()
 
+    @action(detail=False, methods=['get'], url_path='export')
+    def export(self, request):
+        """
+        Stream the logs visible to the user as a file at
+        '/api/v1/bunklogs/export/?output=csv|ndjson'. Filter with '?session=',
+        '?unit=', '?bunk=' (ids) and '?from=' / '?to=' (YYYY-MM-DD).
+        """
+        try:
+            encode, content_type, extension = get_export_format(request.query_params.get('output', 'csv'))
+            filters = parse_export_filters(request.query_params)
+        except BunkLogExportError as e:
+            return Response({"error": str(e)}, status=400)
+        queryset = filter_bunk_logs(self.get_queryset(), filters)
+        response = StreamingHttpResponse(encode(queryset), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="bunklogs.{extension}"'
+        return response
+
     def perform_create(self, serializer):
         # Verify the user is allowed to create a log for this bunk assignment
         bunk_assignment = serializer.validated_data.get('bunk_assignment')
         if self.request.user.role == 'Counselor':
             # Check if user is a counselor for this bunk
-            if not self.request.user.assigned_bunks.filter(id=bunk_assignment.bunk.id).exists():
+            if not get_access_scope(self.request).counsels_bunk(bunk_assignment.bunk_id):
                 raise PermissionDenied("You are not authorized to create logs for this bunk.")
         # Set the counselor automatically to the current user
         serializer.save(counselor=self.request.user)
 
+class BunkLogBatchView(APIView):
+    """
+    Submit the logs for a whole bunk on one date in a single request.
+    The endpoint is '/api/v1/bunklogs/<bunk_id>/logs/<date>/batch/' and takes
+    {"logs": [{"camper_id": ..., "social_score": ..., ...}, ...]}.
+    Entries for campers that already have a log on that date update it.
+    Permissions are checked once for the bunk, every entry is validated in
+    memory against one prefetch of the bunk's assignments and existing logs,
+    and the logs are written in one transaction. If any entry is invalid,
+    nothing is written and the errors are returned per camper. The
+    assignments are locked while a batch runs, so batches for the same bunk
+    run one after another; a log saved outside a batch in the meantime
+    gives a 409.
+    """
+    renderer_classes = [JSONRenderer]
+    permission_classes = [IsAuthenticated]
+    query_budget = 12
+    updatable_fields = [
+        'not_on_camp',
+        'social_score',
+        'behavior_score',
+        'participation_score',
+        'request_camper_care_help',
+        'request_unit_head_help',
+        'description',
+    ]
+    CONFLICT_ERROR = "Logs for this bunk and date were saved by someone else meanwhile. Submit again."
+
+    def _prepare_logs(self, entries, assignments, log_date, user):
+        """
+        Validate the entries against the bunk's assignments and build the logs
+        to create and update, plus the fields the updates sent.
+        """
+        errors = []
+        to_create = []
+        to_update = []
+        update_fields = set()
+        seen_campers = set()
+        now = timezone.now()
+        for index, entry in enumerate(entries):
+            serializer = BunkLogBatchItemSerializer(data=entry)
+            camper_id = entry.get('camper_id') if isinstance(entry, dict) else None
+            if not serializer.is_valid():
+                errors.append({"index": index, "camper_id": camper_id, "errors": serializer.errors})
+                continue
+            data = serializer.validated_data
+            camper_id = data.pop('camper_id')
+            assignment = assignments.get(camper_id)
+            if camper_id in seen_campers:
+                errors.append({"index": index, "camper_id": camper_id,
+                               "errors": ["Duplicate entry for this camper."]})
+                continue
+            seen_campers.add(camper_id)
+            if assignment is None:
+                errors.append({"index": index, "camper_id": camper_id,
+                               "errors": ["Camper has no active assignment in this bunk."]})
+                continue
+            if assignment.logs_for_date:
+                bunk_log = assignment.logs_for_date[0]
+                # Only fields the entry sent; serializer defaults would wipe stored values
+                for field, value in data.items():
+                    if field in entry:
+                        setattr(bunk_log, field, value)
+                        update_fields.add(field)
+                # bulk_update skips auto_now, so stamp it explicitly
+                bunk_log.updated_at = now
+                to_update.append(bunk_log)
+            else:
+                to_create.append(BunkLog(
+                    bunk_assignment=assignment,
+                    date=log_date,
+                    counselor=user,
+                    **data,
+                ))
+        # Only the fields some entry sent are written, so values other
+        # writers changed meanwhile are not put back
+        return errors, to_create, to_update, [field for field in self.updatable_fields if field in update_fields]
+
+    def post(self, request, bunk_id, date):
+        try:
+            log_date = datetime.date.fromisoformat(date)
+        except ValueError:
+            return Response({"error": f"Invalid date: {date}. Expected YYYY-MM-DD."}, status=400)
+        try:
+            bunk = Bunk.objects.get(id=bunk_id)
+        except (Bunk.DoesNotExist, ValueError):
+            return Response({"error": f"Bunk with ID {bunk_id} not found"}, status=404)
+        # Same rule as BunkLogViewSet.perform_create, checked once for the bunk
+        if request.user.role == 'Counselor':
+            if not get_access_scope(request).counsels_bunk(bunk.id):
+                raise PermissionDenied("You are not authorized to create logs for this bunk.")
+
+        entries = request.data.get('logs') if hasattr(request.data, 'get') else None
+        if not isinstance(entries, list):
+            return Response({"error": "Expected a 'logs' list."}, status=400)
+
+        with transaction.atomic():
+            # Lock the bunk's assignments so concurrent batches for it take
+            # turns: the second one reads the logs the first created and
+            # updates them instead of creating them again
+            assignments = {
+                assignment.camper_id: assignment
+                for assignment in CamperBunkAssignment.objects.select_for_update().filter(
+                    bunk=bunk,
+                    is_active=True,
+                ).order_by('pk').prefetch_related(
+                    Prefetch(
+                        'bunk_logs',
+                        queryset=BunkLog.objects.filter(date=log_date),
+                        to_attr='logs_for_date',
+                    )
+                )
+            }
+            errors, to_create, to_update, update_fields = self._prepare_logs(
+                entries, assignments, log_date, request.user,
+            )
+            if errors:
+                return Response({"errors": errors}, status=400)
+
+            try:
+                with transaction.atomic():
+                    BunkLog.objects.bulk_create(to_create)
+                    BunkLog.objects.bulk_update(to_update, [*update_fields, 'updated_at'])
+            except IntegrityError:
+                # A log for one of these campers was saved outside a batch,
+                # which takes no lock, after the logs were read
+                return Response({"error": self.CONFLICT_ERROR}, status=409)
+        # Bulk writes do not send post_save
+        bunk_logs_bulk_saved.send(sender=BunkLog, keys={(bunk.id, log_date)})
+
+        return Response({
+            "date": log_date,
+            "bunk_id": str(bunk.id),
+            "created": len(to_create),
+            "updated": len(to_update),
+            "errors": [],
+        })
+
 class CamperBunkLogViewSet(APIView):
     renderer_classes = [JSONRenderer]
     permission_classes = [AllowAny]
+    query_budget = 10
     queryset = BunkLog.objects.all()
     serializer_class = BunkLogSerializer
     def get(self, request, camper_id):
@@ -312,6 +569,123 @@ class CamperBunkLogViewSet(APIView):
         except Camper.DoesNotExist:
             return Response({"error": f"Camper with ID {camper_id} not found"}, status=404)
 
+class CamperHistoryView(APIView):
+    """
+    Normalized history for one camper at '/api/v1/campers/<camper_id>/history/'.
+    The camper, bunks and counselors are listed once and logs refer to them
+    by id, so the response grows by one small dict per log. Built from a
+    fixed handful of queries regardless of how long the history is.
+    """
+    renderer_classes = [JSONRenderer]
+    permission_classes = [AllowAny]
+    query_budget = 6
+
+    def get(self, request, camper_id):
+        try:
+            camper = Camper.objects.get(id=camper_id)
+        except (Camper.DoesNotExist, ValueError):
+            return Response({"error": f"Camper with ID {camper_id} not found"}, status=404)
+        assignments = list(
+            CamperBunkAssignment.objects.filter(camper=camper)
+            .select_related('bunk__cabin', 'bunk__session', 'bunk__unit')
+            .prefetch_related('bunk__counselors')
+            .order_by('start_date', 'id')
+        )
+        logs = list(
+            BunkLog.objects.filter(bunk_assignment__camper=camper)
+            .order_by('date', 'id')
+            .values_list(*HISTORY_LOG_COLUMNS.values())
+        )
+        counselor_index = list(HISTORY_LOG_COLUMNS).index('counselor_id')
+        bunk_counselor_ids = {
+            user.id for assignment in assignments for user in assignment.bunk.counselors.all()
+        }
+        author_ids = {row[counselor_index] for row in logs} - bunk_counselor_ids
+        authors = (
+            User.objects.filter(id__in=author_ids).only('id', 'first_name', 'last_name', 'email')
+            if author_ids else []
+        )
+        return Response(CamperHistorySerializer({
+            "camper": camper,
+            "assignments": assignments,
+            "logs": logs,
+            "authors": authors,
+        }).data)
+
+class SyncView(APIView):
+    """
+    Delta sync at '/api/v1/sync?since=<cursor>' for offline clients.
+    Without 'since' every visible bunk, camper, assignment and log is
+    returned; with the cursor from the previous response only rows changed
+    since then, plus the ids of deleted rows. Responses are paged: while
+    'has_more' is true, call again with the returned cursor. See api/sync.py.
+    """
+    renderer_classes = [JSONRenderer]
+    permission_classes = [IsAuthenticated]
+    query_budget = 10
+
+    def get(self, request):
+        try:
+            payload = build_sync_payload(request, request.query_params.get('since'))
+        except InvalidCursor as e:
+            return Response({"error": str(e)}, status=400)
+        return Response(payload)
+
+class CamperCareWatchlistView(APIView):
+    """
+    Campers ranked by risk at '/api/v1/camper-care/watchlist'. Scores come
+    from the '?days=' days (default 28) ending on '?to=' (YYYY-MM-DD,
+    default today): falling scores, scores below bunk peers and repeated
+    camper care help requests all raise the rank. '?limit=' caps the list.
+    Per-bunk scores are cached and only recomputed for bunks with new logs;
+    see api/watchlist.py.
+    """
+    renderer_classes = [JSONRenderer]
+    permission_classes = [IsAuthenticated]
+    query_budget = 8
+    default_days = 28
+    max_days = 120
+    default_limit = 50
+    max_limit = 500
+
+    def get_bunk_ids(self, request):
+        user = request.user
+        if user.is_staff or user.role in ('Admin', 'Camper Care'):
+            return list(Bunk.objects.filter(is_active=True).values_list('id', flat=True))
+        if user.role == 'Unit Head':
+            return sorted(get_access_scope(request).unit_bunk_ids)
+        if user.role == 'Counselor':
+            return sorted(get_access_scope(request).bunk_ids)
+        return []
+
+    def get(self, request):
+        to_param = request.query_params.get('to')
+        try:
+            date_to = datetime.date.fromisoformat(to_param) if to_param else timezone.localdate()
+            days = int(request.query_params.get('days', self.default_days))
+            limit = int(request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            return Response({"error": "'to' must be a YYYY-MM-DD date; 'days' and 'limit' must be integers."}, status=400)
+        if not 1 <= days <= self.max_days:
+            return Response({"error": f"'days' must be between 1 and {self.max_days}."}, status=400)
+        if not 1 <= limit <= self.max_limit:
+            return Response({"error": f"'limit' must be between 1 and {self.max_limit}."}, status=400)
+
+        return Response({
+            "from": date_to - datetime.timedelta(days=days - 1),
+            "to": date_to,
+            "campers": build_watchlist(self.get_bunk_ids(request), date_to, days, limit),
+        })
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def metrics(request):
+    """Per-endpoint query and latency totals for this process, in Prometheus text format."""
+    return HttpResponse(
+        metrics_registry.render(),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def debug_user_bunks(request):
@@ -0,0 +1,108 @@
+"""
+Camper care watchlist: campers ranked by the risk score of
+bunklogs/services/risk.py.
+
+Peer z-scores only compare campers within a bunk, so each bunk's scores are
+computed and cached on their own, keyed by a per-bunk version, the window's
+end date and its length. Log writes bump the version of the bunks they touch
+(see api/signals.py), so after new logs arrive only those bunks are scored
+again; every other bunk is served from the cache. Bunks that do need scoring
+are loaded and scored together in one pass.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from bunklogs.services.risk import compute_camper_risk
+from bunks.models import Bunk
+from campers.models import Camper
+
+WATCHLIST_CACHE_PREFIX = "camper_risk"
+
+
+def _bunk_version_key(bunk_id):
+    return f"{WATCHLIST_CACHE_PREFIX}:bunk:{bunk_id}:version"
+
+
+def _get_bunk_versions(bunk_ids):
+    keys = {bunk_id: _bunk_version_key(bunk_id) for bunk_id in bunk_ids}
+    found = cache.get_many(keys.values())
+    versions = {}
+    for bunk_id, key in keys.items():
+        version = found.get(key)
+        if version is None:
+            # Seed with a timestamp so an evicted version never reuses an old key
+            cache.add(key, int(time.time() * 1000), timeout=None)
+            version = cache.get(key)
+        versions[bunk_id] = version
+    return versions
+
+
+def _bump_bunk_version(bunk_id):
+    key = _bunk_version_key(bunk_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, int(time.time() * 1000), timeout=None)
+
+
+def invalidate_camper_risk(bunk_ids):
+    """Drop the cached scores of these bunks, now and again once the write commits."""
+    bunk_ids = {bunk_id for bunk_id in bunk_ids if bunk_id is not None}
+    for bunk_id in bunk_ids:
+        _bump_bunk_version(bunk_id)
+    if bunk_ids:
+        transaction.on_commit(lambda: [_bump_bunk_version(bunk_id) for bunk_id in bunk_ids])
+
+
+def get_bunk_risk_rows(bunk_ids, date_to, days):
+    """Scores for every assignment in ``bunk_ids``, scoring only bunks missing from the cache."""
+    versions = _get_bunk_versions(bunk_ids)
+    keys = {
+        bunk_id: f"{WATCHLIST_CACHE_PREFIX}:{bunk_id}:{version}:{date_to}:{days}"
+        for bunk_id, version in versions.items()
+    }
+    cached = cache.get_many(keys.values())
+    rows = []
+    stale = []
+    for bunk_id, key in keys.items():
+        if key in cached:
+            rows.extend(cached[key])
+        else:
+            stale.append(bunk_id)
+    if stale:
+        fresh = {bunk_id: [] for bunk_id in stale}
+        for row in compute_camper_risk(stale, date_to, days):
+            fresh[row["bunk_id"]].append(row)
+        cache.set_many(
+            {keys[bunk_id]: bunk_rows for bunk_id, bunk_rows in fresh.items()},
+            timeout=settings.CAMPER_RISK_CACHE_TIMEOUT,
+        )
+        for bunk_rows in fresh.values():
+            rows.extend(bunk_rows)
+    return rows
+
+
+def build_watchlist(bunk_ids, date_to, days, limit):
+    """Rank the campers of ``bunk_ids`` by risk and attach camper and bunk names."""
+    rows = [row for row in get_bunk_risk_rows(bunk_ids, date_to, days) if row["risk_score"] > 0]
+    rows.sort(key=lambda row: (-row["risk_score"], row["camper_id"]))
+    rows = rows[:limit]
+
+    campers = Camper.objects.in_bulk({row["camper_id"] for row in rows})
+    bunks = Bunk.objects.select_related("cabin", "session").in_bulk({row["bunk_id"] for row in rows})
+    watchlist = []
+    for rank, row in enumerate(rows, start=1):
+        camper = campers.get(row["camper_id"])
+        bunk = bunks.get(row["bunk_id"])
+        watchlist.append({
+            "rank": rank,
+            **row,
+            "camper_first_name": camper.first_name if camper else None,
+            "camper_last_name": camper.last_name if camper else None,
+            "bunk_name": bunk.name if bunk else None,
+            "unit_id": bunk.unit_id if bunk else None,
+        })
+    return watchlist
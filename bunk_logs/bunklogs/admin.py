@@ -1,6 +1,6 @@
 from campers.models import CamperBunkAssignment
-import tempfile
-from pathlib import Path
+from imports.models import ImportJob
+from imports.services import enqueue_import
 
 from django.contrib import admin
 from django.contrib import messages
@@ -13,7 +13,7 @@ from .forms import BunkLogAdminForm
 from .forms import BunkSelectionForm
 from .forms import BunkLogCsvImportForm
 from .models import BunkLog
-from .services.imports import import_bunk_logs_from_csv, generate_sample_csv
+from .services.imports import generate_sample_csv
 
 
 @admin.register(BunkLog)
@@ -90,51 +90,20 @@ class BunkLogAdmin(admin.ModelAdmin):
         if request.method == "POST":
             form = BunkLogCsvImportForm(request.POST, request.FILES)
             if form.is_valid():
-                csv_file = form.cleaned_data["csv_file"]
-                dry_run = form.cleaned_data["dry_run"]
-
-                # Save the uploaded file to a secure temporary file
-                with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-                    temp_path = Path(temp_file.name)
-                    for chunk in csv_file.chunks():
-                        temp_file.write(chunk)
-
-                # Process the CSV file
-                try:
-                    # Get the current user as default counselor if they're staff
-                    default_counselor_email = request.user.email if request.user.is_staff else None
-                
-                    result = import_bunk_logs_from_csv(
-                        temp_path, 
-                        dry_run=dry_run,
-                        default_counselor_email=default_counselor_email
-                    )
-                
-                    if dry_run:
-                        messages.info(
-                            request,
-                            "Dry run completed. "
-                            f"{result['success_count']} bunklogs would be imported.",
-                        )
-                    else:
-                        messages.success(
-                            request,
-                            f"Successfully imported {result['success_count']} bunklogs.",
-                        )
-
-                    if result["error_count"] > 0:
-                        for error in result["errors"]:
-                            messages.error(
-                                request,
-                                f"Error in row {error['row']}: {error['error']}",
-                            )
-                except Exception as e:
-                    messages.error(request, f"Import failed: {str(e)}")
-                finally:
-                    # Clean up the temporary file
-                    temp_path.unlink(missing_ok=True)
-
-                    return redirect("admin:bunklogs_bunklog_changelist")
+                # Use the current user as default counselor if they're staff
+                default_counselor_email = request.user.email if request.user.is_staff else None
+                job = enqueue_import(
+                    ImportJob.BUNK_LOGS,
+                    form.cleaned_data["csv_file"],
+                    dry_run=form.cleaned_data["dry_run"],
+                    user=request.user,
+                    options={
+                        "default_counselor_email": default_counselor_email,
+                        "bulk": True,
+                    },
+                )
+                messages.info(request, f"Import queued as job #{job.pk}.")
+                return redirect("admin:imports_importjob_progress", job.pk)
         else:
             form = BunkLogCsvImportForm()
 
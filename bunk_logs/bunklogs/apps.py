@@ -1,6 +1,12 @@
+import contextlib
+
 from django.apps import AppConfig
 
 
 class BunklogsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "bunklogs"
+
+    def ready(self):
+        with contextlib.suppress(ImportError):
+            import bunklogs.signals  # noqa: F401
@@ -0,0 +1,134 @@
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db import transaction
+
+from bunklogs.models import BunkLog
+from bunklogs.services.seed import generate_camp
+from campers.models import CamperBunkAssignment
+
+
+class Command(BaseCommand):
+    help = (
+        "Show query plans and timings for the BunkLog and assignment access paths "
+        "covered by the composite and partial indexes"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--generate",
+            action="store_true",
+            help="Benchmark against a generated full-camp dataset that is rolled back afterwards",
+        )
+        parser.add_argument("--units", type=int, default=6)
+        parser.add_argument("--bunks-per-unit", type=int, default=10)
+        parser.add_argument("--campers-per-bunk", type=int, default=12)
+        parser.add_argument("--days", type=int, default=49)
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Number of timed runs per query",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options["generate"]:
+                self.stdout.write("Generating camp dataset...")
+                counts = generate_camp(
+                    units=options["units"],
+                    bunks_per_unit=options["bunks_per_unit"],
+                    campers_per_bunk=options["campers_per_bunk"],
+                    days=options["days"],
+                    label="Benchmark",
+                )
+                self.stdout.write(
+                    f"Created {counts['bunks']} bunks, {counts['campers']} campers "
+                    f"and {counts['bunk_logs']} bunk logs",
+                )
+                if connection.vendor == "postgresql":
+                    # Fresh statistics so the planner sees the generated rows
+                    with connection.cursor() as cursor:
+                        cursor.execute(
+                            f"ANALYZE {CamperBunkAssignment._meta.db_table}, {BunkLog._meta.db_table}",
+                        )
+
+            for name, index_name, queryset in self._queries():
+                self._benchmark(name, index_name, queryset, options["repeat"])
+
+            if options["generate"]:
+                transaction.set_rollback(True)
+                self.stdout.write(self.style.WARNING("Generated dataset rolled back."))
+
+    def _queries(self):
+        assignment = (
+            CamperBunkAssignment.objects.filter(is_active=True)
+            .order_by("-id")
+            .values("bunk_id", "camper_id")
+            .first()
+        )
+        latest_date = BunkLog.objects.order_by("-date").values_list("date", flat=True).first()
+        if assignment is None or latest_date is None:
+            msg = "No active assignments or bunk logs to benchmark; run with --generate."
+            raise CommandError(msg)
+        week_start = latest_date - timedelta(days=6)
+
+        return [
+            (
+                "Active assignments for a bunk",
+                "cba_active_bunk_idx",
+                CamperBunkAssignment.objects.filter(bunk_id=assignment["bunk_id"], is_active=True),
+            ),
+            (
+                "Active assignment for a camper",
+                "cba_camper_active_idx",
+                CamperBunkAssignment.objects.filter(camper_id=assignment["camper_id"], is_active=True),
+            ),
+            (
+                "Logs for a date across bunks",
+                "bunklog_date_assignment_idx",
+                BunkLog.objects.filter(date=latest_date),
+            ),
+            (
+                "Camper care requests for the last week",
+                "bunklog_camper_care_date_idx",
+                BunkLog.objects.filter(
+                    request_camper_care_help=True,
+                    date__range=(week_start, latest_date),
+                ),
+            ),
+            (
+                "Unit head requests for the last week",
+                "bunklog_unit_head_date_idx",
+                BunkLog.objects.filter(
+                    request_unit_head_help=True,
+                    date__range=(week_start, latest_date),
+                ),
+            ),
+        ]
+
+    def _benchmark(self, name, index_name, queryset, repeat):
+        self.stdout.write(self.style.MIGRATE_HEADING(f"\n{name} (expects {index_name})"))
+
+        explain_options = {"analyze": True} if connection.vendor == "postgresql" else {}
+        plan = queryset.explain(**explain_options)
+        self.stdout.write(plan)
+        if index_name in plan:
+            self.stdout.write(self.style.SUCCESS(f"Uses {index_name}"))
+        else:
+            self.stdout.write(self.style.WARNING(f"Plan does not use {index_name}"))
+
+        timings = []
+        rows = 0
+        for _ in range(repeat):
+            started = time.perf_counter()
+            rows = len(list(queryset.values_list("id", flat=True)))
+            timings.append((time.perf_counter() - started) * 1000)
+        self.stdout.write(
+            f"{rows} rows, median {statistics.median(timings):.2f} ms, "
+            f"min {min(timings):.2f} ms over {repeat} runs",
+        )
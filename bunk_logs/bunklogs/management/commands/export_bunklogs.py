@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from bunklogs.services.exports import BunkLogExportError
+from bunklogs.services.exports import EXPORT_FORMATS
+from bunklogs.services.exports import filter_bunk_logs
+from bunklogs.services.exports import get_export_format
+from bunklogs.services.exports import parse_export_filters
+from bunklogs.services.exports import write_parquet_dataset
+
+PARQUET = "parquet"
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream bunk logs to a CSV or NDJSON file, or to stdout, or write them "
+        "to a directory as a Parquet dataset partitioned by session and date"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", dest="output_format", choices=[*EXPORT_FORMATS, PARQUET], default="csv")
+        parser.add_argument("--output", help="File to write (default: stdout); directory for parquet")
+        parser.add_argument("--session", help="Session id")
+        parser.add_argument("--unit", help="Unit id")
+        parser.add_argument("--bunk", help="Bunk id")
+        parser.add_argument("--from", dest="date_from", help="First date (YYYY-MM-DD)")
+        parser.add_argument("--to", dest="date_to", help="Last date (YYYY-MM-DD)")
+
+    def handle(self, *args, **options):
+        output_format = options["output_format"]
+        if output_format == PARQUET and not options["output"]:
+            raise CommandError("--output is required for parquet exports")
+        try:
+            filters = parse_export_filters({
+                "session": options["session"],
+                "unit": options["unit"],
+                "bunk": options["bunk"],
+                "from": options["date_from"],
+                "to": options["date_to"],
+            })
+            if output_format == PARQUET:
+                count = write_parquet_dataset(filter_bunk_logs(filters=filters), options["output"])
+                self.stderr.write(self.style.SUCCESS(f"Exported {count} bunk logs to {options['output']}"))
+                return
+            encode, _, _ = get_export_format(output_format)
+        except BunkLogExportError as e:
+            raise CommandError(str(e)) from e
+
+        chunks = encode(filter_bunk_logs(filters=filters))
+        if not options["output"]:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+        with open(options["output"], "w", newline="", encoding="utf-8") as f:
+            f.writelines(chunks)
+        self.stderr.write(self.style.SUCCESS(f"Exported bunk logs to {options['output']}"))
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from bunklogs.services.imports import BULK_BATCH_SIZE
+from bunklogs.services.imports import BunkLogImportError
+from bunklogs.services.imports import import_bunk_logs_from_csv
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk import bunk logs from a CSV file, optionally validating batches "
+        "in several worker processes for large backfills"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file to import")
+        parser.add_argument("--dry-run", action="store_true", help="Validate without saving")
+        parser.add_argument("--default-counselor-email", help="Counselor for rows without counselor_email")
+        parser.add_argument("--batch-size", type=int, default=BULK_BATCH_SIZE, help="Rows per batch")
+        parser.add_argument("--workers", type=int, default=1, help="Processes that parse and validate rows")
+
+    def handle(self, *args, **options):
+        try:
+            result = import_bunk_logs_from_csv(
+                options["path"],
+                dry_run=options["dry_run"],
+                default_counselor_email=options["default_counselor_email"],
+                bulk=True,
+                batch_size=options["batch_size"],
+                workers=options["workers"],
+                progress=lambda done, _result: self.stderr.write(f"{done} rows processed"),
+            )
+        except BunkLogImportError as e:
+            raise CommandError(str(e)) from e
+
+        for error in result["errors"]:
+            self.stderr.write(f"Row {error['row']}: {error['error']}")
+        verb = "Validated" if options["dry_run"] else "Imported"
+        self.stdout.write(
+            self.style.SUCCESS(f"{verb} {result['success_count']} bunk logs, {result['error_count']} errors"),
+        )
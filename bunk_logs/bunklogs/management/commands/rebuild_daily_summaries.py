@@ -0,0 +1,21 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from bunklogs.services.summaries import rebuild_daily_summaries
+
+
+class Command(BaseCommand):
+    help = "Rebuild the bunk and unit daily score summaries from the bunk logs"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--from", dest="date_from", type=date.fromisoformat, help="First date (YYYY-MM-DD)")
+        parser.add_argument("--to", dest="date_to", type=date.fromisoformat, help="Last date (YYYY-MM-DD)")
+
+    def handle(self, *args, **options):
+        counts = rebuild_daily_summaries(options["date_from"], options["date_to"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt {counts['bunk_summaries']} bunk and {counts['unit_summaries']} unit summaries",
+            ),
+        )
@@ -0,0 +1,62 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from bunklogs.services.seed import generate_camp
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a synthetic camp (sessions, units, cabins, bunks, counselors, "
+        "campers, assignments and a season of bunk logs) for load testing"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sessions", type=int, default=2, help="Number of back-to-back sessions")
+        parser.add_argument("--units", type=int, default=6, help="Number of units")
+        parser.add_argument("--bunks", type=int, default=10, help="Bunks per unit in each session")
+        parser.add_argument("--campers", type=int, default=12, help="Campers per bunk")
+        parser.add_argument("--counselors", type=int, default=2, help="Counselors per bunk")
+        parser.add_argument("--days", type=int, default=28, help="Days of logs per session")
+        parser.add_argument(
+            "--start-date",
+            type=date.fromisoformat,
+            help="First day of the first session (YYYY-MM-DD); defaults to June 20 this year",
+        )
+        parser.add_argument(
+            "--label",
+            default="Seed",
+            help="Prefix for generated names and emails; use a new one to seed again",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed")
+
+    def handle(self, *args, **options):
+        slug = options["label"].lower().replace(" ", "-")
+        if User.objects.filter(email__startswith=f"{slug}-").exists():
+            msg = f"Data labelled '{options['label']}' already exists; pass a different --label."
+            raise CommandError(msg)
+
+        counts = generate_camp(
+            sessions=options["sessions"],
+            units=options["units"],
+            bunks_per_unit=options["bunks"],
+            campers_per_bunk=options["campers"],
+            counselors_per_bunk=options["counselors"],
+            days=options["days"],
+            start_date=options["start_date"],
+            label=options["label"],
+            seed=options["seed"],
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {counts['sessions']} sessions, {counts['units']} units, "
+                f"{counts['bunks']} bunks, {counts['counselors']} counselors, "
+                f"{counts['campers']} campers and {counts['bunk_logs']} bunk logs "
+                f"({counts['start_date']} to {counts['end_date']})",
+            ),
+        )
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bunklogs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bunklog',
+            index=models.Index(fields=['date', 'bunk_assignment'], name='bunklog_date_assignment_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bunklog',
+            index=models.Index(condition=models.Q(('request_camper_care_help', True)), fields=['date'], name='bunklog_camper_care_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bunklog',
+            index=models.Index(condition=models.Q(('request_unit_head_help', True)), fields=['date'], name='bunklog_unit_head_date_idx'),
+        ),
+    ]
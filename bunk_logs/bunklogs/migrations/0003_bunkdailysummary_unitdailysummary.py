@@ -0,0 +1,58 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bunklogs', '0002_bunklog_indexes'),
+        ('bunks', '0002_alter_bunk_counselors_alter_unit_unit_head'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BunkDailySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('log_count', models.PositiveIntegerField(default=0)),
+                ('not_on_camp_count', models.PositiveIntegerField(default=0)),
+                ('avg_social_score', models.FloatField(blank=True, null=True)),
+                ('avg_behavior_score', models.FloatField(blank=True, null=True)),
+                ('avg_participation_score', models.FloatField(blank=True, null=True)),
+                ('camper_care_help_count', models.PositiveIntegerField(default=0)),
+                ('unit_head_help_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('bunk', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_summaries', to='bunks.bunk')),
+            ],
+            options={
+                'verbose_name': 'bunk daily summary',
+                'verbose_name_plural': 'bunk daily summaries',
+                'ordering': ['date'],
+                'unique_together': {('bunk', 'date')},
+            },
+        ),
+        migrations.CreateModel(
+            name='UnitDailySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('log_count', models.PositiveIntegerField(default=0)),
+                ('not_on_camp_count', models.PositiveIntegerField(default=0)),
+                ('avg_social_score', models.FloatField(blank=True, null=True)),
+                ('avg_behavior_score', models.FloatField(blank=True, null=True)),
+                ('avg_participation_score', models.FloatField(blank=True, null=True)),
+                ('camper_care_help_count', models.PositiveIntegerField(default=0)),
+                ('unit_head_help_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('bunk_count', models.PositiveIntegerField(default=0)),
+                ('unit', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_summaries', to='bunks.unit')),
+            ],
+            options={
+                'verbose_name': 'unit daily summary',
+                'verbose_name_plural': 'unit daily summaries',
+                'ordering': ['date'],
+                'unique_together': {('unit', 'date')},
+            },
+        ),
+    ]
@@ -55,6 +55,21 @@ class BunkLog(models.Model):
         verbose_name_plural = _("bunk logs")
         unique_together = ("bunk_assignment", "date")
         ordering = ["-date"]
+        indexes = [
+            # Date-first lookups across bunks; unique_together only serves per-assignment ones
+            models.Index(fields=["date", "bunk_assignment"], name="bunklog_date_assignment_idx"),
+            # Help requests are rare, so partial indexes keep these lists cheap
+            models.Index(
+                fields=["date"],
+                condition=models.Q(request_camper_care_help=True),
+                name="bunklog_camper_care_date_idx",
+            ),
+            models.Index(
+                fields=["date"],
+                condition=models.Q(request_unit_head_help=True),
+                name="bunklog_unit_head_date_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"Log for {self.bunk_assignment.camper} on {self.date}"
@@ -63,3 +78,62 @@ class BunkLog(models.Model):
     def camper(self):
         """Property to maintain compatibility with existing code."""
         return self.bunk_assignment.camper
+
+
+class DailySummaryFields(models.Model):
+    """Score averages and flag counts shared by the daily summary tables."""
+
+    date = models.DateField()
+    log_count = models.PositiveIntegerField(default=0)
+    not_on_camp_count = models.PositiveIntegerField(default=0)
+    avg_social_score = models.FloatField(null=True, blank=True)
+    avg_behavior_score = models.FloatField(null=True, blank=True)
+    avg_participation_score = models.FloatField(null=True, blank=True)
+    camper_care_help_count = models.PositiveIntegerField(default=0)
+    unit_head_help_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        abstract = True
+
+
+class BunkDailySummary(DailySummaryFields):
+    """
+    Precomputed scores for one bunk on one date, refreshed whenever the
+    bunk's logs for that date change (see services/summaries.py).
+    """
+
+    bunk = models.ForeignKey(
+        "bunks.Bunk",
+        on_delete=models.CASCADE,
+        related_name="daily_summaries",
+    )
+
+    class Meta:
+        verbose_name = _("bunk daily summary")
+        verbose_name_plural = _("bunk daily summaries")
+        unique_together = ("bunk", "date")
+        ordering = ["date"]
+
+    def __str__(self):
+        return f"Summary for bunk {self.bunk_id} on {self.date}"
+
+
+class UnitDailySummary(DailySummaryFields):
+    """Precomputed scores across every bunk of a unit on one date."""
+
+    unit = models.ForeignKey(
+        "bunks.Unit",
+        on_delete=models.CASCADE,
+        related_name="daily_summaries",
+    )
+    bunk_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = _("unit daily summary")
+        verbose_name_plural = _("unit daily summaries")
+        unique_together = ("unit", "date")
+        ordering = ["date"]
+
+    def __str__(self):
+        return f"Summary for unit {self.unit_id} on {self.date}"
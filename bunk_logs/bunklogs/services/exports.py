@@ -0,0 +1,272 @@
+"""
+Export of bunk logs as streaming CSV or NDJSON, or as Parquet.
+
+Rows are read with a ``values()`` projection through ``.iterator()``, which
+uses a server-side cursor on PostgreSQL, and encoded one at a time, so a
+whole season exports in constant memory and the first bytes go out before
+the query has been fully read. The CSV columns match the bunk log importer
+(``get_expected_columns``) plus id and unit/session columns, so an export
+can be edited and imported again.
+
+``write_parquet_dataset`` writes the same logs, joined with their camper,
+bunk, unit and session, as a Parquet dataset for notebook analysis.
+"""
+import csv
+import json
+from datetime import date
+from itertools import islice
+from pathlib import Path
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from bunklogs.models import BunkLog
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Output column -> values() lookup
+EXPORT_VALUE_FIELDS = {
+    "id": "id",
+    "date": "date",
+    "camper_id": "bunk_assignment__camper_id",
+    "camper_first_name": "bunk_assignment__camper__first_name",
+    "camper_last_name": "bunk_assignment__camper__last_name",
+    "bunk_id": "bunk_assignment__bunk_id",
+    "cabin_name": "bunk_assignment__bunk__cabin__name",
+    "session_name": "bunk_assignment__bunk__session__name",
+    "unit_name": "bunk_assignment__bunk__unit__name",
+    "counselor_email": "counselor__email",
+    "not_on_camp": "not_on_camp",
+    "social_score": "social_score",
+    "behavior_score": "behavior_score",
+    "participation_score": "participation_score",
+    "camper_care_help": "request_camper_care_help",
+    "unit_head_help": "request_unit_head_help",
+    "description": "description",
+}
+EXPORT_COLUMNS = [
+    "id",
+    "date",
+    "camper_id",
+    "camper_first_name",
+    "camper_last_name",
+    "bunk_id",
+    "bunk",
+    "unit_name",
+    "session_name",
+    "counselor_email",
+    "not_on_camp",
+    "social_score",
+    "behavior_score",
+    "participation_score",
+    "camper_care_help",
+    "unit_head_help",
+    "description",
+]
+EXPORT_FILTER_PARAMS = {
+    "session": "bunk_assignment__bunk__session_id",
+    "unit": "bunk_assignment__bunk__unit_id",
+    "bunk": "bunk_assignment__bunk_id",
+}
+
+
+class BunkLogExportError(ValueError):
+    """Raised for export filters or formats that cannot be used."""
+
+    INVALID_FORMAT = "Unsupported export format"
+    INVALID_ID = "must be an integer id"
+    INVALID_DATE = "must be a date in YYYY-MM-DD format"
+    INVALID_RANGE = "'from' must not be after 'to'"
+    PYARROW_MISSING = "Parquet export requires pyarrow (see requirements/base.txt)"
+    OUTPUT_NOT_EMPTY = "Parquet output directory {} is not empty"
+
+
+def parse_export_filters(params):
+    """
+    Validate export filters from query parameters or command options.
+    Accepts 'session', 'unit', 'bunk' (ids) and 'from'/'to' (YYYY-MM-DD);
+    missing or empty values are left out.
+    """
+    filters = {}
+    for name in EXPORT_FILTER_PARAMS:
+        value = params.get(name)
+        if value in (None, ""):
+            continue
+        try:
+            filters[name] = int(value)
+        except (TypeError, ValueError) as e:
+            raise BunkLogExportError(f"'{name}' {BunkLogExportError.INVALID_ID}") from e
+    for name in ("from", "to"):
+        value = params.get(name)
+        if value in (None, ""):
+            continue
+        if isinstance(value, date):
+            filters[name] = value
+            continue
+        try:
+            filters[name] = date.fromisoformat(value)
+        except (TypeError, ValueError) as e:
+            raise BunkLogExportError(f"'{name}' {BunkLogExportError.INVALID_DATE}") from e
+    if "from" in filters and "to" in filters and filters["from"] > filters["to"]:
+        raise BunkLogExportError(BunkLogExportError.INVALID_RANGE)
+    return filters
+
+
+def filter_bunk_logs(queryset=None, filters=None):
+    """Apply filters from ``parse_export_filters`` to a BunkLog queryset."""
+    queryset = BunkLog.objects.all() if queryset is None else queryset
+    filters = filters or {}
+    lookups = {EXPORT_FILTER_PARAMS[name]: filters[name] for name in EXPORT_FILTER_PARAMS if name in filters}
+    if "from" in filters:
+        lookups["date__gte"] = filters["from"]
+    if "to" in filters:
+        lookups["date__lte"] = filters["to"]
+    return queryset.filter(**lookups)
+
+
+def iter_export_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield one dict per log, keyed by EXPORT_COLUMNS, in (date, id) order."""
+    rows = queryset.order_by("date", "id").values(*EXPORT_VALUE_FIELDS.values())
+    for row in rows.iterator(chunk_size=chunk_size):
+        record = {column: row[lookup] for column, lookup in EXPORT_VALUE_FIELDS.items()}
+        # Same "cabin - session" form the importer expects
+        record["bunk"] = f"{record.pop('cabin_name')} - {record['session_name']}"
+        yield record
+
+
+class _Echo:
+    """File-like object whose write() returns the value, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return "" if value is None else value
+
+
+def iter_csv(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield the export as CSV lines, header first."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_COLUMNS)
+    for record in iter_export_rows(queryset, chunk_size):
+        yield writer.writerow([_csv_value(record[column]) for column in EXPORT_COLUMNS])
+
+
+def iter_ndjson(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield the export as one JSON object per line."""
+    for record in iter_export_rows(queryset, chunk_size):
+        yield json.dumps({column: record[column] for column in EXPORT_COLUMNS}, cls=DjangoJSONEncoder) + "\n"
+
+
+# Format -> (encoder, content type, file extension)
+EXPORT_FORMATS = {
+    "csv": (iter_csv, "text/csv", "csv"),
+    "ndjson": (iter_ndjson, "application/x-ndjson", "ndjson"),
+}
+
+
+def get_export_format(name):
+    try:
+        return EXPORT_FORMATS[name]
+    except KeyError as e:
+        formats = ", ".join(EXPORT_FORMATS)
+        raise BunkLogExportError(f"{BunkLogExportError.INVALID_FORMAT}: {name}. Use one of: {formats}") from e
+
+
+# Parquet column -> values() lookup. Chunks are much larger than for the
+# text formats: each one becomes a columnar table written in one go.
+PARQUET_CHUNK_SIZE = 50000
+PARQUET_VALUE_FIELDS = {
+    "id": "id",
+    "session_id": "bunk_assignment__bunk__session_id",
+    "date": "date",
+    "session_name": "bunk_assignment__bunk__session__name",
+    "unit_id": "bunk_assignment__bunk__unit_id",
+    "unit_name": "bunk_assignment__bunk__unit__name",
+    "bunk_id": "bunk_assignment__bunk_id",
+    "cabin_name": "bunk_assignment__bunk__cabin__name",
+    "camper_id": "bunk_assignment__camper_id",
+    "camper_first_name": "bunk_assignment__camper__first_name",
+    "camper_last_name": "bunk_assignment__camper__last_name",
+    "counselor_id": "counselor_id",
+    "not_on_camp": "not_on_camp",
+    "social_score": "social_score",
+    "behavior_score": "behavior_score",
+    "participation_score": "participation_score",
+    "camper_care_help": "request_camper_care_help",
+    "unit_head_help": "request_unit_head_help",
+    "description": "description",
+}
+PARQUET_PARTITION_COLUMNS = ["session_id", "date"]
+
+
+def _parquet_schema(pa):
+    # Names repeat on every row of a bunk or unit, so they are stored once per
+    # file as dictionaries and load into pandas as categoricals
+    names = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("id", pa.int64()),
+        ("session_id", pa.int64()),
+        ("date", pa.date32()),
+        ("session_name", names),
+        ("unit_id", pa.int64()),
+        ("unit_name", names),
+        ("bunk_id", pa.int64()),
+        ("cabin_name", names),
+        ("camper_id", pa.int64()),
+        ("camper_first_name", pa.string()),
+        ("camper_last_name", pa.string()),
+        ("counselor_id", pa.int64()),
+        ("not_on_camp", pa.bool_()),
+        ("social_score", pa.int8()),
+        ("behavior_score", pa.int8()),
+        ("participation_score", pa.int8()),
+        ("camper_care_help", pa.bool_()),
+        ("unit_head_help", pa.bool_()),
+        ("description", pa.string()),
+    ])
+
+
+def write_parquet_dataset(queryset, root, chunk_size=PARQUET_CHUNK_SIZE):
+    """
+    Write the logs in ``queryset`` under ``root`` as Parquet files partitioned
+    by session and date (``root/session_id=<id>/date=<YYYY-MM-DD>/*.parquet``).
+    Rows are read in chunks through a server-side cursor and each chunk is
+    written as its own set of files, so memory is bounded by ``chunk_size``.
+    ``root`` must be missing or empty: files of an earlier export would be
+    read back as part of the dataset. Returns the number of rows written.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise BunkLogExportError(BunkLogExportError.PYARROW_MISSING) from e
+    # One partition can span several chunks, so earlier files cannot be
+    # replaced partition by partition as they are written
+    if Path(root).is_dir() and any(Path(root).iterdir()):
+        raise BunkLogExportError(BunkLogExportError.OUTPUT_NOT_EMPTY.format(root))
+
+    schema = _parquet_schema(pa)
+    columns = list(PARQUET_VALUE_FIELDS)
+    # Session then date order keeps each chunk within a few partitions
+    rows = queryset.order_by(PARQUET_VALUE_FIELDS["session_id"], "date", "id").values_list(
+        *PARQUET_VALUE_FIELDS.values(),
+    ).iterator(chunk_size=min(chunk_size, EXPORT_CHUNK_SIZE))
+    total = 0
+    chunk_index = 0
+    while chunk := list(islice(rows, chunk_size)):
+        table = pa.Table.from_arrays(
+            [pa.array(values, type=schema.field(name).type) for name, values in zip(columns, zip(*chunk))],
+            schema=schema,
+        )
+        pq.write_to_dataset(
+            table,
+            root_path=str(root),
+            partition_cols=PARQUET_PARTITION_COLUMNS,
+            basename_template=f"part-{chunk_index}-{{i}}.parquet",
+        )
+        total += len(chunk)
+        chunk_index += 1
+    return total
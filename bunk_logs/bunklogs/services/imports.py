@@ -1,17 +1,38 @@
-import csv
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional
 
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from django.utils import timezone
+from imports.streaming import CsvSource
+from imports.streaming import Progress
+from imports.streaming import csv_dict_reader
+from imports.streaming import iter_batches
+from imports.streaming import report_result
 
-from bunks.models import Bunk
+from bunks.services.references import ReferenceResolver
 from campers.models import CamperBunkAssignment
 from bunklogs.models import BunkLog
+from bunklogs.signals import bunk_logs_bulk_saved
 
 User = get_user_model()
 
+BULK_BATCH_SIZE = 1000
+TRUE_VALUES = ["true", "yes", "1", "t", "y"]
+ERROR_ROW_FIELDS = ["date", "camper_first_name", "camper_last_name", "bunk", "counselor_email"]
+BUNK_LOG_VALUE_FIELDS = [
+    "counselor",
+    "not_on_camp",
+    "social_score",
+    "behavior_score",
+    "participation_score",
+    "request_camper_care_help",
+    "request_unit_head_help",
+    "description",
+    "updated_at",
+]
+
 class BunkLogImportError(ValueError):
     """Custom exception for bunk log import errors."""
     MISSING_BUNK = "Bunk is required"
@@ -44,14 +65,36 @@ def _validate_score(score: Optional[str]) -> Optional[int]:
     except ValueError:
         raise BunkLogImportError(f"Invalid score format: {score}")
 
-def import_bunk_logs_from_csv(file_path: Union[str, Path], *, dry_run: bool = False, default_counselor_email: str = None) -> Dict:
+def import_bunk_logs_from_csv(
+    source: CsvSource,
+    *,
+    dry_run: bool = False,
+    default_counselor_email: str = None,
+    bulk: bool = False,
+    batch_size: int = BULK_BATCH_SIZE,
+    progress: Optional[Progress] = None,
+    workers: int = 1,
+    start_row: int = 0,
+) -> Dict:
     """
     Imports bunk logs from a CSV file.
 
     Args:
-        file_path: Path to the CSV file
+        source: Path to the CSV file, or an iterable of bytes chunks such as
+            UploadedFile.chunks(); the file is decoded and parsed as it streams
         dry_run: If True, validation is performed but no data is written to database
         default_counselor_email: Email of default counselor to use if not in CSV
+        bulk: If True, resolve bunks, counselors and assignments for each
+            batch with a few IN queries and upsert its logs in one statement
+            instead of querying and saving row by row
+        batch_size: Rows read, resolved and upserted at a time in bulk mode
+        progress: Called with the number of rows handled and the result so
+            far after each batch
+        workers: With bulk and a file path, parse and validate batches in
+            this many processes (see bunklogs.services.parallel); rows are
+            still written in file order by this process
+        start_row: Data rows to read past without importing, such as those
+            an interrupted import run already committed
 
     The CSV file should have headers:
     - date (YYYY-MM-DD)
@@ -77,13 +120,14 @@ def import_bunk_logs_from_csv(file_path: Union[str, Path], *, dry_run: bool = Fa
         "errors": []
     }
     
-    # Ensure file_path is a string
-    if isinstance(file_path, Path):
-        file_path = str(file_path)
-
     # Check if file exists
-    if not Path(file_path).exists():
-        raise BunkLogImportError(f'File {file_path} does not exist')
+    if isinstance(source, (str, Path)) and not Path(source).exists():
+        raise BunkLogImportError(f'File {source} does not exist')
+
+    if workers > 1 and not (bulk and isinstance(source, (str, Path))):
+        raise BunkLogImportError("Parallel validation needs bulk mode and a file path")
+    if workers > 1 and start_row:
+        raise BunkLogImportError("Parallel validation cannot resume from a row")
     
     # Get default counselor if provided
     default_counselor = None
@@ -93,20 +137,65 @@ def import_bunk_logs_from_csv(file_path: Union[str, Path], *, dry_run: bool = Fa
         except User.DoesNotExist:
             raise BunkLogImportError(f"Default counselor with email {default_counselor_email} not found")
 
-    with open(file_path, "r", encoding="utf-8") as csvfile:
-        reader = csv.DictReader(csvfile)
-        
-        if not reader.fieldnames:
-            raise BunkLogImportError("CSV file is empty or has no headers")
-        
-        # Check for required fields
-        required_fields = ['date', 'camper_first_name', 'camper_last_name', 'bunk']
-        for field in required_fields:
-            if field not in reader.fieldnames:
-                raise BunkLogImportError(f"CSV file is missing required field: {field}")
-        
-        # Process all rows
-        for i, row in enumerate(reader):
+    reader = csv_dict_reader(source)
+    
+    if not reader.fieldnames:
+        raise BunkLogImportError("CSV file is empty or has no headers")
+    
+    # Check for required fields
+    required_fields = ['date', 'camper_first_name', 'camper_last_name', 'bunk']
+    for field in required_fields:
+        if field not in reader.fieldnames:
+            raise BunkLogImportError(f"CSV file is missing required field: {field}")
+
+    if bulk and workers > 1:
+        # Imported here: the parallel module builds on the helpers below
+        from .parallel import iter_validated_batches
+
+        for parsed, errors in iter_validated_batches(
+            source,
+            reader.fieldnames,
+            batch_size=batch_size,
+            workers=workers,
+            has_default_counselor=default_counselor is not None,
+            progress=report_result(progress, result),
+        ):
+            result["error_count"] += len(errors)
+            result["errors"].extend(errors)
+            _write_bunk_log_batch(parsed, result, dry_run=dry_run, default_counselor=default_counselor)
+        # Parse errors of a batch are collected before its lookup errors
+        result["errors"].sort(key=lambda error: error["row"])
+        return result
+
+    rows = enumerate(reader)
+    if bulk:
+        for batch in iter_batches(rows, batch_size, skip=start_row, progress=report_result(progress, result)):
+            _import_bunk_logs_bulk(
+                batch,
+                result,
+                dry_run=dry_run,
+                default_counselor=default_counselor,
+            )
+        # Parse errors of a batch are collected before its lookup errors
+        result["errors"].sort(key=lambda error: error["row"])
+        return result
+    
+    # Process all rows; progress is reported every batch_size rows
+    for batch in iter_batches(rows, batch_size, skip=start_row, progress=report_result(progress, result)):
+        # Bunks are matched as in bulk mode, through one ReferenceResolver
+        # per batch; rows with a malformed bunk name are reported below
+        bunk_keys = {
+            tuple(name.split(" - ", 1))
+            for name in ((row.get("bunk") or "").strip() for _, row in batch)
+            if " - " in name
+        }
+        references = ReferenceResolver(
+            cabins={cabin_name for cabin_name, _ in bunk_keys},
+            sessions={session_name for _, session_name in bunk_keys},
+            bunks=True,
+        )
+        bunks = _resolve_bunks(bunk_keys, references)
+        for i, row in batch:
             try:
                 # Extract data from row
                 date = row.get("date", "").strip()
@@ -114,17 +203,17 @@ def import_bunk_logs_from_csv(file_path: Union[str, Path], *, dry_run: bool = Fa
                 camper_last_name = row.get("camper_last_name", "").strip()
                 bunk_full_name = row.get("bunk", "").strip()  # This is now the full bunk name pattern
                 counselor_email = row.get("counselor_email", "").strip()
-                
+            
                 # Parse boolean fields with defaults
                 not_on_camp = row.get("not_on_camp", "").lower() in ["true", "yes", "1", "t", "y"]
                 request_camper_care_help = row.get("camper_care_help", "").lower() in ["true", "yes", "1", "t", "y"]
                 request_unit_head_help = row.get("unit_head_help", "").lower() in ["true", "yes", "1", "t", "y"]
-                
+            
                 # Get scores (can be None)
                 social_score = row.get("social_score", "").strip() or None
                 behavior_score = row.get("behavior_score", "").strip() or None
                 participation_score = row.get("participation_score", "").strip() or None
-                
+            
                 description = row.get("description", "").strip()
 
                 # Validate required fields
@@ -139,7 +228,7 @@ def import_bunk_logs_from_csv(file_path: Union[str, Path], *, dry_run: bool = Fa
                 # Handle counselor (either from CSV or default)
                 if not counselor_email and not default_counselor:
                     raise BunkLogImportError("Counselor email is required when no default counselor is provided")
-                
+            
                 # Validate date format
                 if not is_valid_date_format(date):
                     raise BunkLogImportError(BunkLogImportError.INVALID_DATE)
@@ -154,25 +243,9 @@ def import_bunk_logs_from_csv(file_path: Union[str, Path], *, dry_run: bool = Fa
                     raise BunkLogImportError(f"Invalid bunk name format: {bunk_full_name}. Expected format: 'cabin_name - session_name'")
 
                 # Find the bunk by cabin and session names
-                try:
-                    bunk_obj = Bunk.objects.get(
-                        cabin__name=cabin_name,
-                        session__name=session_name,
-                        is_active=True
-                    )
-                except Bunk.DoesNotExist:
-                    # Try to find without checking active status
-                    try:
-                        bunk_obj = Bunk.objects.get(
-                            cabin__name=cabin_name,
-                            session__name=session_name
-                        )
-                        if not bunk_obj.is_active:
-                            raise BunkLogImportError(f"Bunk '{bunk_full_name}' exists but is not active")
-                    except Bunk.DoesNotExist:
-                        raise BunkLogImportError(f"Bunk with cabin '{cabin_name}' and session '{session_name}' does not exist")
-                except Bunk.MultipleObjectsReturned:
-                    raise BunkLogImportError(f"Multiple active bunks found with cabin '{cabin_name}' and session '{session_name}'")
+                bunk_id = bunks[(cabin_name, session_name)]
+                if isinstance(bunk_id, BunkLogImportError):
+                    raise bunk_id
 
                 # Find the counselor
                 try:
@@ -188,7 +261,7 @@ def import_bunk_logs_from_csv(file_path: Union[str, Path], *, dry_run: bool = Fa
                     bunk_assignment = CamperBunkAssignment.objects.get(
                         camper__first_name__iexact=camper_first_name,
                         camper__last_name__iexact=camper_last_name,
-                        bunk=bunk_obj,
+                        bunk_id=bunk_id,
                         is_active=True
                     )
                 except CamperBunkAssignment.DoesNotExist:
@@ -247,7 +320,7 @@ def import_bunk_logs_from_csv(file_path: Union[str, Path], *, dry_run: bool = Fa
                     key: row.get(key, "N/A") 
                     for key in ["date", "camper_first_name", "camper_last_name", "bunk", "counselor_email"]
                 }
-                
+            
                 result["error_count"] += 1
                 result["errors"].append({
                     "row": i + 2,  # +2 for 1-based indexing and header row
@@ -270,6 +343,212 @@ def import_bunk_logs_from_csv(file_path: Union[str, Path], *, dry_run: bool = Fa
                 continue
 
     return result
+
+
+def _parse_bunk_log_row(row: Dict[str, str], *, has_default_counselor: bool) -> Dict[str, Any]:
+    """
+    Validate and normalize one CSV row without touching the database.
+    Raises BunkLogImportError with the same messages as the row-by-row import.
+    """
+    date = (row.get("date") or "").strip()
+    camper_first_name = (row.get("camper_first_name") or "").strip()
+    camper_last_name = (row.get("camper_last_name") or "").strip()
+    bunk_full_name = (row.get("bunk") or "").strip()
+    counselor_email = (row.get("counselor_email") or "").strip()
+
+    if not all([date, camper_first_name, camper_last_name, bunk_full_name]):
+        missing = [
+            field for field, value in [
+                ("date", date),
+                ("camper_first_name", camper_first_name),
+                ("camper_last_name", camper_last_name),
+                ("bunk", bunk_full_name),
+            ] if not value
+        ]
+        raise BunkLogImportError(f"Missing required data: {', '.join(missing)}")
+
+    if not counselor_email and not has_default_counselor:
+        raise BunkLogImportError("Counselor email is required when no default counselor is provided")
+
+    try:
+        parsed_date = datetime.strptime(date, "%Y-%m-%d").date()
+    except ValueError:
+        raise BunkLogImportError(BunkLogImportError.INVALID_DATE)
+
+    if " - " not in bunk_full_name:
+        raise BunkLogImportError(f"Invalid bunk name format: {bunk_full_name}. Expected format: 'cabin_name - session_name'")
+    cabin_name, session_name = bunk_full_name.split(" - ", 1)
+
+    return {
+        "date": parsed_date,
+        "camper_first_name": camper_first_name,
+        "camper_last_name": camper_last_name,
+        "bunk_full_name": bunk_full_name,
+        "cabin_name": cabin_name,
+        "session_name": session_name,
+        "counselor_email": counselor_email,
+        "not_on_camp": (row.get("not_on_camp") or "").lower() in TRUE_VALUES,
+        "request_camper_care_help": (row.get("camper_care_help") or "").lower() in TRUE_VALUES,
+        "request_unit_head_help": (row.get("unit_head_help") or "").lower() in TRUE_VALUES,
+        "social_score": _validate_score((row.get("social_score") or "").strip() or None),
+        "behavior_score": _validate_score((row.get("behavior_score") or "").strip() or None),
+        "participation_score": _validate_score((row.get("participation_score") or "").strip() or None),
+        "description": (row.get("description") or "").strip(),
+    }
+
+
+def _row_error(row_number: int, row: Dict[str, str], error: str) -> Dict[str, Any]:
+    return {
+        "row": row_number,
+        "data": {key: row.get(key, "N/A") for key in ERROR_ROW_FIELDS},
+        "error": error,
+    }
+
+
+def _resolve_bunks(keys, references: ReferenceResolver) -> Dict[tuple, Any]:
+    """Map (cabin_name, session_name) to a bunk id, or to the error message for that bunk."""
+    resolved = {}
+    for cabin_name, session_name in keys:
+        bunks = references.bunks_named(cabin_name, session_name)
+        active = [bunk for bunk in bunks if bunk.is_active]
+        if len(active) == 1:
+            resolved[(cabin_name, session_name)] = active[0].id
+        elif len(active) > 1:
+            resolved[(cabin_name, session_name)] = BunkLogImportError(
+                f"Multiple active bunks found with cabin '{cabin_name}' and session '{session_name}'"
+            )
+        elif bunks:
+            resolved[(cabin_name, session_name)] = BunkLogImportError(
+                f"Bunk '{cabin_name} - {session_name}' exists but is not active"
+            )
+        else:
+            resolved[(cabin_name, session_name)] = BunkLogImportError(
+                f"Bunk with cabin '{cabin_name}' and session '{session_name}' does not exist"
+            )
+    return resolved
+
+
+def _resolve_assignments(bunk_ids) -> Dict[tuple, List[Dict[str, Any]]]:
+    """Map (bunk_id, first_name, last_name), case-folded, to the active assignments found."""
+    assignments: Dict[tuple, List[Dict[str, Any]]] = {}
+    for assignment in CamperBunkAssignment.objects.filter(
+        bunk_id__in=bunk_ids,
+        is_active=True,
+    ).values("id", "bunk_id", "camper__first_name", "camper__last_name"):
+        key = (
+            assignment["bunk_id"],
+            assignment["camper__first_name"].casefold(),
+            assignment["camper__last_name"].casefold(),
+        )
+        assignments.setdefault(key, []).append(assignment)
+    return assignments
+
+
+def _parse_bunk_log_batch(rows, *, has_default_counselor: bool) -> tuple[list, list]:
+    """
+    Parse a batch of ``(index, row)`` pairs without touching the database.
+    Returns ``(row_number, row, data)`` triples for valid rows and error
+    records for the rest. Row numbers count the header as row 1.
+    """
+    parsed = []
+    errors = []
+    for i, row in rows:
+        try:
+            parsed.append((i + 2, row, _parse_bunk_log_row(row, has_default_counselor=has_default_counselor)))
+        except (BunkLogImportError, ValueError) as e:
+            errors.append(_row_error(i + 2, row, str(e)))
+    return parsed, errors
+
+
+def _import_bunk_logs_bulk(rows, result, *, dry_run, default_counselor):
+    """
+    Set-based import of one batch of ``(index, row)`` pairs: parse it, then
+    hand it to _write_bunk_log_batch.
+    """
+    parsed, errors = _parse_bunk_log_batch(rows, has_default_counselor=default_counselor is not None)
+    result["error_count"] += len(errors)
+    result["errors"].extend(errors)
+    _write_bunk_log_batch(parsed, result, dry_run=dry_run, default_counselor=default_counselor)
+
+
+def _write_bunk_log_batch(parsed, result, *, dry_run, default_counselor):
+    """
+    Resolve every bunk and counselor of a parsed batch through a
+    ReferenceResolver and every assignment with one IN query, then upsert
+    the logs on (bunk_assignment, date).
+    """
+    # 1. Resolve references for the batch
+    references = ReferenceResolver(
+        cabins={data["cabin_name"] for _, _, data in parsed},
+        sessions={data["session_name"] for _, _, data in parsed},
+        user_emails={data["counselor_email"] for _, _, data in parsed},
+        bunks=True,
+    )
+    bunks = _resolve_bunks({(data["cabin_name"], data["session_name"]) for _, _, data in parsed}, references)
+    assignments = _resolve_assignments(
+        {bunk_id for bunk_id in bunks.values() if not isinstance(bunk_id, BunkLogImportError)}
+    )
+
+    # 2. Build logs; a later row for the same camper and date wins, as it would row by row
+    logs: Dict[tuple, BunkLog] = {}
+    touched = set()
+    now = timezone.now()
+    for row_number, row, data in parsed:
+        try:
+            bunk_id = bunks[(data["cabin_name"], data["session_name"])]
+            if isinstance(bunk_id, BunkLogImportError):
+                raise bunk_id
+
+            if data["counselor_email"]:
+                counselor = references.user(data["counselor_email"])
+                if counselor is None:
+                    raise BunkLogImportError(f"Counselor with email '{data['counselor_email']}' does not exist")
+                counselor_id = counselor.id
+            else:
+                counselor_id = default_counselor.id
+
+            matches = assignments.get(
+                (bunk_id, data["camper_first_name"].casefold(), data["camper_last_name"].casefold()), []
+            )
+            camper_name = f"{data['camper_first_name']} {data['camper_last_name']}"
+            if not matches:
+                raise BunkLogImportError(f"No active assignment found for: {camper_name} in {data['bunk_full_name']}")
+            if len(matches) > 1:
+                raise BunkLogImportError(f"Multiple active assignments found for: {camper_name} in {data['bunk_full_name']}")
+        except BunkLogImportError as e:
+            result["error_count"] += 1
+            result["errors"].append(_row_error(row_number, row, str(e)))
+            continue
+
+        logs[(matches[0]["id"], data["date"])] = BunkLog(
+            bunk_assignment_id=matches[0]["id"],
+            date=data["date"],
+            counselor_id=counselor_id,
+            not_on_camp=data["not_on_camp"],
+            social_score=data["social_score"],
+            behavior_score=data["behavior_score"],
+            participation_score=data["participation_score"],
+            request_camper_care_help=data["request_camper_care_help"],
+            request_unit_head_help=data["request_unit_head_help"],
+            description=data["description"],
+            updated_at=now,
+        )
+        touched.add((bunk_id, data["date"]))
+        result["success_count"] += 1
+
+    if dry_run or not logs:
+        return
+
+    # 3. Upsert the batch in one statement
+    BunkLog.objects.bulk_create(
+        list(logs.values()),
+        update_conflicts=True,
+        unique_fields=["bunk_assignment", "date"],
+        update_fields=BUNK_LOG_VALUE_FIELDS,
+    )
+    bunk_logs_bulk_saved.send(sender=BunkLog, keys=touched)
+
+
 def generate_sample_csv() -> str:
     """
     Generates a sample CSV file with headers and example data.
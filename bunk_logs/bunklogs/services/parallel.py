@@ -0,0 +1,125 @@
+"""
+Multi-process validation for large bunk log backfills.
+
+Parsing dates, scores and flags is pure Python and CPU-bound, so for files
+of hundreds of thousands of rows it dominates the bulk import. Here the
+parent process scans the file once for record boundaries (tracking quotes,
+so descriptions with line breaks stay whole) and cuts it into byte ranges
+of ``batch_size`` records. Worker processes each read one range, parse it
+with the same _parse_bunk_log_batch the sequential import uses and send
+back the normalized rows and error records. The parent consumes results in
+file order and hands each batch to the single bulk writer, so row numbers,
+"later row wins" and the ``{"row", "data", "error"}`` error format are the
+same as without workers. Only ``2 * workers`` ranges are in flight at a
+time, so memory stays bounded however large the file is.
+"""
+import csv
+import io
+from collections import deque
+from collections.abc import Callable
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import django
+
+from .imports import ERROR_ROW_FIELDS
+from .imports import _parse_bunk_log_batch
+
+
+def record_ranges(path: str | Path, batch_size: int) -> Iterator[tuple[int, int, int]]:
+    """
+    Yield ``(start, end, first_index)`` byte ranges of up to ``batch_size``
+    records after the header, where ``first_index`` is the 0-based index of
+    the range's first record. Blank lines are skipped, as csv.DictReader
+    skips them, so indexes match a sequential read.
+    """
+    with open(path, "rb") as csv_file:
+        offset = 0
+        start = None
+        index = 0
+        count = 0
+        in_quotes = False
+        record_blank = True
+        for line in csv_file:
+            offset += len(line)
+            if not in_quotes:
+                record_blank = not line.rstrip(b"\r\n")
+            else:
+                record_blank = False
+            # A doubled quote toggles twice, so odd counts flip the state
+            in_quotes ^= line.count(b'"') % 2 == 1
+            if in_quotes:
+                continue
+            if start is None:
+                # The header ends here
+                start = offset
+                continue
+            if not record_blank:
+                count += 1
+            if count == batch_size:
+                yield start, offset, index
+                index += count
+                count = 0
+                start = offset
+        if count:
+            yield start, offset, index
+
+
+def _validate_range(path, start, end, first_index, fieldnames, has_default_counselor):
+    """Worker: parse one byte range and return its valid rows and errors."""
+    with open(path, "rb") as csv_file:
+        csv_file.seek(start)
+        text = csv_file.read(end - start).decode("utf-8")
+    reader = csv.DictReader(io.StringIO(text, newline=""), fieldnames=fieldnames)
+    parsed, errors = _parse_bunk_log_batch(
+        enumerate(reader, start=first_index),
+        has_default_counselor=has_default_counselor,
+    )
+    # Only the error report fields of a row are needed once it is parsed
+    parsed = [
+        (row_number, {key: row[key] for key in ERROR_ROW_FIELDS if key in row}, data)
+        for row_number, row, data in parsed
+    ]
+    return parsed, errors
+
+
+def iter_validated_batches(
+    path: str | Path,
+    fieldnames: list[str],
+    *,
+    batch_size: int,
+    workers: int,
+    has_default_counselor: bool,
+    progress: Callable[[int], None] | None = None,
+) -> Iterator[tuple[list, list]]:
+    """
+    Yield ``(parsed, errors)`` for each range of ``path`` in file order,
+    validated in ``workers`` processes. ``progress`` is called with the
+    number of rows handled once the caller has finished each batch.
+    """
+    done = 0
+    # Workers started with spawn or forkserver need Django's app registry
+    with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+        pending = deque()
+
+        def submit(start, end, first_index):
+            pending.append(pool.submit(
+                _validate_range, str(path), start, end, first_index, fieldnames, has_default_counselor,
+            ))
+
+        ranges = record_ranges(path, batch_size)
+        for task in ranges:
+            submit(*task)
+            if len(pending) >= 2 * workers:
+                break
+        while pending:
+            parsed, errors = pending.popleft().result()
+            # Keep the pool busy while the caller writes this batch
+            next_task = next(ranges, None)
+            if next_task is not None:
+                submit(*next_task)
+            yield parsed, errors
+            done += len(parsed) + len(errors)
+            if progress is not None:
+                progress(done)
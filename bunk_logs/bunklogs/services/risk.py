@@ -0,0 +1,223 @@
+"""
+Camper risk and trend scoring over BunkLog history.
+
+Scores for a date window are loaded with one values query into camper x day
+matrices (one row per assignment, so a camper who changed bunks is compared
+with the peers of each bunk separately). Every statistic is then computed
+with whole-matrix NumPy operations instead of a Python loop per camper:
+
+- daily score: mean of the social, behavior and participation scores
+  (days marked not on camp count as missing)
+- recent mean: mean over the last ROLLING_DAYS days of the window
+- slope: least-squares change in daily score per day over the window
+- peer z-score: recent mean against the recent means of the campers in
+  the same bunk
+- help streak: consecutive logged days, up to the camper's latest log, on
+  which camper care help was requested
+
+``risk_score`` combines these so campers with falling scores, scores well
+below their bunk and repeated help requests rank first.
+"""
+from dataclasses import dataclass
+from datetime import date as date_cls
+from datetime import timedelta
+from typing import Iterable
+
+import numpy as np
+
+from bunklogs.models import BunkLog
+
+ROLLING_DAYS = 3
+# A falling trend is weighted per week of decline, in score points
+RISK_WEIGHTS = {
+    "weekly_decline": 1.0,
+    "below_peers": 0.75,
+    "help_streak": 0.5,
+    "help_count": 0.1,
+}
+SCORE_FIELDS = ("social_score", "behavior_score", "participation_score")
+LOG_COLUMNS = (
+    "bunk_assignment_id",
+    "bunk_assignment__camper_id",
+    "bunk_assignment__bunk_id",
+    "date",
+    "not_on_camp",
+    "request_camper_care_help",
+    *SCORE_FIELDS,
+)
+
+
+@dataclass
+class ScoreMatrix:
+    """Daily scores and help flags for each assignment across a date window."""
+
+    date_from: date_cls
+    assignment_ids: np.ndarray
+    camper_ids: np.ndarray
+    bunk_ids: np.ndarray
+    scores: np.ndarray  # rows x days, NaN where there is no score
+    logged: np.ndarray  # rows x days, True where a log exists
+    help: np.ndarray  # rows x days, True where camper care help was requested
+
+    @property
+    def days(self):
+        return self.scores.shape[1]
+
+
+def load_score_matrix(bunk_ids: Iterable[int], date_from: date_cls, date_to: date_cls) -> ScoreMatrix:
+    """Read the logs of ``bunk_ids`` between two dates into a ScoreMatrix."""
+    days = (date_to - date_from).days + 1
+    rows = list(
+        BunkLog.objects.filter(
+            bunk_assignment__bunk_id__in=list(bunk_ids),
+            date__range=(date_from, date_to),
+        ).order_by().values_list(*LOG_COLUMNS)
+    )
+    if not rows:
+        empty = np.empty((0, days))
+        return ScoreMatrix(
+            date_from=date_from,
+            assignment_ids=np.empty(0, dtype=np.int64),
+            camper_ids=np.empty(0, dtype=np.int64),
+            bunk_ids=np.empty(0, dtype=np.int64),
+            scores=empty,
+            logged=empty.astype(bool),
+            help=empty.astype(bool),
+        )
+
+    columns = list(zip(*rows))
+    assignment_col = np.array(columns[0], dtype=np.int64)
+    assignment_ids, row_index, inverse = np.unique(assignment_col, return_index=True, return_inverse=True)
+    day_index = np.array([(day - date_from).days for day in columns[3]], dtype=np.int64)
+    not_on_camp = np.array(columns[4], dtype=bool)
+    # None scores become NaN, so a day's score is the mean of what was recorded
+    raw_scores = np.array(columns[6:], dtype=float).T
+    recorded = ~np.isnan(raw_scores)
+    score_count = recorded.sum(axis=1)
+    with np.errstate(invalid="ignore"):
+        daily = np.where(recorded, raw_scores, 0).sum(axis=1) / score_count
+    daily[not_on_camp | (score_count == 0)] = np.nan
+
+    scores = np.full((len(assignment_ids), days), np.nan)
+    logged = np.zeros((len(assignment_ids), days), dtype=bool)
+    help_requested = np.zeros((len(assignment_ids), days), dtype=bool)
+    scores[inverse, day_index] = daily
+    logged[inverse, day_index] = True
+    help_requested[inverse, day_index] = np.array(columns[5], dtype=bool)
+    return ScoreMatrix(
+        date_from=date_from,
+        assignment_ids=assignment_ids,
+        camper_ids=np.array(columns[1], dtype=np.int64)[row_index],
+        bunk_ids=np.array(columns[2], dtype=np.int64)[row_index],
+        scores=scores,
+        logged=logged,
+        help=help_requested,
+    )
+
+
+def _row_means(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Per-row mean ignoring NaN, plus the count of values behind it."""
+    present = ~np.isnan(values)
+    counts = present.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.where(present, values, 0).sum(axis=1) / counts
+    return means, counts
+
+
+def _slopes(scores: np.ndarray) -> np.ndarray:
+    """Least-squares slope of each row against its day index, over present values."""
+    present = ~np.isnan(scores)
+    counts = present.sum(axis=1)
+    x = np.broadcast_to(np.arange(scores.shape[1], dtype=float), scores.shape)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x_mean = np.where(present, x, 0).sum(axis=1) / counts
+        y_mean = np.where(present, scores, 0).sum(axis=1) / counts
+        dx = np.where(present, x - x_mean[:, None], 0)
+        dy = np.where(present, scores - y_mean[:, None], 0)
+        variance = (dx * dx).sum(axis=1)
+        slopes = (dx * dy).sum(axis=1) / variance
+    slopes[(counts < 2) | (variance == 0)] = np.nan
+    return slopes
+
+
+def _peer_z_scores(values: np.ndarray, groups: np.ndarray) -> np.ndarray:
+    """Z-score of each value against the values of its group, ignoring NaN."""
+    present = ~np.isnan(values)
+    _, group_index = np.unique(groups, return_inverse=True)
+    filled = np.where(present, values, 0)
+    counts = np.bincount(group_index, weights=present)
+    sums = np.bincount(group_index, weights=filled)
+    squares = np.bincount(group_index, weights=filled * filled)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+        stds = np.sqrt(np.maximum(squares / counts - means * means, 0))
+        z = (values - means[group_index]) / stds[group_index]
+    # A camper alone in their bunk, or a bunk with identical scores, has no spread to compare against
+    z[~present | (counts[group_index] < 2) | (stds[group_index] == 0)] = 0.0
+    return z
+
+
+def _help_streaks(logged: np.ndarray, help_requested: np.ndarray) -> np.ndarray:
+    """Trailing run of logged days with a help request; unlogged days do not break it."""
+    days = logged.shape[1]
+    broken = logged & ~help_requested
+    has_break = broken.any(axis=1)
+    last_break = np.where(has_break, days - 1 - broken[:, ::-1].argmax(axis=1), -1)
+    return (help_requested & (np.arange(days) > last_break[:, None])).sum(axis=1)
+
+
+def score_matrix(matrix: ScoreMatrix, rolling_days: int = ROLLING_DAYS) -> dict[str, np.ndarray]:
+    """Compute every statistic for every row of ``matrix`` at once."""
+    mean_score, days_scored = _row_means(matrix.scores)
+    recent_mean, _ = _row_means(matrix.scores[:, -rolling_days:])
+    slope = _slopes(matrix.scores)
+    peer_z = _peer_z_scores(recent_mean, matrix.bunk_ids)
+    help_streak = _help_streaks(matrix.logged, matrix.help)
+    help_count = matrix.help.sum(axis=1)
+
+    risk = (
+        RISK_WEIGHTS["weekly_decline"] * np.maximum(-np.nan_to_num(slope) * 7, 0)
+        + RISK_WEIGHTS["below_peers"] * np.maximum(-peer_z, 0)
+        + RISK_WEIGHTS["help_streak"] * help_streak
+        + RISK_WEIGHTS["help_count"] * help_count
+    )
+    return {
+        "days_logged": matrix.logged.sum(axis=1),
+        "days_scored": days_scored,
+        "mean_score": mean_score,
+        "recent_mean": recent_mean,
+        "slope": slope,
+        "peer_z": peer_z,
+        "help_streak": help_streak,
+        "help_count": help_count,
+        "risk_score": risk,
+    }
+
+
+def _as_float(value):
+    return None if np.isnan(value) else round(float(value), 3)
+
+
+def compute_camper_risk(bunk_ids: Iterable[int], date_to: date_cls, days: int) -> list[dict]:
+    """
+    Score every assignment with logs in ``bunk_ids`` over the ``days`` days
+    ending on ``date_to``. Returns one plain dict per assignment, unsorted.
+    """
+    matrix = load_score_matrix(bunk_ids, date_to - timedelta(days=days - 1), date_to)
+    stats = score_matrix(matrix)
+    return [
+        {
+            "assignment_id": int(matrix.assignment_ids[i]),
+            "camper_id": int(matrix.camper_ids[i]),
+            "bunk_id": int(matrix.bunk_ids[i]),
+            "days_logged": int(stats["days_logged"][i]),
+            "mean_score": _as_float(stats["mean_score"][i]),
+            "recent_mean": _as_float(stats["recent_mean"][i]),
+            "slope": _as_float(stats["slope"][i]),
+            "peer_z": _as_float(stats["peer_z"][i]),
+            "help_streak": int(stats["help_streak"][i]),
+            "help_count": int(stats["help_count"][i]),
+            "risk_score": _as_float(stats["risk_score"][i]),
+        }
+        for i in range(len(matrix.assignment_ids))
+    ]
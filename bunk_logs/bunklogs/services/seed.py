@@ -0,0 +1,240 @@
+"""Synthetic camp data for benchmarks and local load testing."""
+import random
+from datetime import date
+from datetime import timedelta
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from bunks.models import Bunk
+from bunks.models import Cabin
+from bunks.models import Session
+from bunks.models import Unit
+from campers.models import Camper
+from campers.models import CamperBunkAssignment
+from bunklogs.models import BunkLog
+from bunklogs.services.summaries import rebuild_daily_summaries
+
+User = get_user_model()
+
+SEED_BATCH_SIZE = 5000
+
+# Days between the end of one session and the start of the next
+SESSION_GAP_DAYS = 2
+
+# Share of logs that carry each flag; help requests are deliberately rare
+CAMPER_CARE_RATE = 0.03
+UNIT_HEAD_RATE = 0.02
+NOT_ON_CAMP_RATE = 0.02
+
+FIRST_NAMES = [
+    "Ava", "Ben", "Chloe", "Daniel", "Ella", "Felix", "Grace", "Henry", "Isla", "Jack",
+    "Kai", "Lily", "Maya", "Noah", "Olivia", "Priya", "Quinn", "Ruby", "Sam", "Talia",
+    "Uri", "Violet", "Wyatt", "Yael", "Zoe",
+]
+LAST_NAMES = [
+    "Adler", "Brooks", "Cohen", "Diaz", "Evans", "Fischer", "Garcia", "Hughes", "Ito",
+    "Jensen", "Katz", "Levi", "Morgan", "Nguyen", "Ortiz", "Patel", "Reyes", "Stein",
+    "Turner", "Walsh",
+]
+DESCRIPTIONS = [
+    "Great day, very engaged in activities.",
+    "Quiet at breakfast but joined in by the afternoon.",
+    "Had a disagreement with a bunkmate; resolved with counselor help.",
+    "Homesick before bed, settled after talking it through.",
+    "Led the cabin cleanup without being asked.",
+    "Tired today, sat out swim.",
+]
+
+
+def _make_user(email: str, role: str, first_name: str, last_name: str) -> User:
+    user = User(email=email, role=role, first_name=first_name, last_name=last_name)
+    user.set_unusable_password()
+    return user
+
+
+def _score(rng: random.Random, baseline: int) -> int:
+    return min(max(baseline + rng.choice((-1, 0, 0, 0, 1)), 1), 5)
+
+
+def _random_log(
+    rng: random.Random,
+    assignment_id: int,
+    log_date: date,
+    counselor_id: int,
+    baseline: int,
+) -> BunkLog:
+    if rng.random() < NOT_ON_CAMP_RATE:
+        return BunkLog(
+            bunk_assignment_id=assignment_id,
+            date=log_date,
+            counselor_id=counselor_id,
+            not_on_camp=True,
+        )
+    return BunkLog(
+        bunk_assignment_id=assignment_id,
+        date=log_date,
+        counselor_id=counselor_id,
+        social_score=_score(rng, baseline),
+        behavior_score=_score(rng, baseline),
+        participation_score=_score(rng, baseline),
+        request_camper_care_help=rng.random() < CAMPER_CARE_RATE,
+        request_unit_head_help=rng.random() < UNIT_HEAD_RATE,
+        description=rng.choice(DESCRIPTIONS),
+    )
+
+
+def _bulk_create_logs(logs) -> int:
+    count = 0
+    batch: list[BunkLog] = []
+    for log in logs:
+        batch.append(log)
+        if len(batch) >= SEED_BATCH_SIZE:
+            BunkLog.objects.bulk_create(batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        BunkLog.objects.bulk_create(batch)
+        count += len(batch)
+    return count
+
+
+@transaction.atomic
+def generate_camp(
+    *,
+    sessions: int = 1,
+    units: int = 4,
+    bunks_per_unit: int = 8,
+    campers_per_bunk: int = 12,
+    counselors_per_bunk: int = 2,
+    days: int = 42,
+    start_date: date | None = None,
+    label: str = "Seed",
+    seed: int = 0,
+) -> dict[str, Any]:
+    """
+    Create a full camp: back-to-back sessions sharing the same units and
+    cabins, a bunk per cabin and session with its own counselors and campers,
+    and a log for every camper on every day of their session.
+
+    Rows are written with bulk_create, so model save() hooks and signals do
+    not run. ``label`` prefixes names and emails so generated rows are easy
+    to recognise; the same ``seed`` always produces the same camp.
+    """
+    rng = random.Random(seed)
+    start_date = start_date or date(date.today().year, 6, 20)
+    slug = label.lower().replace(" ", "-")
+
+    session_objs = Session.objects.bulk_create(
+        [
+            Session(
+                name=f"{label} Session {s + 1}",
+                start_date=start_date + timedelta(days=s * (days + SESSION_GAP_DAYS)),
+                end_date=start_date + timedelta(days=s * (days + SESSION_GAP_DAYS) + days - 1),
+                is_active=s == 0,
+            )
+            for s in range(sessions)
+        ],
+    )
+    unit_heads = User.objects.bulk_create(
+        [
+            _make_user(
+                f"{slug}-unit-head-{u}@example.com",
+                User.UNIT_HEAD,
+                rng.choice(FIRST_NAMES),
+                rng.choice(LAST_NAMES),
+            )
+            for u in range(units)
+        ],
+    )
+    unit_objs = Unit.objects.bulk_create(
+        [Unit(name=f"{label} Unit {u + 1}", unit_head=unit_heads[u]) for u in range(units)],
+    )
+    cabins = Cabin.objects.bulk_create(
+        [
+            Cabin(name=f"{label} Cabin {b + 1}", capacity=campers_per_bunk)
+            for b in range(units * bunks_per_unit)
+        ],
+    )
+    bunks = Bunk.objects.bulk_create(
+        [
+            Bunk(cabin=cabin, session=session, unit=unit_objs[b // bunks_per_unit])
+            for session in session_objs
+            for b, cabin in enumerate(cabins)
+        ],
+    )
+
+    counselors = User.objects.bulk_create(
+        [
+            _make_user(
+                f"{slug}-counselor-{n}@example.com",
+                User.COUNSELOR,
+                rng.choice(FIRST_NAMES),
+                rng.choice(LAST_NAMES),
+            )
+            for n in range(len(bunks) * counselors_per_bunk)
+        ],
+        batch_size=SEED_BATCH_SIZE,
+    )
+    Bunk.counselors.through.objects.bulk_create(
+        [
+            Bunk.counselors.through(bunk_id=bunk.id, user_id=counselors[b * counselors_per_bunk + c].id)
+            for b, bunk in enumerate(bunks)
+            for c in range(counselors_per_bunk)
+        ],
+        batch_size=SEED_BATCH_SIZE,
+    )
+
+    campers = Camper.objects.bulk_create(
+        [
+            Camper(
+                first_name=rng.choice(FIRST_NAMES),
+                last_name=f"{rng.choice(LAST_NAMES)} {label} {n}",
+                date_of_birth=start_date - timedelta(days=rng.randint(8 * 365, 16 * 365)),
+            )
+            for n in range(len(bunks) * campers_per_bunk)
+        ],
+        batch_size=SEED_BATCH_SIZE,
+    )
+    assignments = CamperBunkAssignment.objects.bulk_create(
+        [
+            CamperBunkAssignment(
+                camper=camper,
+                bunk=bunks[n // campers_per_bunk],
+                start_date=bunks[n // campers_per_bunk].session.start_date,
+                end_date=bunks[n // campers_per_bunk].session.end_date,
+                is_active=True,
+            )
+            for n, camper in enumerate(campers)
+        ],
+        batch_size=SEED_BATCH_SIZE,
+    )
+
+    def logs():
+        for n, assignment in enumerate(assignments):
+            bunk_index = n // campers_per_bunk
+            counselor_id = counselors[bunk_index * counselors_per_bunk].id
+            # Each camper has a typical score so their history has a shape
+            baseline = rng.choice((2, 3, 4, 4, 5))
+            for day in range(days):
+                log_date = assignment.start_date + timedelta(days=day)
+                yield _random_log(rng, assignment.id, log_date, counselor_id, baseline)
+
+    log_count = _bulk_create_logs(logs())
+    # bulk_create skips the signals that keep the daily summaries current
+    summary_counts = rebuild_daily_summaries(session_objs[0].start_date, session_objs[-1].end_date)
+
+    return {
+        "sessions": len(session_objs),
+        "units": len(unit_objs),
+        "cabins": len(cabins),
+        "bunks": len(bunks),
+        "counselors": len(counselors),
+        "campers": len(campers),
+        "assignments": len(assignments),
+        "bunk_logs": log_count,
+        **summary_counts,
+        "start_date": session_objs[0].start_date,
+        "end_date": session_objs[-1].end_date,
+    }
@@ -0,0 +1,149 @@
+"""
+Keep BunkDailySummary and UnitDailySummary in step with BunkLog.
+
+Summaries are recomputed for each touched (bunk, date) from that day's logs
+rather than adjusted by deltas, so they cannot drift from the logs. A refresh
+is one grouped aggregate per table plus an upsert, however many keys changed.
+"""
+from collections import defaultdict
+from datetime import date as date_cls
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import Avg
+from django.db.models import Count
+from django.db.models import F
+from django.db.models import Q
+from django.utils import timezone
+
+from bunks.models import Bunk
+from bunklogs.models import BunkDailySummary
+from bunklogs.models import BunkLog
+from bunklogs.models import UnitDailySummary
+
+SUMMARY_AGGREGATES = {
+    "log_count": Count("id"),
+    "not_on_camp_count": Count("id", filter=Q(not_on_camp=True)),
+    "avg_social_score": Avg("social_score"),
+    "avg_behavior_score": Avg("behavior_score"),
+    "avg_participation_score": Avg("participation_score"),
+    "camper_care_help_count": Count("id", filter=Q(request_camper_care_help=True)),
+    "unit_head_help_count": Count("id", filter=Q(request_unit_head_help=True)),
+}
+BUNK_SUMMARY_FIELDS = [*SUMMARY_AGGREGATES, "updated_at"]
+UNIT_SUMMARY_FIELDS = [*BUNK_SUMMARY_FIELDS, "bunk_count"]
+
+
+def _normalize_keys(keys: Iterable[tuple]) -> set[tuple]:
+    normalized = set()
+    for owner_id, day in keys:
+        if owner_id is None or day is None:
+            continue
+        parsed_day = day if isinstance(day, date_cls) else date_cls.fromisoformat(str(day))
+        normalized.add((owner_id, parsed_day))
+    return normalized
+
+
+def _keys_filter(keys: set[tuple], owner_lookup: str) -> Q:
+    """Build ``(date=d AND owner IN (...)) OR ...`` with one clause per date."""
+    ids_by_date = defaultdict(set)
+    for owner_id, day in keys:
+        ids_by_date[day].add(owner_id)
+    condition = Q()
+    for day, owner_ids in ids_by_date.items():
+        condition |= Q(date=day, **{f"{owner_lookup}__in": owner_ids})
+    return condition
+
+
+def _replace_summaries(model, owner_field, keys, rows, update_fields):
+    """Upsert the computed rows and drop summaries for keys that have no logs left."""
+    now = timezone.now()
+    summaries = [model(updated_at=now, **row) for row in rows]
+    found = {(getattr(summary, f"{owner_field}_id"), summary.date) for summary in summaries}
+    stale = keys - found
+    with transaction.atomic():
+        if summaries:
+            model.objects.bulk_create(
+                summaries,
+                update_conflicts=True,
+                unique_fields=[owner_field, "date"],
+                update_fields=update_fields,
+            )
+        if stale:
+            model.objects.filter(_keys_filter(stale, f"{owner_field}_id")).delete()
+
+
+def refresh_unit_summaries(keys: Iterable[tuple]) -> None:
+    """Recompute UnitDailySummary rows for (unit_id, date) pairs."""
+    keys = _normalize_keys(keys)
+    if not keys:
+        return
+    rows = (
+        BunkLog.objects.filter(_keys_filter(keys, "bunk_assignment__bunk__unit_id"))
+        .values("date", unit_id=F("bunk_assignment__bunk__unit_id"))
+        .annotate(bunk_count=Count("bunk_assignment__bunk", distinct=True), **SUMMARY_AGGREGATES)
+        .order_by()
+    )
+    _replace_summaries(UnitDailySummary, "unit", keys, rows, UNIT_SUMMARY_FIELDS)
+
+
+def refresh_bunk_summaries(keys: Iterable[tuple]) -> None:
+    """
+    Recompute BunkDailySummary rows for (bunk_id, date) pairs, then the unit
+    summaries those bunks roll up into.
+    """
+    keys = _normalize_keys(keys)
+    if not keys:
+        return
+    rows = (
+        BunkLog.objects.filter(_keys_filter(keys, "bunk_assignment__bunk_id"))
+        .values("date", bunk_id=F("bunk_assignment__bunk_id"))
+        .annotate(**SUMMARY_AGGREGATES)
+        .order_by()
+    )
+    _replace_summaries(BunkDailySummary, "bunk", keys, rows, BUNK_SUMMARY_FIELDS)
+
+    unit_ids = dict(
+        Bunk.objects.filter(id__in={bunk_id for bunk_id, _ in keys}).values_list("id", "unit_id"),
+    )
+    refresh_unit_summaries((unit_ids.get(bunk_id), day) for bunk_id, day in keys)
+
+
+@transaction.atomic
+def rebuild_daily_summaries(date_from=None, date_to=None) -> dict[str, int]:
+    """Rebuild every bunk and unit summary in a date range (all dates by default)."""
+    logs = BunkLog.objects.all()
+    bunk_summaries = BunkDailySummary.objects.all()
+    unit_summaries = UnitDailySummary.objects.all()
+    if date_from:
+        logs = logs.filter(date__gte=date_from)
+        bunk_summaries = bunk_summaries.filter(date__gte=date_from)
+        unit_summaries = unit_summaries.filter(date__gte=date_from)
+    if date_to:
+        logs = logs.filter(date__lte=date_to)
+        bunk_summaries = bunk_summaries.filter(date__lte=date_to)
+        unit_summaries = unit_summaries.filter(date__lte=date_to)
+
+    bunk_summaries.delete()
+    unit_summaries.delete()
+    now = timezone.now()
+    bunk_rows = (
+        logs.values("date", bunk_id=F("bunk_assignment__bunk_id"))
+        .annotate(**SUMMARY_AGGREGATES)
+        .order_by()
+    )
+    created_bunks = BunkDailySummary.objects.bulk_create(
+        [BunkDailySummary(updated_at=now, **row) for row in bunk_rows],
+        batch_size=1000,
+    )
+    unit_rows = (
+        logs.filter(bunk_assignment__bunk__unit__isnull=False)
+        .values("date", unit_id=F("bunk_assignment__bunk__unit_id"))
+        .annotate(bunk_count=Count("bunk_assignment__bunk", distinct=True), **SUMMARY_AGGREGATES)
+        .order_by()
+    )
+    created_units = UnitDailySummary.objects.bulk_create(
+        [UnitDailySummary(updated_at=now, **row) for row in unit_rows],
+        batch_size=1000,
+    )
+    return {"bunk_summaries": len(created_bunks), "unit_summaries": len(created_units)}
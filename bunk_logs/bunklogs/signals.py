@@ -0,0 +1,52 @@
+from functools import partial
+
+from django.db import transaction
+from django.dispatch import Signal
+from django.dispatch import receiver
+
+from bunks.models import Bunk
+from bunks.signals import reference_data_bulk_saved
+
+from .models import BunkDailySummary
+from .services.summaries import refresh_bunk_summaries
+from .services.summaries import refresh_unit_summaries
+
+# Sent after BunkLog rows are written with bulk_create/bulk_update, which skip
+# the per-instance post_save signal. Receivers get ``keys``: a set of
+# (bunk_id, date) pairs that were touched.
+bunk_logs_bulk_saved = Signal()
+
+
+# Daily summaries are recomputed once the write commits, so the aggregates
+# and upserts stay out of its transaction. Single saves and deletes of logs,
+# assignments and bunks reach these through api/signals.py, which works out
+# the touched keys once per write for every cache and table that needs them.
+def refresh_bunk_summaries_on_commit(keys):
+    """Recompute the (bunk_id, date) summaries in ``keys`` after the transaction commits."""
+    transaction.on_commit(partial(refresh_bunk_summaries, set(keys)))
+
+
+def refresh_moved_bunk_summaries(bunk, previous_unit_id):
+    """Move a bunk's summaries from its previous unit's totals to its current unit's."""
+    dates = set(bunk.daily_summaries.values_list("date", flat=True))
+    keys = {(unit_id, day) for unit_id in (previous_unit_id, bunk.unit_id) for day in dates}
+    transaction.on_commit(partial(refresh_unit_summaries, keys))
+
+
+@receiver(bunk_logs_bulk_saved)
+def refresh_bulk_saved_summaries(sender, keys, **kwargs):
+    refresh_bunk_summaries_on_commit(keys)
+
+
+@receiver(reference_data_bulk_saved)
+def refresh_bulk_moved_bunk_summaries(sender, previous_unit_ids=None, **kwargs):
+    if sender is not Bunk or not previous_unit_ids:
+        return
+    unit_ids = dict(sender.objects.filter(pk__in=list(previous_unit_ids)).values_list("id", "unit_id"))
+    keys = set()
+    for bunk_id, day in BunkDailySummary.objects.filter(
+        bunk_id__in=list(previous_unit_ids),
+    ).values_list("bunk_id", "date"):
+        keys.add((previous_unit_ids[bunk_id], day))
+        keys.add((unit_ids.get(bunk_id), day))
+    transaction.on_commit(partial(refresh_unit_summaries, keys))
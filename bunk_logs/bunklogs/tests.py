@@ -1 +1,182 @@
-# Create your tests here.
+import csv
+import importlib.util
+import json
+import tempfile
+import unittest
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from bunk_logs.users.models import User
+from bunks.models import Bunk, Cabin, Session
+from bunklogs.models import BunkLog
+from bunklogs.services.exports import EXPORT_COLUMNS
+from bunklogs.services.imports import generate_sample_csv, get_expected_columns
+from bunklogs.services.imports import import_bunk_logs_from_csv
+from bunklogs.services.seed import generate_camp
+from campers.models import Camper, CamperBunkAssignment
+
+
+class BulkBunkLogImportTest(TestCase):
+    def setUp(self):
+        self.counselor = User.objects.create_user(
+            email="counselor@example.com",
+            password="password123",
+            role="Counselor"
+        )
+        session = Session.objects.create(
+            name="Summer 2025",
+            start_date="2025-06-01",
+            end_date="2025-08-31"
+        )
+        self.bunk = Bunk.objects.create(
+            cabin=Cabin.objects.create(name="A1", capacity=10),
+            session=session,
+        )
+        self.assignment = CamperBunkAssignment.objects.create(
+            camper=Camper.objects.create(first_name="John", last_name="Smith"),
+            bunk=self.bunk,
+        )
+
+    def _write_csv(self, rows):
+        header = ",".join(get_expected_columns())
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as csv_file:
+            csv_file.write("\n".join([header, *rows]))
+        self.addCleanup(Path(csv_file.name).unlink)
+        return csv_file.name
+
+    def test_bulk_import_upserts_on_assignment_and_date(self):
+        path = self._write_csv([
+            "2025-06-02,John,Smith,A1 - Summer 2025,counselor@example.com,false,5,4,3,false,false,Day one",
+            "2025-06-03,john,SMITH,A1 - Summer 2025,counselor@example.com,false,2,2,2,true,false,Day two",
+        ])
+        result = import_bunk_logs_from_csv(path, bulk=True)
+        self.assertEqual(result["success_count"], 2)
+        self.assertEqual(BunkLog.objects.count(), 2)
+
+        path = self._write_csv([
+            "2025-06-02,John,Smith,A1 - Summer 2025,counselor@example.com,false,1,1,1,false,false,Revised",
+        ])
+        result = import_bunk_logs_from_csv(path, bulk=True)
+        self.assertEqual(result["success_count"], 1)
+        self.assertEqual(BunkLog.objects.count(), 2)
+        log = BunkLog.objects.get(date="2025-06-02")
+        self.assertEqual((log.social_score, log.description), (1, "Revised"))
+
+    def test_bulk_import_reports_row_errors(self):
+        path = self._write_csv([
+            "2025-06-02,Jane,Doe,A1 - Summer 2025,counselor@example.com,false,5,4,3,false,false,",
+            "2025-06-02,John,Smith,B2 - Summer 2025,counselor@example.com,false,5,4,3,false,false,",
+            "2025-06-02,John,Smith,A1 - Summer 2025,nobody@example.com,false,5,4,3,false,false,",
+            "2025-06-02,John,Smith,A1 - Summer 2025,counselor@example.com,false,9,4,3,false,false,",
+        ])
+        result = import_bunk_logs_from_csv(path, bulk=True)
+        self.assertEqual(result["success_count"], 0)
+        self.assertEqual([error["row"] for error in result["errors"]], [2, 3, 4, 5])
+        self.assertFalse(BunkLog.objects.exists())
+
+    def test_parallel_validation_matches_sequential_bulk_import(self):
+        path = self._write_csv([
+            '2025-06-02,John,Smith,A1 - Summer 2025,counselor@example.com,false,5,4,3,false,false,"Line one\nline ""two"""',
+            "",
+            "2025-06-03,John,Smith,A1 - Summer 2025,counselor@example.com,false,9,4,3,false,false,",
+            "2025-06-04,Jane,Doe,A1 - Summer 2025,counselor@example.com,false,5,4,3,false,false,",
+            "2025-06-05,John,Smith,A1 - Summer 2025,counselor@example.com,false,2,2,2,false,false,Last",
+        ])
+        sequential = import_bunk_logs_from_csv(path, dry_run=True, bulk=True, batch_size=2)
+        parallel = import_bunk_logs_from_csv(path, bulk=True, batch_size=2, workers=2)
+
+        self.assertEqual(parallel, sequential)
+        self.assertEqual([error["row"] for error in parallel["errors"]], [3, 4])
+        log = BunkLog.objects.get(date="2025-06-02")
+        self.assertEqual(log.description, 'Line one\nline "two"')
+        self.assertEqual(BunkLog.objects.count(), 2)
+
+    def test_row_by_row_and_bulk_imports_match_bunks_alike(self):
+        path = self._write_csv([
+            "2025-06-02,John,Smith,a1 -  summer 2025,counselor@example.com,false,5,4,3,false,false,",
+            "2025-06-03,John,Smith,B2 - Summer 2025,counselor@example.com,false,5,4,3,false,false,",
+        ])
+        row_by_row = import_bunk_logs_from_csv(path, dry_run=True)
+        bulk = import_bunk_logs_from_csv(path, dry_run=True, bulk=True)
+        self.assertEqual(row_by_row, bulk)
+        self.assertEqual(row_by_row["success_count"], 1)
+        self.assertEqual([error["row"] for error in row_by_row["errors"]], [3])
+
+    def test_sample_csv_has_expected_columns(self):
+        self.assertEqual(generate_sample_csv().splitlines()[0].split(","), get_expected_columns())
+
+
+class GenerateCampTest(TestCase):
+    def test_generates_a_log_per_camper_per_day(self):
+        counts = generate_camp(units=2, bunks_per_unit=2, campers_per_bunk=3, days=4)
+        self.assertEqual(counts["bunks"], 4)
+        self.assertEqual(CamperBunkAssignment.objects.filter(is_active=True).count(), 12)
+        self.assertEqual(BunkLog.objects.count(), 12 * 4)
+        self.assertEqual(counts["bunk_logs"], 12 * 4)
+        self.assertEqual(Bunk.objects.first().counselors.count(), 2)
+
+    def test_seed_camp_command_refuses_to_reuse_a_label(self):
+        options = {"sessions": 2, "units": 1, "bunks": 1, "campers": 2, "days": 3, "stdout": StringIO()}
+        call_command("seed_camp", **options)
+        self.assertEqual(Session.objects.count(), 2)
+        self.assertEqual(BunkLog.objects.count(), 2 * 2 * 3)
+        with self.assertRaises(CommandError):
+            call_command("seed_camp", **options)
+
+
+class ExportBunkLogsTest(TestCase):
+    def setUp(self):
+        generate_camp(sessions=2, units=1, bunks_per_unit=2, campers_per_bunk=2, days=3)
+
+    def _export(self, **options):
+        out = StringIO()
+        call_command("export_bunklogs", stdout=out, **options)
+        return out.getvalue()
+
+    def test_csv_export_has_a_row_per_log(self):
+        rows = list(csv.DictReader(StringIO(self._export())))
+        self.assertEqual(len(rows), BunkLog.objects.count())
+        self.assertEqual(list(rows[0]), EXPORT_COLUMNS)
+        # Every column the importer needs is present
+        self.assertTrue(set(get_expected_columns()) <= set(EXPORT_COLUMNS))
+        log = BunkLog.objects.select_related("bunk_assignment__bunk__cabin").get(pk=rows[0]["id"])
+        self.assertEqual(rows[0]["bunk"].split(" - ")[0], log.bunk_assignment.bunk.cabin.name)
+
+    def test_ndjson_export_applies_filters(self):
+        session = Session.objects.order_by("id").first()
+        first_day = BunkLog.objects.order_by("date").first().date
+        lines = self._export(output_format="ndjson", session=str(session.id), date_to=str(first_day)).splitlines()
+        expected = BunkLog.objects.filter(bunk_assignment__bunk__session=session, date=first_day).count()
+        self.assertEqual(len(lines), expected)
+        self.assertEqual(json.loads(lines[0])["session_name"], session.name)
+
+    def test_invalid_filter_raises_command_error(self):
+        with self.assertRaises(CommandError):
+            self._export(date_from="2025-07-01", date_to="2025-06-01")
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+    def test_parquet_export_is_partitioned_by_session_and_date(self):
+        import pyarrow.parquet as pq
+
+        with tempfile.TemporaryDirectory() as root:
+            call_command("export_bunklogs", output_format="parquet", output=root, stderr=StringIO())
+            partitions = {path.parent.relative_to(root).parts for path in Path(root).rglob("*.parquet")}
+            table = pq.read_table(root)
+        self.assertEqual(table.num_rows, BunkLog.objects.count())
+        self.assertEqual(len(partitions), BunkLog.objects.values("bunk_assignment__bunk__session", "date").distinct().count())
+        self.assertTrue(all(session.startswith("session_id=") for session, _ in partitions))
+        self.assertEqual(str(table.schema.field("unit_name").type), "dictionary<values=string, indices=int32, ordered=0>")
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "pyarrow is not installed")
+    def test_parquet_export_refuses_a_non_empty_directory(self):
+        import pyarrow.parquet as pq
+
+        with tempfile.TemporaryDirectory() as root:
+            call_command("export_bunklogs", output_format="parquet", output=root, stderr=StringIO())
+            with self.assertRaises(CommandError):
+                call_command("export_bunklogs", output_format="parquet", output=root, stderr=StringIO())
+            self.assertEqual(pq.read_table(root).num_rows, BunkLog.objects.count())
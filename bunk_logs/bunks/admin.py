@@ -1,12 +1,13 @@
-import tempfile
-from pathlib import Path
-
 from django.contrib import admin
 from django.contrib import messages
 from django.shortcuts import redirect
 from django.shortcuts import render
 from django.urls import path
 from django.urls import reverse
+from django.utils import timezone
+
+from imports.models import ImportJob
+from imports.services import enqueue_import
 
 from .forms import BunkCsvImportForm
 from .forms import CabinCsvImportForm
@@ -16,9 +17,6 @@ from .models import Bunk
 from .models import Cabin
 from .models import Session
 from .models import Unit
-from .services.imports import import_bunks_from_csv
-from .services.imports import import_cabins_from_csv
-from .services.imports import import_units_from_csv
 
 
 @admin.register(Unit)
@@ -47,41 +45,14 @@ class UnitAdmin(admin.ModelAdmin):
         if request.method == "POST":
             form = UnitCsvImportForm(request.POST, request.FILES)
             if form.is_valid():
-                csv_file = form.cleaned_data["csv_file"]
-                dry_run = form.cleaned_data["dry_run"]
-
-                # Save the uploaded file to a secure temporary file
-                with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-                    temp_path = Path(temp_file.name)
-                    for chunk in csv_file.chunks():
-                        temp_file.write(chunk)
-
-                # Process the CSV file
-                result = import_units_from_csv(temp_path, dry_run=dry_run)
-
-                if dry_run:
-                    messages.info(
-                        request,
-                        "Dry run completed. "
-                        f"{result['success_count']} units would be imported.",
-                    )
-                else:
-                    messages.success(
-                        request,
-                        f"Successfully imported {result['success_count']} units.",
-                    )
-
-                if result["error_count"] > 0:
-                    for error in result["errors"]:
-                        messages.error(
-                            request,
-                            f"Error in row {error['row']}: {error['error']}",
-                        )
-
-                # Clean up the temporary file
-                temp_path.unlink(missing_ok=True)
-
-                return redirect("admin:bunks_unit_changelist")
+                job = enqueue_import(
+                    ImportJob.UNITS,
+                    form.cleaned_data["csv_file"],
+                    dry_run=form.cleaned_data["dry_run"],
+                    user=request.user,
+                )
+                messages.info(request, f"Import queued as job #{job.pk}.")
+                return redirect("admin:imports_importjob_progress", job.pk)
         else:
             form = UnitCsvImportForm()
 
@@ -118,41 +89,14 @@ class CabinAdmin(admin.ModelAdmin):
         if request.method == "POST":
             form = CabinCsvImportForm(request.POST, request.FILES)
             if form.is_valid():
-                csv_file = form.cleaned_data["csv_file"]
-                dry_run = form.cleaned_data["dry_run"]
-
-                # Save the uploaded file to a secure temporary file
-                with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-                    temp_path = Path(temp_file.name)
-                    for chunk in csv_file.chunks():
-                        temp_file.write(chunk)
-
-                # Process the CSV file
-                result = import_cabins_from_csv(temp_path, dry_run=dry_run)
-
-                if dry_run:
-                    messages.info(
-                        request,
-                        "Dry run completed. "
-                        f"{result['success_count']} cabins would be imported.",
-                    )
-                else:
-                    messages.success(
-                        request,
-                        f"Successfully imported {result['success_count']} cabins.",
-                    )
-
-                if result["error_count"] > 0:
-                    for error in result["errors"]:
-                        messages.error(
-                            request,
-                            f"Error in row {error['row']}: {error['error']}",
-                        )
-
-                # Clean up the temporary file
-                temp_path.unlink(missing_ok=True)
-
-                return redirect("admin:bunks_cabin_changelist")
+                job = enqueue_import(
+                    ImportJob.CABINS,
+                    form.cleaned_data["csv_file"],
+                    dry_run=form.cleaned_data["dry_run"],
+                    user=request.user,
+                )
+                messages.info(request, f"Import queued as job #{job.pk}.")
+                return redirect("admin:imports_importjob_progress", job.pk)
         else:
             form = CabinCsvImportForm()
 
@@ -197,37 +141,14 @@ class BunkAdmin(admin.ModelAdmin):
         if request.method == "POST":
             form = BunkCsvImportForm(request.POST, request.FILES)
             if form.is_valid():
-                csv_file = form.cleaned_data["csv_file"]
-                dry_run = form.cleaned_data["dry_run"]
-                # Save the uploaded file to a secure temporary file
-                with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-                    temp_path = Path(temp_file.name)
-                    for chunk in csv_file.chunks():
-                        temp_file.write(chunk)
-
-                # Process the CSV file
-                result = import_bunks_from_csv(temp_path, dry_run=dry_run)
-
-                if dry_run:
-                    messages.info(
-                        request,
-                        "Dry run completed. "
-                        f"{result['created']} bunks would be imported.",
-                    )
-                else:
-                    messages.success(
-                        request,
-                        f"Successfully imported {result['created']} bunks.",
-                    )
-                if result["errors"]:
-                    for error in result["errors"]:
-                        messages.error(
-                            request,
-                            f"Error: {error}",
-                        )
-                # Clean up the temporary file
-                temp_path.unlink(missing_ok=True)
-                return redirect("admin:bunks_bunk_changelist")
+                job = enqueue_import(
+                    ImportJob.BUNKS,
+                    form.cleaned_data["csv_file"],
+                    dry_run=form.cleaned_data["dry_run"],
+                    user=request.user,
+                )
+                messages.info(request, f"Import queued as job #{job.pk}.")
+                return redirect("admin:imports_importjob_progress", job.pk)
         else:
             form = BunkCsvImportForm()
         context = {
@@ -249,12 +170,13 @@ class BunkAdmin(admin.ModelAdmin):
         description="Mark selected bunks as active",
     )
     def activate_bunks(self, request, queryset):
-        updated = queryset.update(is_active=True)
+        # update() skips auto_now; stamp updated_at so sync clients see the change
+        updated = queryset.update(is_active=True, updated_at=timezone.now())
         self.message_user(request, f"{updated} bunks were activated.")
 
     @admin.action(
         description="Mark selected bunks as inactive",
     )
     def deactivate_bunks(self, request, queryset):
-        updated = queryset.update(is_active=False)
+        updated = queryset.update(is_active=False, updated_at=timezone.now())
         self.message_user(request, f"{updated} bunks were deactivated.")
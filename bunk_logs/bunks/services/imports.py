@@ -1,18 +1,29 @@
-import csv
-from pathlib import Path
 from typing import Any
 
-from bunk_logs.users.models import User  # Adjust based on your actual model
-from bunks.models import Bunk  # Adjust based on your actual model
-from bunks.models import Cabin  # Adjust based on your actual model
-from bunks.models import Session  # Adjust based on your actual model
-from bunks.models import Unit  # Adjust based on your actual model
+from django.db import transaction
+from django.utils import timezone
+from imports.streaming import CsvSource
+from imports.streaming import Progress
+from imports.streaming import csv_dict_reader
+from imports.streaming import iter_batches
+from imports.streaming import report_result
+
+from bunk_logs.users.models import User
+from bunks.models import Bunk
+from bunks.models import Cabin
+from bunks.models import Unit
+from bunks.services.references import ReferenceResolver
+from bunks.services.references import clean_name
+from bunks.signals import reference_data_bulk_saved
+
+BULK_BATCH_SIZE = 1000
 
 
 class UnitImportError(ValueError):
     """Custom exception for unit import errors."""
 
     MISSING_NAME = "Unit name is required"
+    MULTIPLE_FOUND = "Multiple units found with name '{0}'"
 
 
 def _validate_unit_name(name: str) -> None:
@@ -21,81 +32,101 @@ def _validate_unit_name(name: str) -> None:
         raise UnitImportError(UnitImportError.MISSING_NAME)
 
 
-def import_units_from_csv(file_path, *, dry_run=False):
-    """Import units from CSV file."""
-
-    success_count = 0
-    error_records = []
-    file_path = Path(file_path)
-
-    with file_path.open() as csv_file:
-        reader = csv.DictReader(csv_file)
+def import_units_from_csv(
+    source: CsvSource,
+    *,
+    dry_run: bool = False,
+    batch_size: int = BULK_BATCH_SIZE,
+    progress: Progress | None = None,
+    start_row: int = 0,
+) -> dict[str, Any]:
+    """
+    Import units from a CSV path or stream of bytes chunks.
+
+    Units are matched by name, ignoring case and extra whitespace. A unit head
+    given by ``unit_head_email`` (or the older ``unit_head_username`` column,
+    which also holds an email) must be a Unit Head user; an unknown one leaves
+    the unit without a head, and a blank one keeps the current head. Rows are
+    read and written ``batch_size`` at a time; each batch loads its units and
+    users with one query each and is written in bulk. The first ``start_row``
+    data rows are skipped, so an interrupted import can resume.
+    """
+    result = {"success_count": 0, "error_count": 0, "errors": []}
+    batches = iter_batches(csv_dict_reader(source), batch_size, skip=start_row, progress=report_result(progress, result))
+    for rows in batches:
+        batch_success, batch_errors = _import_unit_batch(rows, dry_run=dry_run)
+        result["success_count"] += batch_success
+        result["errors"].extend(batch_errors)
+        result["error_count"] = len(result["errors"])
 
-        for row in reader:
-            try:
-                # Data validation
-                _validate_unit_name(row.get("name", ""))
+    return result
 
-                # Prepare data
-                unit_data = {
-                    "name": row["name"],
-                }
 
-                # Look up unit head by email or username if provided
-                unit_head_identifier = row.get("unit_head_email") or row.get(
-                    "unit_head_username",
-                )
-                unit_head = None
-
-                if unit_head_identifier:
-                    # Try email first
-                    if "@" in unit_head_identifier:
-                        unit_head = User.objects.filter(
-                            email=unit_head_identifier,
-                            role="UNIT_HEAD",
-                        ).first()
-                    else:
-                        # Then try username
-                        unit_head = User.objects.filter(
-                            username=unit_head_identifier,
-                            role="UNIT_HEAD",
-                        ).first()
-
-                    if not unit_head:
-                        unit_data["unit_head"] = (
-                            None  # Will be None anyway, but explicit
-                        )
-                    else:
-                        unit_data["unit_head"] = unit_head
-
-                # In dry run mode, we validate but don't save
-                if not dry_run:
-                    # Create or update unit
-                    unit, created = Unit.objects.update_or_create(
-                        name=row["name"],
-                        defaults=unit_data,
-                    )
-
-                success_count += 1
-            except (ValueError, TypeError, KeyError) as e:
-                error_records.append(
-                    {
-                        "row": row,
-                        "error": str(e),
-                    },
-                )
+def _import_unit_batch(rows: list[dict[str, str]], *, dry_run: bool) -> tuple[int, list]:
+    success_count = 0
+    error_records = []
 
-    return {
-        "success_count": success_count,
-        "error_count": len(error_records),
-        "errors": error_records,
-    }
+    # 1. Validate the batch in memory
+    parsed = []
+    for row in rows:
+        try:
+            name = clean_name(row.get("name"))
+            _validate_unit_name(name)
+            unit_head_email = (row.get("unit_head_email") or row.get("unit_head_username") or "").strip()
+            parsed.append((row, name, unit_head_email))
+        except UnitImportError as e:
+            error_records.append({"row": row, "error": str(e)})
+
+    # 2. Preload units and unit heads for the batch
+    references = ReferenceResolver(
+        units={name for _, name, _ in parsed},
+        user_emails={email for _, _, email in parsed},
+    )
+
+    # 3. Match rows to units; a later row for the same unit wins
+    new_units: list[Unit] = []
+    changed_units: dict[int, Unit] = {}
+    for row, name, unit_head_email in parsed:
+        matches = references.units.get(name)
+        if len(matches) > 1:
+            error_records.append({"row": row, "error": UnitImportError.MULTIPLE_FOUND.format(name)})
+            continue
+        if matches:
+            unit = matches[0]
+        else:
+            unit = Unit(name=name)
+            references.units.add(unit)
+            new_units.append(unit)
+
+        if unit_head_email:
+            unit_head = references.user(unit_head_email)
+            unit_head_id = unit_head.id if unit_head and unit_head.role == User.UNIT_HEAD else None
+            if unit.pk and unit.unit_head_id != unit_head_id:
+                changed_units[unit.pk] = unit
+            unit.unit_head_id = unit_head_id
+        success_count += 1
+
+    # 4. Write the batch in one transaction
+    if not dry_run and (new_units or changed_units):
+        now = timezone.now()
+        for unit in changed_units.values():
+            unit.updated_at = now
+        with transaction.atomic():
+            Unit.objects.bulk_create(new_units)
+            Unit.objects.bulk_update(list(changed_units.values()), ["unit_head", "updated_at"])
+        # Bulk writes do not send post_save
+        reference_data_bulk_saved.send(
+            sender=Unit,
+            pks=[unit.pk for unit in new_units] + list(changed_units),
+        )
+    return success_count, error_records
 
 
 class CabinImportError(ValueError):
     """Custom exception for cabin import errors."""
 
     MISSING_NAME = "Cabin name is required"
+    MULTIPLE_FOUND = "Multiple cabins found with name '{0}'"
 
 
 def _validate_cabin_name(name: str) -> None:
@@ -105,64 +136,92 @@ def _validate_cabin_name(name: str) -> None:
 
 
 def import_cabins_from_csv(
-    file_path: str | Path,
+    source: CsvSource,
     *,
     dry_run: bool = False,
+    batch_size: int = BULK_BATCH_SIZE,
+    progress: Progress | None = None,
+    start_row: int = 0,
 ) -> dict[str, Any]:
     """
     Import cabins from CSV file.
 
     Args:
-        file_path: Path to the CSV file
+        source: Path to the CSV file, or an iterable of bytes chunks
         dry_run: If True, validate the data without saving to database
+        batch_size: Rows read, validated and written at a time
+        progress: Called with the number of rows handled and the result so
+            far after each batch
+        start_row: Data rows to read past without importing
+
+    Cabins are matched by name, ignoring case and extra whitespace, against
+    one preload of the cabins each batch names, then created or updated in
+    bulk.
 
     Returns:
         Dictionary with import results
     """
+    result: dict[str, Any] = {"success_count": 0, "error_count": 0, "errors": []}
+    batches = iter_batches(csv_dict_reader(source), batch_size, skip=start_row, progress=report_result(progress, result))
+    for rows in batches:
+        batch_success, batch_errors = _import_cabin_batch(rows, dry_run=dry_run)
+        result["success_count"] += batch_success
+        result["errors"].extend(batch_errors)
+        result["error_count"] = len(result["errors"])
+
+    return result
+
+
+def _import_cabin_batch(rows: list[dict[str, str]], *, dry_run: bool) -> tuple[int, list]:
     success_count = 0
     error_records: list[dict[str, Any]] = []
 
-    file_path = Path(file_path)
-
-    with file_path.open() as csv_file:
-        reader = csv.DictReader(csv_file)
-
-        for row in reader:
-            try:
-                # Data validation
-                name = row.get("name", "")
-                _validate_cabin_name(name)
-
-                # Transform data if needed
-                capacity = int(row.get("capacity", 0))
-
-                # In dry run mode, we validate but don't save
-                if not dry_run:
-                    # Create or update cabin
-                    cabin, created = Cabin.objects.update_or_create(
-                        name=row["name"],
-                        defaults={
-                            "capacity": capacity,
-                            "location": row.get("location", ""),
-                            "notes": row.get("notes", ""),  # Matches your model
-                            # Add other fields as needed
-                        },
-                    )
-
-                success_count += 1
-            except (ValueError, TypeError, KeyError) as e:
-                error_records.append(
-                    {
-                        "row": row,
-                        "error": str(e),
-                    },
-                )
-
-    return {
-        "success_count": success_count,
-        "error_count": len(error_records),
-        "errors": error_records,
-    }
+    # 1. Validate the batch in memory
+    parsed = []
+    for row in rows:
+        try:
+            name = clean_name(row.get("name"))
+            _validate_cabin_name(name)
+            parsed.append((row, name, {
+                "capacity": int(row.get("capacity", 0)),
+                "location": row.get("location", ""),
+                "notes": row.get("notes", ""),
+            }))
+        except (ValueError, TypeError) as e:
+            error_records.append({"row": row, "error": str(e)})
+
+    # 2. Preload the named cabins
+    references = ReferenceResolver(cabins={name for _, name, _ in parsed})
+
+    # 3. Match rows to cabins; a later row for the same cabin wins
+    new_cabins: list[Cabin] = []
+    changed_cabins: dict[int, Cabin] = {}
+    for row, name, values in parsed:
+        matches = references.cabins.get(name)
+        if len(matches) > 1:
+            error_records.append({"row": row, "error": CabinImportError.MULTIPLE_FOUND.format(name)})
+            continue
+        if matches:
+            cabin = matches[0]
+            changed_cabins[cabin.pk] = cabin
+        else:
+            cabin = Cabin(name=name)
+            references.cabins.add(cabin)
+            new_cabins.append(cabin)
+        for field, value in values.items():
+            setattr(cabin, field, value)
+        success_count += 1
+
+    # 4. Write the batch in one transaction
+    if not dry_run and (new_cabins or changed_cabins):
+        with transaction.atomic():
+            Cabin.objects.bulk_create(new_cabins)
+            Cabin.objects.bulk_update(list(changed_cabins.values()), ["capacity", "location", "notes"])
+        reference_data_bulk_saved.send(
+            sender=Cabin,
+            pks=[cabin.pk for cabin in new_cabins] + list(changed_cabins),
+        )
+    return success_count, error_records
 
 
 class BunkImportError(ValueError):
@@ -176,77 +235,61 @@ class BunkImportError(ValueError):
     CABIN_NOT_FOUND = "Cabin '{0}' does not exist"
     UNIT_NOT_FOUND = "Unit '{0}' does not exist"
     SESSION_NOT_FOUND = "Session '{0}' does not exist"
+    MULTIPLE_CABINS_FOUND = "Multiple cabins found with name '{0}'"
+    MULTIPLE_UNITS_FOUND = "Multiple units found with name '{0}'"
+    MULTIPLE_SESSIONS_FOUND = "Multiple sessions found with name '{0}'"
 
 
-def _get_or_create_cabin(cabin_name, *, dry_run=False):
-    """Get or create a cabin by name."""
-    if not cabin_name.strip():
+def _parse_bunk_row(row: dict[str, str]) -> dict[str, Any]:
+    """Validate one bunk row without touching the database."""
+    cabin_name = clean_name(row.get("cabin"))
+    if not cabin_name:
         raise BunkImportError(BunkImportError.MISSING_CABIN)
-
-    cabin_name = cabin_name.strip()
-    try:
-        return Cabin.objects.get(name=cabin_name), False
-    except Cabin.DoesNotExist as err:
-        if not dry_run:
-            return Cabin.objects.create(name=cabin_name), True
-        raise BunkImportError(
-            BunkImportError.CABIN_NOT_FOUND.format(cabin_name),
-        ) from err
-
-
-def _get_unit(unit_name):
-    """Get a unit by name."""
-    if not unit_name.strip():
+    unit_name = clean_name(row.get("unit"))
+    if not unit_name:
         raise BunkImportError(BunkImportError.MISSING_UNIT)
-
-    unit_name = unit_name.strip()
-    try:
-        return Unit.objects.get(name=unit_name)
-    except Unit.DoesNotExist as err:
-        raise BunkImportError(BunkImportError.UNIT_NOT_FOUND.format(unit_name)) from err
-
-
-def _get_session(session_name):
-    """Get a session by name."""
-    if not session_name.strip():
+    session_name = clean_name(row.get("session"))
+    if not session_name:
         raise BunkImportError(BunkImportError.MISSING_SESSION)
 
-    session_name = session_name.strip()
-    try:
-        return Session.objects.get(name=session_name)
-    except Session.DoesNotExist as err:
-        raise BunkImportError(
-            BunkImportError.SESSION_NOT_FOUND.format(session_name),
-        ) from err
-
-
-def _process_bunk_row(row, *, dry_run=False):
-    """Process a single row from the CSV file."""
-    cabin_name = row.get("cabin", "").strip()
-    cabin_instance, cabin_created = _get_or_create_cabin(cabin_name, dry_run=dry_run)
+    is_active_str = (row.get("is_active") or "true").lower().strip()
+    return {
+        "cabin_name": cabin_name,
+        "unit_name": unit_name,
+        "session_name": session_name,
+        # Default to True unless explicitly "false"
+        "is_active": is_active_str != "false",
+    }
 
-    unit_name = row.get("unit", "").strip()
-    unit_instance = _get_unit(unit_name)
 
-    session_name = row.get("session", "").strip()
-    session_instance = _get_session(session_name)
+def _resolve_single(matches: list, name: str, not_found: str, multiple: str):
+    if not matches:
+        raise BunkImportError(not_found.format(name))
+    if len(matches) > 1:
+        raise BunkImportError(multiple.format(name))
+    return matches[0]
 
-    is_active_str = row.get("is_active", "true").lower().strip()
-    is_active = is_active_str != "false"  # Default to True unless explicitly "false"
 
-    if not dry_run:
-        bunk, created = Bunk.objects.update_or_create(
-            cabin=cabin_instance,
-            session=session_instance,
-            defaults={"unit": unit_instance, "is_active": is_active},
-        )
-        return {"created": created, "cabin_created": cabin_created, "bunk": bunk}
-
-    return {"cabin_created": cabin_created}
+def import_bunks_from_csv(
+    source: CsvSource,
+    *,
+    dry_run: bool = False,
+    batch_size: int = BULK_BATCH_SIZE,
+    progress: Progress | None = None,
+    start_row: int = 0,
+) -> dict[str, Any]:
+    """
+    Import bunks from a CSV path or stream of bytes chunks.
 
+    Expected CSV format: cabin,unit,session,is_active
 
-def import_bunks_from_csv(file_path, *, dry_run=False):
-    """Import bunks from CSV file."""
+    Rows are handled ``batch_size`` at a time. For each batch the cabins,
+    units, sessions and the sessions' bunks are loaded with one query each.
+    Missing cabins are created with a capacity of 0; units and sessions must
+    already exist. Bunks are upserted on (cabin, session), so a new season's
+    bunks take a handful of queries per batch. Rows before ``start_row`` are
+    skipped but keep their row numbers.
+    """
     results = {
         "created": 0,
         "updated": 0,
@@ -254,30 +297,111 @@ def import_bunks_from_csv(file_path, *, dry_run=False):
         "created_cabins": 0,
     }
 
+    rows = enumerate(csv_dict_reader(source), start=1)
     try:
-        file_path = Path(file_path)
-        with file_path.open(encoding="utf-8-sig") as csv_file:
-            reader = csv.DictReader(csv_file)
-
-            for row_num, row in enumerate(reader, start=1):
-                try:
-                    row_result = _process_bunk_row(row, dry_run=dry_run)
-
-                    if not dry_run:
-                        if row_result["created"]:
-                            results["created"] += 1
-                        else:
-                            results["updated"] += 1
-
-                        if row_result["cabin_created"]:
-                            results["created_cabins"] += 1
-
-                except BunkImportError as e:
-                    results["errors"].append(f"Row {row_num}: {e!s}")
-                except (ValueError, KeyError, TypeError) as e:
-                    results["errors"].append(f"Error in row {row_num}: {e!s}")
-
-    except (OSError, FileNotFoundError, PermissionError) as e:
+        for batch in iter_batches(rows, batch_size, skip=start_row, progress=report_result(progress, results)):
+            _import_bunk_batch(batch, results, dry_run=dry_run)
+    except OSError as e:
         results["errors"].append(f"File error: {e!s}")
 
     return results
+
+
+def _import_bunk_batch(rows: list[tuple[int, dict[str, str]]], results: dict[str, Any], *, dry_run: bool) -> None:
+    # 1. Validate the batch in memory
+    parsed = []
+    for row_num, row in rows:
+        try:
+            parsed.append((row_num, _parse_bunk_row(row)))
+        except BunkImportError as e:
+            results["errors"].append(f"Row {row_num}: {e!s}")
+
+    # 2. Preload reference data for the batch
+    references = ReferenceResolver(
+        cabins={data["cabin_name"] for _, data in parsed},
+        units={data["unit_name"] for _, data in parsed},
+        sessions={data["session_name"] for _, data in parsed},
+        bunks=True,
+    )
+
+    # 3. Resolve every row; a later row for the same cabin and session wins
+    new_cabins: list[Cabin] = []
+    # Keyed by the cabin object's identity, as new cabins have no pk yet
+    bunks: dict[tuple[int, int], dict[str, Any]] = {}
+    for row_num, data in parsed:
+        try:
+            cabin_matches = references.cabins.get(data["cabin_name"])
+            if not cabin_matches:
+                if dry_run:
+                    raise BunkImportError(BunkImportError.CABIN_NOT_FOUND.format(data["cabin_name"]))
+                cabin = Cabin(name=data["cabin_name"], capacity=0)
+                references.cabins.add(cabin)
+                new_cabins.append(cabin)
+                results["created_cabins"] += 1
+            else:
+                cabin = _resolve_single(
+                    cabin_matches, data["cabin_name"],
+                    BunkImportError.CABIN_NOT_FOUND, BunkImportError.MULTIPLE_CABINS_FOUND,
+                )
+            unit = _resolve_single(
+                references.units.get(data["unit_name"]), data["unit_name"],
+                BunkImportError.UNIT_NOT_FOUND, BunkImportError.MULTIPLE_UNITS_FOUND,
+            )
+            session = _resolve_single(
+                references.sessions.get(data["session_name"]), data["session_name"],
+                BunkImportError.SESSION_NOT_FOUND, BunkImportError.MULTIPLE_SESSIONS_FOUND,
+            )
+        except BunkImportError as e:
+            results["errors"].append(f"Row {row_num}: {e!s}")
+            continue
+
+        if dry_run:
+            continue
+        key = (id(cabin), session.id)
+        existing = references.bunks.get((cabin.pk, session.id)) if cabin.pk else None
+        if existing is not None or key in bunks:
+            results["updated"] += 1
+        else:
+            results["created"] += 1
+        bunks[key] = {
+            "cabin": cabin,
+            "session_id": session.id,
+            "existing": existing,
+            "unit_id": unit.id,
+            "is_active": data["is_active"],
+        }
+
+    if dry_run or not (bunks or new_cabins):
+        return
+
+    # 4. Create cabins, then upsert bunks on (cabin, session), in one transaction
+    now = timezone.now()
+    with transaction.atomic():
+        Cabin.objects.bulk_create(new_cabins)
+        saved = Bunk.objects.bulk_create(
+            [
+                Bunk(
+                    cabin_id=values["cabin"].pk,
+                    session_id=values["session_id"],
+                    unit_id=values["unit_id"],
+                    is_active=values["is_active"],
+                    updated_at=now,
+                )
+                for values in bunks.values()
+            ],
+            update_conflicts=True,
+            unique_fields=["cabin", "session"],
+            update_fields=["unit", "is_active", "updated_at"],
+        )
+    if new_cabins:
+        reference_data_bulk_saved.send(sender=Cabin, pks=[cabin.pk for cabin in new_cabins])
+    if saved:
+        reference_data_bulk_saved.send(
+            sender=Bunk,
+            pks=[bunk.pk for bunk in saved if bunk.pk is not None],
+            previous_unit_ids={
+                values["existing"].pk: values["existing"].unit_id
+                for values in bunks.values()
+                if values["existing"] is not None and values["existing"].unit_id != values["unit_id"]
+            },
+        )
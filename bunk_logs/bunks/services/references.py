@@ -0,0 +1,125 @@
+"""
+Reference data lookups shared by the CSV importers.
+
+Import rows point at cabins, units, sessions and users by name or email
+rather than by id. ReferenceResolver loads everything a file mentions up
+front, one query per model, so resolving a row is a dict lookup instead of
+a query. Names are compared after normalize_name (case and whitespace
+folded), in Python and in SQL alike. Objects an importer creates along the
+way are added to the index, so later rows in the same file resolve to them.
+"""
+from collections import defaultdict
+from collections.abc import Callable
+from collections.abc import Hashable
+from collections.abc import Iterable
+from typing import Any
+
+from django.db.models import CharField
+from django.db.models import Func
+from django.db.models.functions import Lower
+
+from bunk_logs.users.models import User
+from bunks.models import Bunk
+from bunks.models import Cabin
+from bunks.models import Session
+from bunks.models import Unit
+
+
+def clean_name(value: str | None) -> str:
+    """Trim a name and collapse runs of whitespace inside it."""
+    return " ".join((value or "").split())
+
+
+def normalize_name(value: str | None) -> str:
+    """The form names are matched on: collapsed whitespace, lower case."""
+    return clean_name(value).lower()
+
+
+class NormalizedName(Func):
+    """SQL counterpart of normalize_name, so stored names are compared the same way."""
+
+    template = "LOWER(BTRIM(REGEXP_REPLACE(%(expressions)s, '\\s+', ' ', 'g')))"
+    output_field = CharField()
+
+
+class NameIndex:
+    """Objects grouped by a normalized key; a key may match several objects."""
+
+    def __init__(self, objects: Iterable[Any] = (), *, key: Callable[[Any], Hashable]):
+        self._key = key
+        self._objects: dict[Hashable, list] = defaultdict(list)
+        for obj in objects:
+            self.add(obj)
+
+    def add(self, obj: Any) -> None:
+        self._objects[self._key(obj)].append(obj)
+
+    def get(self, key: Hashable) -> list:
+        """Every object under ``key``; string keys are normalized first."""
+        if isinstance(key, str):
+            key = normalize_name(key)
+        return list(self._objects.get(key, ()))
+
+
+def _name_key(obj) -> str:
+    return normalize_name(obj.name)
+
+
+def _load_by_name(model, names: Iterable[str]) -> NameIndex:
+    wanted = {normalize_name(name) for name in names} - {""}
+    objects = []
+    if wanted:
+        objects = model.objects.annotate(name_key=NormalizedName("name")).filter(
+            name_key__in=wanted,
+        )
+    return NameIndex(objects, key=_name_key)
+
+
+class ReferenceResolver:
+    """
+    Cabins, units and sessions by name, users by email, and bunks by
+    (cabin_id, session_id), each loaded with one query.
+
+    Only the kinds given names are queried. Bunks are loaded for the
+    sessions found, so pass session names to resolve bunks.
+    """
+
+    def __init__(
+        self,
+        *,
+        cabins: Iterable[str] = (),
+        units: Iterable[str] = (),
+        sessions: Iterable[str] = (),
+        user_emails: Iterable[str] = (),
+        bunks: bool = False,
+    ):
+        sessions = list(sessions)
+        self.cabins = _load_by_name(Cabin, cabins)
+        self.units = _load_by_name(Unit, units)
+        self.sessions = _load_by_name(Session, sessions)
+
+        emails = {email.strip().lower() for email in user_emails} - {""}
+        users = []
+        if emails:
+            users = User.objects.annotate(email_key=Lower("email")).filter(email_key__in=emails)
+        self.users = {user.email.lower(): user for user in users}
+
+        self.bunks: dict[tuple[int, int], Bunk] = {}
+        session_ids = {session.id for name in sessions for session in self.sessions.get(name)}
+        if bunks and session_ids:
+            self.bunks = {
+                (bunk.cabin_id, bunk.session_id): bunk
+                for bunk in Bunk.objects.filter(session_id__in=session_ids).select_related("session")
+            }
+
+    def user(self, email: str | None) -> User | None:
+        return self.users.get((email or "").strip().lower())
+
+    def bunks_named(self, cabin_name: str, session_name: str) -> list[Bunk]:
+        """Every bunk whose cabin and session carry these names."""
+        return [
+            bunk
+            for cabin in self.cabins.get(cabin_name)
+            for session in self.sessions.get(session_name)
+            if (bunk := self.bunks.get((cabin.id, session.id))) is not None
+        ]
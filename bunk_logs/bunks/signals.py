@@ -0,0 +1,8 @@
+from django.dispatch import Signal
+
+# Sent after Unit, Cabin or Bunk rows are written with bulk_create/bulk_update,
+# which skip the per-instance post_save signal. The sender is the model and
+# receivers get ``pks``: the rows created or changed. For bunks,
+# ``previous_unit_ids`` maps each updated bunk that changed unit to the unit
+# it belonged to before.
+reference_data_bulk_saved = Signal()
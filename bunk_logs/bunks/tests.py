@@ -1 +1,82 @@
-# Create your tests here.
+import tempfile
+from pathlib import Path
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from bunk_logs.users.models import User
+from bunks.models import Bunk
+from bunks.models import Cabin
+from bunks.models import Session
+from bunks.models import Unit
+from bunks.services.imports import import_bunks_from_csv
+from bunks.services.imports import import_cabins_from_csv
+from bunks.services.imports import import_units_from_csv
+
+
+class ReferenceDataImportTest(TestCase):
+    def setUp(self):
+        self.session = Session.objects.create(
+            name="Summer 2025",
+            start_date="2025-06-01",
+            end_date="2025-08-31"
+        )
+        self.unit_head = User.objects.create_user(
+            email="head@example.com",
+            password="password123",
+            role="Unit Head"
+        )
+
+    def _write_csv(self, header, rows):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as csv_file:
+            csv_file.write("\n".join([header, *rows]))
+        self.addCleanup(Path(csv_file.name).unlink)
+        return csv_file.name
+
+    def test_season_setup_takes_a_handful_of_queries(self):
+        units = self._write_csv("name,unit_head_email", [
+            "Juniors,HEAD@example.com",
+            "Seniors,nobody@example.com",
+        ])
+        cabins = self._write_csv("name,capacity,location", [f"Cabin {i},10,Hill" for i in range(20)])
+        bunks = self._write_csv("cabin,unit,session,is_active", [
+            *(f"cabin {i},{'Juniors' if i % 2 else 'seniors'},Summer 2025,true" for i in range(20)),
+            "New Cabin,Juniors,Summer 2025,false",
+        ])
+
+        with CaptureQueriesContext(connection) as queries:
+            import_units_from_csv(units)
+            import_cabins_from_csv(cabins)
+            result = import_bunks_from_csv(bunks)
+        self.assertLess(len(queries), 25)
+
+        self.assertEqual(Unit.objects.get(name="Juniors").unit_head, self.unit_head)
+        self.assertIsNone(Unit.objects.get(name="Seniors").unit_head)
+        self.assertEqual((result["created"], result["updated"], result["created_cabins"]), (21, 0, 1))
+        self.assertEqual(result["errors"], [])
+        self.assertEqual(Bunk.objects.filter(unit__name="Juniors", is_active=True).count(), 10)
+        self.assertEqual(Cabin.objects.get(name="New Cabin").capacity, 0)
+
+    def test_reimport_updates_in_place_and_reports_errors(self):
+        juniors = Unit.objects.create(name="Juniors")
+        seniors = Unit.objects.create(name="Seniors")
+        cabin = Cabin.objects.create(name="A1", capacity=8)
+        bunk = Bunk.objects.create(cabin=cabin, session=self.session, unit=juniors)
+
+        result = import_cabins_from_csv(self._write_csv("name,capacity", ["a1 ,12", "B2,ten"]))
+        self.assertEqual(result["success_count"], 1)
+        self.assertEqual(result["error_count"], 1)
+        cabin.refresh_from_db()
+        self.assertEqual(cabin.capacity, 12)
+        self.assertEqual(Cabin.objects.count(), 1)
+
+        result = import_bunks_from_csv(self._write_csv("cabin,unit,session", [
+            "A1,Seniors,Summer 2025",
+            "A1,Middlers,Summer 2025",
+        ]))
+        self.assertEqual((result["created"], result["updated"]), (0, 1))
+        self.assertEqual(result["errors"], ["Row 2: Unit 'Middlers' does not exist"])
+        bunk.refresh_from_db()
+        self.assertEqual(bunk.unit, seniors)
+        self.assertEqual(Bunk.objects.count(), 1)
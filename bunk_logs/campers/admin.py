@@ -1,23 +1,27 @@
 import logging
-import tempfile
-from pathlib import Path
+from dataclasses import replace
 
 from bunklogs.models import BunkLog
 from django.contrib import admin
 from django.contrib import messages
+from django.db import IntegrityError
+from django.db import transaction
 from django.db.models.deletion import ProtectedError
 from django.shortcuts import redirect
 from django.shortcuts import render
 from django.urls import NoReverseMatch
 from django.urls import path
 from django.urls import reverse
+from django.utils import timezone
+from imports.models import ImportJob
+from imports.services import enqueue_import
 
 from .forms import BunkAssignmentCsvImportForm
 from .forms import CamperCsvImportForm
 from .models import Camper
 from .models import CamperBunkAssignment
-from .services.imports import import_bunk_assignments_from_csv
-from .services.imports import import_campers_from_csv
+from .overlaps import AssignmentInterval
+from .overlaps import find_assignment_conflicts
 
 # Define constants
 MAX_DISPLAY_ITEMS = 5
@@ -47,41 +51,15 @@ class CamperAdmin(admin.ModelAdmin):
         if request.method == "POST":
             form = CamperCsvImportForm(request.POST, request.FILES)
             if form.is_valid():
-                csv_file = form.cleaned_data["csv_file"]
-                dry_run = form.cleaned_data["dry_run"]
-
-                # Save the uploaded file to a secure temporary file
-                with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-                    temp_path = Path(temp_file.name)
-                    for chunk in csv_file.chunks():
-                        temp_file.write(chunk)
-
-                # Pass the temp_path to the import function, not the csv_file
-                result = import_campers_from_csv(temp_path, dry_run=dry_run)
-
-                if dry_run:
-                    messages.info(
-                        request,
-                        "Dry run completed. "
-                        f"{result['success_count']} campers would be imported.",
-                    )
-                else:
-                    messages.success(
-                        request,
-                        f"Successfully imported {result['success_count']} campers.",
-                    )
-
-                if result["error_count"] > 0:
-                    for error in result["errors"]:
-                        messages.error(
-                            request,
-                            f"Row {error['row']}: {error['error']}",
-                        )
-
-                # Clean up the temporary file
-                temp_path.unlink(missing_ok=True)
-
-                return redirect("admin:campers_camper_changelist")
+                job = enqueue_import(
+                    ImportJob.CAMPERS,
+                    form.cleaned_data["csv_file"],
+                    dry_run=form.cleaned_data["dry_run"],
+                    user=request.user,
+                    options={"match_date_of_birth": form.cleaned_data["match_date_of_birth"]},
+                )
+                messages.info(request, f"Import queued as job #{job.pk}.")
+                return redirect("admin:imports_importjob_progress", job.pk)
         else:
             form = CamperCsvImportForm()
 
@@ -120,7 +98,8 @@ class CamperBunkAssignmentAdmin(admin.ModelAdmin):
     )
     def deactivate_assignments(self, request, queryset):
         """Bulk action to deactivate assignments instead of deleting them."""
-        updated = queryset.update(is_active=False)
+        # update() skips auto_now; stamp updated_at so sync clients see the change
+        updated = queryset.update(is_active=False, updated_at=timezone.now())
         self.message_user(
             request,
             f"{updated} assignments have been deactivated.",
@@ -131,13 +110,37 @@ class CamperBunkAssignmentAdmin(admin.ModelAdmin):
         description="Activate selected assignments",
     )
     def activate_assignments(self, request, queryset):
-        """Bulk action to reactivate assignments."""
-        updated = queryset.update(is_active=True)
+        """Bulk action to reactivate assignments that would not overlap another."""
+        proposed = [
+            replace(AssignmentInterval.from_assignment(assignment), is_active=True)
+            for assignment in queryset.select_related("camper", "bunk__cabin", "bunk__session")
+        ]
+        conflicts = find_assignment_conflicts(proposed)
+        blocked = {conflict.interval.assignment_id: conflict for conflict in conflicts}
+        try:
+            with transaction.atomic():
+                updated = queryset.exclude(pk__in=blocked).update(is_active=True, updated_at=timezone.now())
+        except IntegrityError as e:
+            # A constraint caught an assignment written since the check above
+            message = CamperBunkAssignment.violation_message(e)
+            if message is None:
+                raise
+            self.message_user(request, message, messages.ERROR)
+            return
         self.message_user(
             request,
             f"{updated} assignments have been activated.",
             messages.SUCCESS,
         )
+        if blocked:
+            skipped = [f"{conflict.interval.ref}: {conflict.message}" for conflict in blocked.values()]
+            error_message = (
+                f"Skipped {len(skipped)} assignments that conflict with another assignment: "
+                f"{'; '.join(skipped[:MAX_DISPLAY_ITEMS])}"
+            )
+            if len(skipped) > MAX_DISPLAY_ITEMS:
+                error_message += f" and {len(skipped) - MAX_DISPLAY_ITEMS} more."
+            self.message_user(request, error_message, messages.ERROR)
 
     def delete_model(self, request, obj):
         """Override delete_model to gracefully handle protected errors."""
@@ -220,40 +223,14 @@ class CamperBunkAssignmentAdmin(admin.ModelAdmin):
         if request.method == "POST":
             form = BunkAssignmentCsvImportForm(request.POST, request.FILES)
             if form.is_valid():
-                csv_file = form.cleaned_data["csv_file"]
-                dry_run = form.cleaned_data["dry_run"]
-
-                # Save the uploaded file to a secure temporary file
-                with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-                    temp_path = Path(temp_file.name)
-                    for chunk in csv_file.chunks():
-                        temp_file.write(chunk)
-
-                result = import_bunk_assignments_from_csv(temp_path, dry_run=dry_run)
-
-                if dry_run:
-                    messages.info(
-                        request,
-                        f"Dry run completed. {result['success_count']} assignments "
-                        f"would be imported.",
-                    )
-                else:
-                    messages.success(
-                        request,
-                        f"Successfully imported {result['success_count']} assignments.",
-                    )
-
-                if result["error_count"] > 0:
-                    for error in result["errors"]:
-                        messages.error(
-                            request,
-                            f"Row {error['row']}: {error['error']}",
-                        )
-
-                # Clean up the temporary file
-                temp_path.unlink(missing_ok=True)
-
-                return redirect("admin:campers_camperbunkassignment_changelist")
+                job = enqueue_import(
+                    ImportJob.ASSIGNMENTS,
+                    form.cleaned_data["csv_file"],
+                    dry_run=form.cleaned_data["dry_run"],
+                    user=request.user,
+                )
+                messages.info(request, f"Import queued as job #{job.pk}.")
+                return redirect("admin:imports_importjob_progress", job.pk)
         else:
             form = BunkAssignmentCsvImportForm()
 
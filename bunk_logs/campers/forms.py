@@ -12,6 +12,11 @@ class CamperCsvImportForm(forms.Form):
         label="Dry run",
         help_text="Validate without saving to database",
     )
+    match_date_of_birth = forms.BooleanField(
+        required=False,
+        label="Match date of birth",
+        help_text="Treat campers with the same name but a different date of birth as different campers",
+    )
 
     def clean(self):
         cleaned_data = super().clean()
@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bunks', '0001_initial'),
+        ('campers', '0001_initial'),
+    ]
+
+    operations = [
+        # The model dropped unique_together so campers can return to a bunk in a
+        # later period; bring the migration state in line with it.
+        migrations.AlterUniqueTogether(
+            name='camperbunkassignment',
+            unique_together=set(),
+        ),
+        migrations.AddIndex(
+            model_name='camperbunkassignment',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['bunk'], name='cba_active_bunk_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='camperbunkassignment',
+            index=models.Index(fields=['camper', 'is_active'], name='cba_camper_active_idx'),
+        ),
+    ]
@@ -0,0 +1,73 @@
+import sys
+
+import campers.models
+import django.contrib.postgres.constraints
+import django.contrib.postgres.fields.ranges
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations, models
+
+
+def deactivate_conflicting_assignments(apps, schema_editor):
+    """
+    Leave each camper one active assignment, the latest starting, so the
+    constraints can be added over rows the old activate action let through.
+    """
+    CamperBunkAssignment = apps.get_model("campers", "CamperBunkAssignment")
+    active = (
+        CamperBunkAssignment.objects.filter(is_active=True)
+        .order_by("camper_id", models.F("start_date").desc(nulls_last=True), "-id")
+        .values_list("id", "camper_id")
+    )
+    kept = set()
+    conflicting = []
+    for assignment_id, camper_id in active:
+        if camper_id in kept:
+            conflicting.append(assignment_id)
+        kept.add(camper_id)
+    if conflicting:
+        CamperBunkAssignment.objects.filter(pk__in=conflicting).update(is_active=False)
+        sys.stdout.write(
+            f"\n  Deactivated {len(conflicting)} conflicting active assignments: "
+            f"{', '.join(map(str, conflicting))}"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campers', '0003_camperbunkassignment_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(deactivate_conflicting_assignments, migrations.RunPython.noop),
+        # GiST needs btree_gist for the plain equality on camper_id
+        BtreeGistExtension(),
+        migrations.AddConstraint(
+            model_name='camperbunkassignment',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(
+                condition=models.Q(('is_active', True)),
+                expressions=[
+                    ('camper', '='),
+                    (
+                        campers.models.DateRange(
+                            'start_date',
+                            'end_date',
+                            django.contrib.postgres.fields.ranges.RangeBoundary(inclusive_lower=True, inclusive_upper=True),
+                        ),
+                        '&&',
+                    ),
+                ],
+                name='cba_no_overlapping_active',
+                violation_error_message='Camper already has an active bunk assignment during this period.',
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name='camperbunkassignment',
+            constraint=models.UniqueConstraint(
+                condition=models.Q(('is_active', True)),
+                fields=('camper',),
+                name='cba_one_active_per_camper',
+                violation_error_message='Camper already has an active bunk assignment.',
+            ),
+        ),
+    ]
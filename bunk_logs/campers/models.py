@@ -1,7 +1,14 @@
 from datetime import datetime
 
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateRangeField
+from django.contrib.postgres.fields import RangeBoundary
+from django.contrib.postgres.fields import RangeOperators
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError
 from django.db import models
+from django.db import router
+from django.db import transaction
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
@@ -52,12 +59,34 @@ class Camper(models.Model):
         )
 
 
+# Named here rather than on CamperBunkAssignment so its Meta can use them
+OVERLAP_CONSTRAINT = "cba_no_overlapping_active"
+OVERLAPPING_ASSIGNMENT_ERROR = "Camper already has an active bunk assignment during this period."
+ACTIVE_CONSTRAINT = "cba_one_active_per_camper"
+ACTIVE_ASSIGNMENT_ERROR = "Camper already has an active bunk assignment."
+
+
+class DateRange(models.Func):
+    """``daterange(start, end, bounds)``; NULL bounds leave that side open."""
+
+    function = "DATERANGE"
+    output_field = DateRangeField()
+
+
 class CamperBunkAssignment(models.Model):
     """Assignment of campers to bunks for a specific session."""
 
     # Add error message constant
     BUNK_LOGS_DELETE_ERROR = "Cannot delete bunk assignment with associated bunk logs."
-    OVERLAPPING_ASSIGNMENT_ERROR = "Camper already has an active bunk assignment during this period."
+    OVERLAPPING_ASSIGNMENT_ERROR = OVERLAPPING_ASSIGNMENT_ERROR
+    ACTIVE_ASSIGNMENT_ERROR = ACTIVE_ASSIGNMENT_ERROR
+    OVERLAP_CONSTRAINT = OVERLAP_CONSTRAINT
+    ACTIVE_CONSTRAINT = ACTIVE_CONSTRAINT
+    # Message reported for a violation of each constraint
+    CONSTRAINT_ERRORS = {
+        OVERLAP_CONSTRAINT: OVERLAPPING_ASSIGNMENT_ERROR,
+        ACTIVE_CONSTRAINT: ACTIVE_ASSIGNMENT_ERROR,
+    }
 
     camper = models.ForeignKey(
         Camper,
@@ -72,11 +101,45 @@ class CamperBunkAssignment(models.Model):
     start_date = models.DateField(null=True, blank=True)
     end_date = models.DateField(null=True, blank=True)
     is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = _("camper bunk assignment")
         verbose_name_plural = _("camper bunk assignments")
         # Removed unique_together constraint to allow multiple assignments with different dates
+        indexes = [
+            # Rosters and permission checks read the active campers of a bunk
+            models.Index(
+                fields=["bunk"],
+                condition=models.Q(is_active=True),
+                name="cba_active_bunk_idx",
+            ),
+            # Camper lookups and overlap checks filter on (camper, is_active)
+            models.Index(fields=["camper", "is_active"], name="cba_camper_active_idx"),
+        ]
+        constraints = [
+            # Active assignments of a camper may not overlap. Enforced by
+            # Postgres, so bulk updates and concurrent writes are covered too.
+            ExclusionConstraint(
+                name=OVERLAP_CONSTRAINT,
+                expressions=[
+                    ("camper", RangeOperators.EQUAL),
+                    (
+                        DateRange("start_date", "end_date", RangeBoundary(inclusive_lower=True, inclusive_upper=True)),
+                        RangeOperators.OVERLAPS,
+                    ),
+                ],
+                condition=models.Q(is_active=True),
+                violation_error_message=OVERLAPPING_ASSIGNMENT_ERROR,
+            ),
+            # And a camper has at most one active assignment at all
+            models.UniqueConstraint(
+                fields=["camper"],
+                condition=models.Q(is_active=True),
+                name=ACTIVE_CONSTRAINT,
+                violation_error_message=ACTIVE_ASSIGNMENT_ERROR,
+            ),
+        ]
 
     def __str__(self):
         return f"{self.camper} in {self.bunk.name}"
@@ -85,35 +148,43 @@ class CamperBunkAssignment(models.Model):
         # Validate that dates are logical
         if self.start_date and self.end_date and self.start_date > self.end_date:
             raise ValidationError("End date cannot be before start date.")
-            
-        # Check for overlapping assignments
+
+        # Overlap rules live in campers/overlaps.py so batches can share them
         if self.is_active or (self.start_date and self.end_date):
-            overlapping_assignments = CamperBunkAssignment.objects.filter(
-                camper=self.camper,
-                is_active=True,
-            )
-            
-            # Exclude current instance if it exists (for updates)
-            if self.pk:
-                overlapping_assignments = overlapping_assignments.exclude(pk=self.pk)
-                
-            # Check date-based overlaps if dates are provided
-            if self.start_date and self.end_date:
-                date_overlaps = CamperBunkAssignment.objects.filter(
-                    camper=self.camper,
-                    start_date__lte=self.end_date,
-                    end_date__gte=self.start_date
-                )
-                
-                if self.pk:
-                    date_overlaps = date_overlaps.exclude(pk=self.pk)
-                    
-                if date_overlaps.exists():
-                    raise ValidationError(self.OVERLAPPING_ASSIGNMENT_ERROR)
-                    
-            # If we're setting this as active, ensure no other active assignments exist
-            if self.is_active and overlapping_assignments.exists():
-                raise ValidationError("Camper already has an active bunk assignment.")
+            from .overlaps import AssignmentInterval
+            from .overlaps import conflict_messages
+            from .overlaps import find_assignment_conflicts
+
+            conflicts = find_assignment_conflicts([AssignmentInterval.from_assignment(self)])
+            if conflicts:
+                raise ValidationError(conflict_messages(conflicts))
+
+    def validate_constraints(self, exclude=None):
+        # clean() already checks the rules of both constraints with a single
+        # query; validating the constraints as well would query again
+        using = router.db_for_write(self.__class__, instance=self)
+        errors = []
+        for constraint in self._meta.constraints:
+            if constraint.name in self.CONSTRAINT_ERRORS:
+                continue
+            try:
+                constraint.validate(self.__class__, self, exclude=exclude, using=using)
+            except ValidationError as e:
+                errors.extend(e.error_list)
+        if errors:
+            raise ValidationError(errors)
+
+    @classmethod
+    def violation_message(cls, error):
+        """The message for an IntegrityError raised by one of the assignment constraints, else None."""
+        diag = getattr(error.__cause__, "diag", None)
+        constraint_name = getattr(diag, "constraint_name", None)
+        if constraint_name:
+            return cls.CONSTRAINT_ERRORS.get(constraint_name)
+        for name, message in cls.CONSTRAINT_ERRORS.items():
+            if name in str(error):
+                return message
+        return None
 
     def save(self, *args, **kwargs):
         # Automatically set start and end dates based on the session of the bunk
@@ -121,11 +192,21 @@ class CamperBunkAssignment(models.Model):
             self.start_date = self.bunk.session.start_date
         if not self.end_date and self.bunk and self.bunk.session:
             self.end_date = self.bunk.session.end_date
-            
-        # Run validation
-        self.clean()
-        
-        super().save(*args, **kwargs)
+
+        if self.start_date and self.end_date and self.start_date > self.end_date:
+            raise ValidationError("End date cannot be before start date.")
+
+        # A second active or an overlapping assignment is rejected by the
+        # database constraints instead of being queried for first; report
+        # it with the usual message.
+        try:
+            with transaction.atomic():
+                super().save(*args, **kwargs)
+        except IntegrityError as e:
+            message = self.violation_message(e)
+            if message is None:
+                raise
+            raise ValidationError(message) from e
 
     def delete(self, *args, **kwargs):
         # Check for associated bunk logs before deletion
@@ -0,0 +1,194 @@
+"""
+In-memory overlap checks for camper bunk assignments.
+
+The rules are the ones CamperBunkAssignment has always enforced:
+
+- two dated assignments of the same camper may not overlap, whether or not
+  they are active
+- a camper may have only one active assignment
+
+``AssignmentIntervalIndex`` keeps each camper's dated assignments sorted by
+start date, so a proposed assignment is checked against just the intervals
+that start before it ends. ``find_assignment_conflicts`` loads the existing
+assignments of every camper in a batch with one query and checks the whole
+batch in one pass, reporting every conflict rather than stopping at the
+first. ``CamperBunkAssignment.clean``, the assignment importer and the admin
+actions all go through it.
+
+These checks give per-row messages up front; the database itself
+guarantees that active assignments never overlap and that a camper has one
+active assignment at most, through the ``cba_no_overlapping_active`` and
+``cba_one_active_per_camper`` constraints. Only the rule for inactive
+assignments is left to these checks.
+"""
+from bisect import bisect_right
+from bisect import insort
+from collections import defaultdict
+from collections.abc import Hashable
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+from .models import CamperBunkAssignment
+
+INTERVAL_FIELDS = ("id", "camper_id", "bunk_id", "start_date", "end_date", "is_active")
+
+
+@dataclass(frozen=True, eq=False)
+class AssignmentInterval:
+    """
+    One assignment as far as overlap checks are concerned. ``camper`` is any
+    hashable camper key, usually the camper id; ``ref`` is left for callers to
+    tie conflicts back to their input (a row, a form, an instance).
+    """
+
+    camper: Hashable
+    start_date: date | None
+    end_date: date | None
+    is_active: bool
+    assignment_id: int | None = None
+    bunk_id: int | None = None
+    ref: Any = None
+
+    @property
+    def is_dated(self):
+        return bool(self.start_date and self.end_date)
+
+    def is_same_assignment(self, other):
+        if self.assignment_id is not None:
+            return self.assignment_id == other.assignment_id
+        return self is other
+
+    @classmethod
+    def from_assignment(cls, assignment, *, ref=None):
+        return cls(
+            camper=assignment.camper_id,
+            start_date=assignment.start_date,
+            end_date=assignment.end_date,
+            is_active=assignment.is_active,
+            assignment_id=assignment.pk,
+            bunk_id=assignment.bunk_id,
+            ref=assignment if ref is None else ref,
+        )
+
+
+@dataclass(frozen=True)
+class AssignmentConflict:
+    """A proposed interval, the interval it clashes with and the error message."""
+
+    interval: AssignmentInterval
+    other: AssignmentInterval
+    message: str
+
+
+class AssignmentIntervalIndex:
+    """Per-camper assignments: dated ones sorted by start date, plus the active ones."""
+
+    def __init__(self, intervals: Iterable[AssignmentInterval] = ()):
+        self._dated: dict[Hashable, list[AssignmentInterval]] = defaultdict(list)
+        self._active: dict[Hashable, list[AssignmentInterval]] = defaultdict(list)
+        self._all: dict[Hashable, list[AssignmentInterval]] = defaultdict(list)
+        for interval in intervals:
+            self.add(interval)
+
+    def add(self, interval: AssignmentInterval) -> None:
+        self._all[interval.camper].append(interval)
+        if interval.is_dated:
+            insort(self._dated[interval.camper], interval, key=lambda other: other.start_date)
+        if interval.is_active:
+            self._active[interval.camper].append(interval)
+
+    def remove(self, interval: AssignmentInterval) -> None:
+        self._all[interval.camper].remove(interval)
+        if interval.is_dated:
+            self._dated[interval.camper].remove(interval)
+        if interval.is_active:
+            self._active[interval.camper].remove(interval)
+
+    def intervals(self, camper: Hashable) -> list[AssignmentInterval]:
+        """Every interval indexed for a camper, in the order they were added."""
+        return list(self._all.get(camper, ()))
+
+    def conflicts(self, interval: AssignmentInterval) -> list[AssignmentConflict]:
+        """Every indexed interval that ``interval`` would clash with."""
+        conflicts = []
+        if interval.is_dated:
+            dated = self._dated.get(interval.camper, [])
+            # Only intervals starting on or before the proposed end can overlap it
+            stop = bisect_right(dated, interval.end_date, key=lambda other: other.start_date)
+            conflicts.extend(
+                AssignmentConflict(interval, other, CamperBunkAssignment.OVERLAPPING_ASSIGNMENT_ERROR)
+                for other in dated[:stop]
+                if other.end_date >= interval.start_date and not interval.is_same_assignment(other)
+            )
+        if interval.is_active:
+            conflicts.extend(
+                AssignmentConflict(interval, other, CamperBunkAssignment.ACTIVE_ASSIGNMENT_ERROR)
+                for other in self._active.get(interval.camper, [])
+                if not interval.is_same_assignment(other)
+            )
+        return conflicts
+
+    def check_batch(self, intervals: Iterable[AssignmentInterval]) -> list[AssignmentConflict]:
+        """
+        Check intervals in order, each against the index and the batch members
+        accepted before it. Intervals without conflicts are added to the index.
+        """
+        conflicts = []
+        for interval in intervals:
+            found = self.conflicts(interval)
+            if found:
+                conflicts.extend(found)
+            else:
+                self.add(interval)
+        return conflicts
+
+
+def conflict_messages(conflicts: Iterable[AssignmentConflict]) -> list[str]:
+    """The distinct messages of ``conflicts``, in the order they were found."""
+    return list(dict.fromkeys(conflict.message for conflict in conflicts))
+
+
+def load_assignment_index(
+    camper_ids: Iterable[int] | dict[int, Hashable],
+    *,
+    exclude_ids: Iterable[int] = (),
+) -> AssignmentIntervalIndex:
+    """
+    Index the stored assignments of ``camper_ids`` with one query. Pass a
+    dict to key campers by something other than their id. Assignments in
+    ``exclude_ids`` are left out, typically because they are being replaced.
+    """
+    camper_keys = camper_ids if isinstance(camper_ids, dict) else {camper_id: camper_id for camper_id in camper_ids}
+    index = AssignmentIntervalIndex()
+    if not camper_keys:
+        return index
+    queryset = CamperBunkAssignment.objects.filter(camper_id__in=list(camper_keys))
+    exclude_ids = [pk for pk in exclude_ids if pk is not None]
+    if exclude_ids:
+        queryset = queryset.exclude(pk__in=exclude_ids)
+    for row in queryset.order_by("start_date", "id").values(*INTERVAL_FIELDS):
+        index.add(AssignmentInterval(
+            camper=camper_keys[row["camper_id"]],
+            start_date=row["start_date"],
+            end_date=row["end_date"],
+            is_active=row["is_active"],
+            assignment_id=row["id"],
+            bunk_id=row["bunk_id"],
+        ))
+    return index
+
+
+def find_assignment_conflicts(proposed: Iterable[AssignmentInterval]) -> list[AssignmentConflict]:
+    """
+    Validate a batch of proposed assignments (camper keyed by id) against the
+    stored ones and each other. Proposed intervals replace the stored version
+    of the same assignment.
+    """
+    proposed = list(proposed)
+    index = load_assignment_index(
+        {interval.camper for interval in proposed},
+        exclude_ids={interval.assignment_id for interval in proposed},
+    )
+    return index.check_batch(proposed)
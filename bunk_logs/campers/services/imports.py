@@ -1,14 +1,28 @@
-import csv
-from pathlib import Path
+from datetime import date
 from typing import Any
 
 from campers.models import Camper
 from campers.models import CamperBunkAssignment
+from campers.overlaps import AssignmentInterval
+from campers.overlaps import conflict_messages
+from campers.overlaps import load_assignment_index
+from campers.signals import camper_bunk_assignments_bulk_saved
+from campers.signals import campers_bulk_saved
+from django.db import IntegrityError
 from django.db import transaction
+from django.utils import timezone
+from imports.streaming import CsvSource
+from imports.streaming import Progress
+from imports.streaming import csv_dict_reader
+from imports.streaming import iter_batches
+from imports.streaming import report_result
 
-from bunks.models import Bunk
-from bunks.models import Cabin
-from bunks.models import Session
+from bunks.services.references import NormalizedName
+from bunks.services.references import ReferenceResolver
+from bunks.services.references import clean_name
+from bunks.services.references import normalize_name
+
+BULK_BATCH_SIZE = 1000
 
 
 class CamperImportError(ValueError):
@@ -16,6 +30,18 @@ class CamperImportError(ValueError):
 
     MISSING_FIRST_NAME = "First name is required"
     MISSING_LAST_NAME = "Last name is required"
+    INVALID_DATE_OF_BIRTH = "Invalid date of birth '{0}', expected YYYY-MM-DD"
+    MULTIPLE_CAMPERS_FOUND = "Multiple campers found matching {0} {1}"
+
+
+# Fields a camper CSV row can fill in; names are part of the match key
+CAMPER_DETAIL_FIELDS = (
+    "date_of_birth",
+    "emergency_contact_name",
+    "emergency_contact_phone",
+    "camper_notes",
+    "parent_notes",
+)
 
 
 def _validate_camper_names(first_name: str, last_name: str) -> None:
@@ -26,55 +52,210 @@ def _validate_camper_names(first_name: str, last_name: str) -> None:
         raise CamperImportError(CamperImportError.MISSING_LAST_NAME)
 
 
-def import_campers_from_csv(file_path, *, dry_run=False):
-    """Import campers from CSV file."""
-    success_count = 0
-    error_records = []
-    file_path = Path(file_path)
-
-    with file_path.open() as csv_file:
-        reader = csv.DictReader(csv_file)
-
-        for row in reader:
-            try:
-                # Data validation
-                _validate_row_names(row)
-
-                # Prepare data
-                camper_data = {
-                    "first_name": row["first_name"],
-                    "last_name": row["last_name"],
-                    "date_of_birth": row.get("date_of_birth") or None,
-                    "emergency_contact_name": row.get("emergency_contact_name") or "",
-                    "emergency_contact_phone": row.get("emergency_contact_phone") or "",
-                    "camper_notes": row.get("camper_notes") or "",
-                    "parent_notes": row.get("parent_notes") or "",
-                }
-
-                # Create camper
-                camper = Camper(**camper_data)
-                if not dry_run:
-                    camper.save()
-
-                success_count += 1
-            except ValueError as e:
-                error_records.append({"row": reader.line_num, "error": str(e)})
+def _parse_camper_row(row: dict[str, str]) -> dict[str, Any]:
+    """Validate and normalize one camper row without touching the database."""
+    first_name = clean_name(row.get("first_name"))
+    last_name = clean_name(row.get("last_name"))
+    _validate_camper_names(first_name, last_name)
+
+    raw_date_of_birth = (row.get("date_of_birth") or "").strip()
+    date_of_birth = None
+    if raw_date_of_birth:
+        try:
+            date_of_birth = date.fromisoformat(raw_date_of_birth)
+        except ValueError as err:
+            error_msg = CamperImportError.INVALID_DATE_OF_BIRTH.format(raw_date_of_birth)
+            raise CamperImportError(error_msg) from err
 
     return {
-        "success_count": success_count,
-        "error_count": len(error_records),
+        "first_name": first_name,
+        "last_name": last_name,
+        "date_of_birth": date_of_birth,
+        "emergency_contact_name": (row.get("emergency_contact_name") or "").strip(),
+        "emergency_contact_phone": (row.get("emergency_contact_phone") or "").strip(),
+        "camper_notes": (row.get("camper_notes") or "").strip(),
+        "parent_notes": (row.get("parent_notes") or "").strip(),
+    }
+
+
+def _camper_key(first_name, last_name, date_of_birth, *, match_date_of_birth: bool) -> tuple:
+    key = (normalize_name(first_name), normalize_name(last_name))
+    return (*key, date_of_birth) if match_date_of_birth else key
+
+
+def _preload_campers_by_key(
+    name_keys: set[tuple[str, str]],
+    *,
+    match_date_of_birth: bool,
+) -> dict[tuple, list[Camper]]:
+    """Map match key to the existing campers with that key, in one query."""
+    campers: dict[tuple, list[Camper]] = {}
+    if not name_keys:
+        return campers
+    queryset = Camper.objects.annotate(
+        first_key=NormalizedName("first_name"),
+        last_key=NormalizedName("last_name"),
+    ).filter(
+        first_key__in={first for first, _ in name_keys},
+        last_key__in={last for _, last in name_keys},
+    )
+    for camper in queryset:
+        if (camper.first_key, camper.last_key) not in name_keys:
+            continue
+        key = _camper_key(
+            camper.first_name,
+            camper.last_name,
+            camper.date_of_birth,
+            match_date_of_birth=match_date_of_birth,
+        )
+        campers.setdefault(key, []).append(camper)
+    return campers
+
+
+def _camper_changes(camper: Camper, data: dict[str, Any]) -> dict[str, list]:
+    """
+    Fields the row would change, as ``{field: [old, new]}``. Blank values in
+    the row never clear what is already stored.
+    """
+    changes = {}
+    for field in CAMPER_DETAIL_FIELDS:
+        new = data[field]
+        old = getattr(camper, field)
+        if new not in (None, "") and new != old:
+            changes[field] = [old, new]
+    return changes
+
+
+def import_campers_from_csv(
+    source: CsvSource,
+    *,
+    dry_run: bool = False,
+    match_date_of_birth: bool = False,
+    batch_size: int = BULK_BATCH_SIZE,
+    progress: Progress | None = None,
+    start_row: int = 0,
+) -> dict[str, Any]:
+    """
+    Import campers from a CSV path or stream of bytes chunks.
+
+    Expected CSV format:
+    first_name,last_name,date_of_birth,emergency_contact_name,emergency_contact_phone,camper_notes,parent_notes
+
+    Rows are matched to existing campers by name, ignoring case and extra
+    whitespace, and also by date of birth when ``match_date_of_birth`` is
+    set. Rows are handled ``batch_size`` at a time: each batch loads its
+    existing campers with one query, matched campers get the row's non-blank
+    details, unmatched ones are created, and repeated rows for the same
+    camper merge into one. Each batch is written with bulk_create and
+    bulk_update in its own transaction, so later batches match the campers
+    earlier ones created. A dry run writes nothing, so there a camper
+    repeated in two batches is reported as created twice. The first
+    ``start_row`` data rows are skipped, for resuming an interrupted import.
+
+    Besides the usual counts the result has a ``diff`` with one entry per
+    valid row: its action (created, updated or skipped when nothing would
+    change) and, for updates, the changed fields as ``[old, new]`` pairs.
+    """
+    error_records: list[dict[str, Any]] = []
+    diff: list[dict[str, Any]] = []
+    result = {
+        "success_count": 0,
+        "created": 0,
+        "updated": 0,
+        "skipped": 0,
+        "error_count": 0,
         "errors": error_records,
+        "diff": diff,
     }
+    reader = csv_dict_reader(source)
+    rows = ((reader.line_num, row) for row in reader)
+    for batch in iter_batches(rows, batch_size, skip=start_row, progress=report_result(progress, result)):
+        counted = len(diff)
+        _import_camper_batch(
+            batch,
+            error_records,
+            diff,
+            dry_run=dry_run,
+            match_date_of_birth=match_date_of_birth,
+        )
+        for entry in diff[counted:]:
+            result[entry["action"]] += 1
+        result["success_count"] = result["created"] + result["updated"]
+        result["error_count"] = len(error_records)
+
+    return result
 
 
-def _validate_row_names(row: dict[str, str]) -> None:
-    """Validate that row has required name fields."""
-    if not row.get("first_name"):
-        msg = "First name is required"
-        raise ValueError(msg)
-    if not row.get("last_name"):
-        msg = "Last name is required"
-        raise ValueError(msg)
+def _import_camper_batch(
+    rows: list[tuple[int, dict[str, str]]],
+    error_records: list[dict[str, Any]],
+    diff: list[dict[str, Any]],
+    *,
+    dry_run: bool,
+    match_date_of_birth: bool,
+) -> None:
+    # 1. Validate the batch in memory
+    parsed = []
+    for line_num, row in rows:
+        try:
+            parsed.append((line_num, _parse_camper_row(row)))
+        except CamperImportError as e:
+            error_records.append({"row": line_num, "error": str(e)})
+
+    # 2. Preload every existing camper with a matching name
+    existing = _preload_campers_by_key(
+        {(normalize_name(data["first_name"]), normalize_name(data["last_name"])) for _, data in parsed},
+        match_date_of_birth=match_date_of_birth,
+    )
+
+    # 3. Match each row to a stored camper, or to one created earlier in the batch
+    pending: dict[tuple, Camper] = {}
+    to_update: dict[int, Camper] = {}
+    updated_fields: set[str] = set()
+    for line_num, data in parsed:
+        key = _camper_key(
+            data["first_name"],
+            data["last_name"],
+            data["date_of_birth"],
+            match_date_of_birth=match_date_of_birth,
+        )
+        matches = existing.get(key, [])
+        if len(matches) > 1:
+            error_msg = CamperImportError.MULTIPLE_CAMPERS_FOUND.format(data["first_name"], data["last_name"])
+            error_records.append({"row": line_num, "error": error_msg})
+            continue
+
+        camper = matches[0] if matches else pending.get(key)
+        entry = {"row": line_num, "camper": f"{data['first_name']} {data['last_name']}"}
+        if camper is None:
+            pending[key] = Camper(**data)
+            diff.append({**entry, "action": "created"})
+            continue
+
+        changes = _camper_changes(camper, data)
+        for field, (_, new) in changes.items():
+            setattr(camper, field, new)
+        if camper.pk:
+            entry["camper_id"] = camper.pk
+            if changes:
+                to_update[camper.pk] = camper
+                updated_fields.update(changes)
+        if changes:
+            diff.append({**entry, "action": "updated", "changes": changes})
+        else:
+            diff.append({**entry, "action": "skipped"})
+
+    # 4. Write the batch in one transaction
+    if not dry_run and (pending or to_update):
+        now = timezone.now()
+        for camper in to_update.values():
+            camper.updated_at = now
+        with transaction.atomic():
+            Camper.objects.bulk_create(list(pending.values()))
+            Camper.objects.bulk_update(list(to_update.values()), [*sorted(updated_fields), "updated_at"])
+        if to_update:
+            # Bulk writes do not send post_save
+            campers_bulk_saved.send(sender=Camper, camper_ids=list(to_update))
 
 
 class CamperBunkAssignmentError(ValueError):
@@ -87,7 +268,16 @@ class CamperBunkAssignmentError(ValueError):
     SESSION_NOT_FOUND = "Session '{0}' not found"
     BUNK_NOT_FOUND = "Bunk with cabin '{0}' and session '{1}' not found"
     MULTIPLE_BUNKS_FOUND = "Multiple bunks found with cabin '{0}' and session '{1}'"
+    MULTIPLE_CABINS_FOUND = "Multiple cabins found with name '{0}'"
+    MULTIPLE_SESSIONS_FOUND = "Multiple sessions found with name '{0}'"
     MULTIPLE_CAMPERS_FOUND = "Multiple campers found with name {0} {1}"
+    MULTIPLE_ASSIGNMENTS_FOUND = "Multiple assignments found for {0} {1} in {2}"
+    INVALID_DATE = "Invalid date '{0}', expected YYYY-MM-DD"
+    END_BEFORE_START = "End date cannot be before start date."
+    CONCURRENT_OVERLAP = (
+        "Batch rolled back: an assignment saved while the import ran clashes with one of its rows. "
+        "Run the import again."
+    )
 
 
 def _validate_camper_bunk_assignment_names(
@@ -115,163 +305,251 @@ def _validate_cabin_session(cabin_name: str, session_name: str) -> None:
         raise CamperBunkAssignmentError(error)
 
 
-def _find_or_create_camper(
-    camper_first_name: str,
-    camper_last_name: str,
-    *,  # Make dry_run a keyword-only parameter
-    dry_run: bool,
-) -> Camper:
-    """Find existing camper or create a new one if not found."""
+def _parse_date(value: str | None) -> date | None:
+    """Parse an optional YYYY-MM-DD date."""
+    value = (value or "").strip()
+    if not value:
+        return None
     try:
-        return Camper.objects.get(
-            first_name__iexact=camper_first_name,
-            last_name__iexact=camper_last_name,
-        )
-    except Camper.DoesNotExist:
-        # Create a new camper
-        camper = Camper(
-            first_name=camper_first_name,
-            last_name=camper_last_name,
-            date_of_birth=None,  # Set to None to avoid validation error
-            emergency_contact_name="",
-            emergency_contact_phone="",
-            camper_notes="",
-            parent_notes="",
-        )
-        if not dry_run:
-            camper.save()
-        return camper
-    except Camper.MultipleObjectsReturned as err:
-        error_msg = CamperBunkAssignmentError.MULTIPLE_CAMPERS_FOUND.format(
-            camper_first_name,
-            camper_last_name,
-        )
+        return date.fromisoformat(value)
+    except ValueError as err:
+        error_msg = CamperBunkAssignmentError.INVALID_DATE.format(value)
         raise CamperBunkAssignmentError(error_msg) from err
 
 
-def _find_cabin(cabin_name: str) -> Cabin:
-    """Find cabin by name."""
-    try:
-        return Cabin.objects.get(name__iexact=cabin_name)
-    except Cabin.DoesNotExist as err:
-        error_msg = CamperBunkAssignmentError.CABIN_NOT_FOUND.format(cabin_name)
-        raise CamperBunkAssignmentError(error_msg) from err
-
-
-def _find_session(session_name: str) -> Session:
-    """Find session by name."""
-    try:
-        return Session.objects.get(name__iexact=session_name)
-    except Session.DoesNotExist as err:
-        error_msg = CamperBunkAssignmentError.SESSION_NOT_FOUND.format(session_name)
-        raise CamperBunkAssignmentError(error_msg) from err
-
-
-def _find_bunk(
-    cabin: Cabin,
-    session: Session,
-    cabin_name: str,
-    session_name: str,
-) -> Bunk:
-    """Find bunk by cabin and session."""
-    try:
-        return Bunk.objects.get(cabin=cabin, session=session)
-    except Bunk.DoesNotExist as err:
-        error_msg = CamperBunkAssignmentError.BUNK_NOT_FOUND.format(
-            cabin_name,
-            session_name,
-        )
-        raise CamperBunkAssignmentError(error_msg) from err
-    except Bunk.MultipleObjectsReturned as err:
-        error_msg = CamperBunkAssignmentError.MULTIPLE_BUNKS_FOUND.format(
-            cabin_name,
-            session_name,
-        )
-        raise CamperBunkAssignmentError(error_msg) from err
+def _parse_is_active(is_active_str: str) -> bool:
+    """Parse is_active field from string."""
+    is_active_str = is_active_str.strip().lower()
+    return is_active_str not in ("false", "0", "no", "n")
 
 
-def _process_assignment_row(
-    row: dict[str, str],
-    *,  # Make dry_run a keyword-only parameter
-    dry_run: bool,
-) -> None:
-    """Process a single row of bunk assignment data."""
-    # Extract camper information
-    camper_first_name = row.get("camper_first_name", "").strip()
-    camper_last_name = row.get("camper_last_name", "").strip()
+def _parse_assignment_row(row: dict[str, str]) -> dict[str, Any]:
+    """Validate and normalize one assignment row without touching the database."""
+    camper_first_name = clean_name(row.get("camper_first_name"))
+    camper_last_name = clean_name(row.get("camper_last_name"))
     _validate_names(camper_first_name, camper_last_name)
 
-    # Find or create camper
-    camper = _find_or_create_camper(camper_first_name, camper_last_name, dry_run)
-
-    # Extract and validate cabin/session
-    cabin_name = row.get("cabin_name", "").strip()
-    session_name = row.get("session_name", "").strip()
+    cabin_name = clean_name(row.get("cabin_name"))
+    session_name = clean_name(row.get("session_name"))
     _validate_cabin_session(cabin_name, session_name)
 
-    # Find cabin, session, and bunk
-    cabin = _find_cabin(cabin_name)
-    session = _find_session(session_name)
-    bunk = _find_bunk(cabin, session, cabin_name, session_name)
-
-    # Parse dates and active status
-    start_date = row.get("start_date", "").strip() or None
-    end_date = row.get("end_date", "").strip() or None
-    is_active = _parse_is_active(row.get("is_active", ""))
-
-    # Create or update assignment if not dry run
-    if not dry_run:
-        CamperBunkAssignment.objects.update_or_create(
-            camper=camper,
-            bunk=bunk,
-            defaults={
-                "start_date": start_date,
-                "end_date": end_date,
-                "is_active": is_active,
-            },
-        )
+    start_date = _parse_date(row.get("start_date"))
+    end_date = _parse_date(row.get("end_date"))
+    if start_date and end_date and start_date > end_date:
+        raise CamperBunkAssignmentError(CamperBunkAssignmentError.END_BEFORE_START)
+
+    return {
+        "camper_first_name": camper_first_name,
+        "camper_last_name": camper_last_name,
+        "camper_key": (normalize_name(camper_first_name), normalize_name(camper_last_name)),
+        "cabin_name": cabin_name,
+        "session_name": session_name,
+        "start_date": start_date,
+        "end_date": end_date,
+        "is_active": _parse_is_active(row.get("is_active") or ""),
+    }
 
 
-def _parse_is_active(is_active_str: str) -> bool:
-    """Parse is_active field from string."""
-    is_active_str = is_active_str.strip().lower()
-    return is_active_str not in ("false", "0", "no", "n")
+def _resolve_one(matches: list, not_found: str, multiple: str, *args):
+    if not matches:
+        raise CamperBunkAssignmentError(not_found.format(*args))
+    if len(matches) > 1:
+        raise CamperBunkAssignmentError(multiple.format(*args))
+    return matches[0]
 
 
 def import_bunk_assignments_from_csv(
-    file_path: str | Path,
+    source: CsvSource,
     *,
     dry_run: bool = False,
+    batch_size: int = BULK_BATCH_SIZE,
+    progress: Progress | None = None,
+    start_row: int = 0,
 ) -> dict[str, Any]:
     """
-    Import camper bunk assignments from CSV file.
+    Import camper bunk assignments from a CSV path or stream of bytes chunks.
 
     Expected CSV format:
     camper_first_name,camper_last_name,cabin_name,session_name,start_date,end_date,is_active
+
+    Set-based, ``batch_size`` rows at a time: for each batch, cabins,
+    sessions and bunks come from one ReferenceResolver, and campers and the
+    campers' current assignments are loaded with one query each (names
+    compared as normalize_name does). Overlaps are checked in memory against
+    a campers.overlaps interval index, and the batch is written with
+    bulk_create/bulk_update in one transaction before the next is read.
+    Rows are matched to existing assignments on (camper, bunk), and a later
+    row for the same pair wins. Campers that do not exist yet are created.
+    A dry run writes nothing between batches, so rows are only checked
+    against the database and their own batch. Rows before ``start_row`` are
+    skipped.
     """
-    success_count = 0
     error_records: list[dict[str, Any]] = []
-    file_path = Path(file_path)
-
-    with file_path.open() as csv_file:
-        reader = csv.DictReader(csv_file)
-
-        for row in reader:
-            # Process each row in its own transaction
-            try:
-                with transaction.atomic():
-                    _process_assignment_row(row, dry_run)
-                    success_count += 1
-            except (ValueError, CamperBunkAssignmentError) as e:
-                error_records.append(
-                    {
-                        "row": row,
-                        "error": str(e),
-                    },
+    result = {"success_count": 0, "error_count": 0, "errors": error_records}
+    batches = iter_batches(csv_dict_reader(source), batch_size, skip=start_row, progress=report_result(progress, result))
+    for rows in batches:
+        result["success_count"] += _import_assignment_batch(rows, error_records, dry_run=dry_run)
+        result["error_count"] = len(error_records)
+
+    return result
+
+
+def _import_assignment_batch(
+    rows: list[dict[str, str]],
+    error_records: list[dict[str, Any]],
+    *,
+    dry_run: bool,
+) -> int:
+    """Import one batch of assignment rows; returns how many were accepted."""
+    success_count = 0
+
+    # 1. Validate the batch in memory
+    parsed = []
+    for row in rows:
+        try:
+            parsed.append((row, _parse_assignment_row(row)))
+        except CamperBunkAssignmentError as e:
+            error_records.append({"row": row, "error": str(e)})
+
+    # 2. Preload reference data for the batch
+    references = ReferenceResolver(
+        cabins={data["cabin_name"] for _, data in parsed},
+        sessions={data["session_name"] for _, data in parsed},
+        bunks=True,
+    )
+    campers = _preload_campers_by_key(
+        {data["camper_key"] for _, data in parsed},
+        match_date_of_birth=False,
+    )
+    camper_ids = {camper.id: key for key, matches in campers.items() for camper in matches}
+
+    # Per-camper interval index of the stored assignments, keyed by name
+    index = load_assignment_index(camper_ids)
+
+    # 3. Resolve and check each row; accepted rows join the index
+    new_campers: dict[tuple[str, str], Camper] = {}
+    accepted: dict[tuple[tuple[str, str], int], tuple[AssignmentInterval, Camper]] = {}
+    for row, data in parsed:
+        try:
+            cabin = _resolve_one(
+                references.cabins.get(data["cabin_name"]),
+                CamperBunkAssignmentError.CABIN_NOT_FOUND,
+                CamperBunkAssignmentError.MULTIPLE_CABINS_FOUND,
+                data["cabin_name"],
+            )
+            session = _resolve_one(
+                references.sessions.get(data["session_name"]),
+                CamperBunkAssignmentError.SESSION_NOT_FOUND,
+                CamperBunkAssignmentError.MULTIPLE_SESSIONS_FOUND,
+                data["session_name"],
+            )
+            bunk = references.bunks.get((cabin.id, session.id))
+            if bunk is None:
+                error_msg = CamperBunkAssignmentError.BUNK_NOT_FOUND.format(
+                    data["cabin_name"],
+                    data["session_name"],
+                )
+                raise CamperBunkAssignmentError(error_msg)
+
+            camper_key = data["camper_key"]
+            matches = campers.get(camper_key, [])
+            if len(matches) > 1:
+                error_msg = CamperBunkAssignmentError.MULTIPLE_CAMPERS_FOUND.format(
+                    data["camper_first_name"],
+                    data["camper_last_name"],
                 )
+                raise CamperBunkAssignmentError(error_msg)
+            # Campers that do not exist yet are created, once per name
+            camper = matches[0] if matches else new_campers.get(camper_key) or Camper(
+                first_name=data["camper_first_name"],
+                last_name=data["camper_last_name"],
+            )
+
+            # The stored assignment in this bunk, or the row accepted for it
+            # earlier in the batch, is the one this row replaces
+            if (camper_key, bunk.id) in accepted:
+                replaced = accepted[(camper_key, bunk.id)][0]
+            else:
+                stored = [
+                    interval for interval in index.intervals(camper_key)
+                    if interval.bunk_id == bunk.id
+                ]
+                if len(stored) > 1:
+                    error_msg = CamperBunkAssignmentError.MULTIPLE_ASSIGNMENTS_FOUND.format(
+                        data["camper_first_name"],
+                        data["camper_last_name"],
+                        bunk.name,
+                    )
+                    raise CamperBunkAssignmentError(error_msg)
+                replaced = stored[0] if stored else None
+
+            candidate = AssignmentInterval(
+                camper=camper_key,
+                # Same defaults CamperBunkAssignment.save() applies
+                start_date=data["start_date"] or bunk.session.start_date,
+                end_date=data["end_date"] or bunk.session.end_date,
+                is_active=data["is_active"],
+                assignment_id=replaced.assignment_id if replaced else None,
+                bunk_id=bunk.id,
+                ref=row,
+            )
+            conflicts = [
+                conflict for conflict in index.conflicts(candidate)
+                if conflict.other is not replaced
+            ]
+            if conflicts:
+                raise CamperBunkAssignmentError(" ".join(conflict_messages(conflicts)))
+        except CamperBunkAssignmentError as e:
+            error_records.append({"row": row, "error": str(e)})
+            continue
+
+        if not camper.pk:
+            new_campers[camper_key] = camper
+        if replaced:
+            index.remove(replaced)
+        index.add(candidate)
+        accepted[(camper_key, bunk.id)] = (candidate, camper)
+        success_count += 1
+
+    # 4. Write the batch in one transaction
+    if not dry_run and accepted:
+        now = timezone.now()
+        to_create = []
+        to_update = []
+        for interval, camper in accepted.values():
+            assignment = CamperBunkAssignment(
+                id=interval.assignment_id,
+                camper=camper,
+                bunk_id=interval.bunk_id,
+                start_date=interval.start_date,
+                end_date=interval.end_date,
+                is_active=interval.is_active,
+                updated_at=now,
+            )
+            (to_update if interval.assignment_id else to_create).append(assignment)
+        # The constraints are checked row by row, so assignments are
+        # deactivated before any of the same camper is activated or created
+        fields = ["start_date", "end_date", "is_active", "updated_at"]
+        deactivated = [assignment for assignment in to_update if not assignment.is_active]
+        try:
+            with transaction.atomic():
+                Camper.objects.bulk_create(list(new_campers.values()))
+                CamperBunkAssignment.objects.bulk_update(deactivated, fields)
+                CamperBunkAssignment.objects.bulk_update(
+                    [assignment for assignment in to_update if assignment.is_active],
+                    fields,
+                )
+                CamperBunkAssignment.objects.bulk_create(to_create)
+        except IntegrityError as e:
+            # Another write created an overlap after the preload; nothing in this batch was saved
+            if CamperBunkAssignment.violation_message(e) is None:
+                raise
+            error_records.append({"row": None, "error": CamperBunkAssignmentError.CONCURRENT_OVERLAP})
+            return 0
+        # Bulk writes do not send post_save
+        camper_bunk_assignments_bulk_saved.send(
+            sender=CamperBunkAssignment,
+            bunk_ids={interval.bunk_id for interval, _ in accepted.values()},
+        )
 
-    return {
-        "success_count": success_count,
-        "error_count": len(error_records),
-        "errors": error_records,
-    }
+    return success_count
@@ -0,0 +1,10 @@
+from django.dispatch import Signal
+
+# Sent after CamperBunkAssignment rows are written with bulk_create/bulk_update,
+# which skip the per-instance post_save signal. Receivers get ``bunk_ids``: the
+# bunks whose assignments were created or changed.
+camper_bunk_assignments_bulk_saved = Signal()
+
+# Same for Camper rows; receivers get ``camper_ids``: the campers that were
+# changed. New campers have no assignments yet, so they are not included.
+campers_bulk_saved = Signal()
@@ -1 +1,291 @@
-# Create your tests here.
+import tempfile
+from datetime import date
+from pathlib import Path
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError
+from django.db import connection
+from django.db import transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from bunks.models import Bunk, Cabin, Session
+from campers.models import Camper, CamperBunkAssignment
+from campers.overlaps import AssignmentInterval
+from campers.overlaps import find_assignment_conflicts
+from campers.services.imports import import_bunk_assignments_from_csv
+from campers.services.imports import import_campers_from_csv
+
+CAMPER_HEADER = "first_name,last_name,date_of_birth,emergency_contact_name,emergency_contact_phone"
+ASSIGNMENT_HEADER = "camper_first_name,camper_last_name,cabin_name,session_name,start_date,end_date,is_active"
+
+
+class BulkCamperImportTest(TestCase):
+    def _write_csv(self, rows):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as csv_file:
+            csv_file.write("\n".join([CAMPER_HEADER, *rows]))
+        self.addCleanup(Path(csv_file.name).unlink)
+        return csv_file.name
+
+    def test_reimport_matches_normalized_names(self):
+        camper = Camper.objects.create(first_name="Mary Ann", last_name="Smith", emergency_contact_name="Pat")
+        rows = [
+            " mary   ann ,SMITH,2014-05-01,Pat,555-0100",
+            "Mary Ann,Smith,,,",
+            "Leo,Jones,,,",
+            "leo,jones,2015-02-02,,",
+            "Nia,,,,",
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            result = import_campers_from_csv(self._write_csv(rows))
+        # One preload, one insert, one update, the savepoint pair and the
+        # roster invalidation lookup for updated campers
+        self.assertLessEqual(len(queries), 6)
+
+        self.assertEqual((result["created"], result["updated"], result["skipped"]), (1, 2, 1))
+        self.assertEqual(result["errors"], [{"row": 6, "error": "Last name is required"}])
+        self.assertEqual(
+            result["diff"][0]["changes"],
+            {"date_of_birth": [None, date(2014, 5, 1)], "emergency_contact_phone": ["", "555-0100"]},
+        )
+        self.assertEqual(Camper.objects.count(), 2)
+        camper.refresh_from_db()
+        self.assertEqual(camper.date_of_birth, date(2014, 5, 1))
+        self.assertEqual(Camper.objects.get(last_name="Jones").date_of_birth, date(2015, 2, 2))
+
+    def test_match_date_of_birth_keeps_namesakes_apart(self):
+        Camper.objects.create(first_name="Sam", last_name="Lee", date_of_birth=date(2013, 1, 1))
+        result = import_campers_from_csv(
+            self._write_csv(["Sam,Lee,2013-01-01,,", "Sam,Lee,2016-07-07,,"]),
+            match_date_of_birth=True,
+        )
+        self.assertEqual([entry["action"] for entry in result["diff"]], ["skipped", "created"])
+        self.assertEqual(Camper.objects.filter(last_name="Lee").count(), 2)
+
+
+class BulkAssignmentImportTest(TestCase):
+    def setUp(self):
+        self.session = Session.objects.create(
+            name="Summer 2025",
+            start_date="2025-06-01",
+            end_date="2025-08-31"
+        )
+        self.bunks = {
+            name: Bunk.objects.create(
+                cabin=Cabin.objects.create(name=name, capacity=10),
+                session=self.session,
+            )
+            for name in ("A1", "B2")
+        }
+
+    def _write_csv(self, rows):
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as csv_file:
+            csv_file.write("\n".join([ASSIGNMENT_HEADER, *rows]))
+        self.addCleanup(Path(csv_file.name).unlink)
+        return csv_file.name
+
+    def test_imports_file_with_a_fixed_number_of_queries(self):
+        rows = [f"Camper{i},Test,{'A1' if i % 2 else 'b2'},summer 2025,,,true" for i in range(40)]
+        with CaptureQueriesContext(connection) as queries:
+            result = import_bunk_assignments_from_csv(self._write_csv(rows))
+        self.assertEqual(result["success_count"], 40)
+        self.assertEqual(result["error_count"], 0)
+        self.assertEqual(Camper.objects.count(), 40)
+        self.assertEqual(CamperBunkAssignment.objects.filter(bunk=self.bunks["A1"]).count(), 20)
+        assignment = CamperBunkAssignment.objects.first()
+        self.assertEqual(assignment.start_date, date(2025, 6, 1))
+        self.assertEqual(assignment.end_date, date(2025, 8, 31))
+        self.assertLess(len(queries), 15)
+
+    def test_reimport_updates_matching_assignment(self):
+        camper = Camper.objects.create(first_name="John", last_name="Smith")
+        assignment = CamperBunkAssignment.objects.create(camper=camper, bunk=self.bunks["A1"])
+
+        result = import_bunk_assignments_from_csv(self._write_csv([
+            "john,SMITH,A1,Summer 2025,2025-06-01,2025-07-15,false",
+        ]))
+        self.assertEqual(result["success_count"], 1)
+        assignment.refresh_from_db()
+        self.assertEqual(assignment.end_date, date(2025, 7, 15))
+        self.assertFalse(assignment.is_active)
+        self.assertEqual(Camper.objects.count(), 1)
+
+    def test_moves_the_active_assignment_within_a_batch(self):
+        camper = Camper.objects.create(first_name="John", last_name="Smith")
+        CamperBunkAssignment.objects.create(
+            camper=camper,
+            bunk=self.bunks["A1"],
+            start_date=date(2025, 6, 1),
+            end_date=date(2025, 6, 30),
+        )
+        # The new active row is written only after the old one is deactivated
+        result = import_bunk_assignments_from_csv(self._write_csv([
+            "John,Smith,A1,Summer 2025,2025-06-01,2025-06-30,false",
+            "John,Smith,B2,Summer 2025,2025-07-01,2025-07-31,true",
+        ]))
+        self.assertEqual(result["error_count"], 0)
+        self.assertEqual(
+            list(CamperBunkAssignment.objects.filter(is_active=True).values_list("bunk", flat=True)),
+            [self.bunks["B2"].pk],
+        )
+
+    def test_reports_overlaps_against_database_and_file(self):
+        camper = Camper.objects.create(first_name="John", last_name="Smith")
+        CamperBunkAssignment.objects.create(
+            camper=camper,
+            bunk=self.bunks["A1"],
+            start_date="2025-06-01",
+            end_date="2025-06-30",
+        )
+        result = import_bunk_assignments_from_csv(self._write_csv([
+            "John,Smith,B2,Summer 2025,2025-06-15,2025-07-15,false",
+            "Jane,Doe,A1,Summer 2025,2025-06-01,2025-06-30,true",
+            "Jane,Doe,B2,Summer 2025,2025-07-01,2025-07-31,true",
+            "Jane,Doe,C3,Summer 2025,,,true",
+        ]))
+        self.assertEqual(result["success_count"], 1)
+        self.assertEqual(
+            [error["error"] for error in result["errors"]],
+            [
+                CamperBunkAssignment.OVERLAPPING_ASSIGNMENT_ERROR,
+                "Camper already has an active bunk assignment.",
+                "Cabin 'C3' not found",
+            ],
+        )
+        self.assertEqual(CamperBunkAssignment.objects.count(), 2)
+
+    def test_dry_run_writes_nothing(self):
+        result = import_bunk_assignments_from_csv(
+            self._write_csv(["Jane,Doe,A1,Summer 2025,,,true"]),
+            dry_run=True,
+        )
+        self.assertEqual(result["success_count"], 1)
+        self.assertFalse(Camper.objects.exists())
+        self.assertFalse(CamperBunkAssignment.objects.exists())
+
+
+class AssignmentOverlapTest(TestCase):
+    def setUp(self):
+        session = Session.objects.create(
+            name="Summer 2025",
+            start_date="2025-06-01",
+            end_date="2025-08-31"
+        )
+        self.bunk = Bunk.objects.create(cabin=Cabin.objects.create(name="A1", capacity=10), session=session)
+        self.camper = Camper.objects.create(first_name="John", last_name="Smith")
+        self.june = CamperBunkAssignment.objects.create(
+            camper=self.camper,
+            bunk=self.bunk,
+            start_date=date(2025, 6, 1),
+            end_date=date(2025, 6, 30),
+        )
+
+    def _interval(self, start, end, *, is_active=True):
+        return AssignmentInterval(
+            camper=self.camper.id,
+            start_date=date.fromisoformat(start),
+            end_date=date.fromisoformat(end),
+            is_active=is_active,
+        )
+
+    def test_batch_reports_every_conflict_in_one_query(self):
+        proposed = [
+            self._interval("2025-06-15", "2025-07-15"),
+            self._interval("2025-07-01", "2025-07-31", is_active=False),
+            self._interval("2025-07-20", "2025-08-10", is_active=False),
+        ]
+        with self.assertNumQueries(1):
+            conflicts = find_assignment_conflicts(proposed)
+        self.assertEqual(
+            [(conflict.interval, conflict.message) for conflict in conflicts],
+            [
+                (proposed[0], CamperBunkAssignment.OVERLAPPING_ASSIGNMENT_ERROR),
+                (proposed[0], CamperBunkAssignment.ACTIVE_ASSIGNMENT_ERROR),
+                (proposed[2], CamperBunkAssignment.OVERLAPPING_ASSIGNMENT_ERROR),
+            ],
+        )
+        self.assertIs(conflicts[2].other, proposed[1])
+
+    def test_clean_uses_the_shared_rules(self):
+        overlapping = CamperBunkAssignment(
+            camper=self.camper,
+            bunk=self.bunk,
+            start_date=date(2025, 6, 20),
+            end_date=date(2025, 7, 20),
+        )
+        with self.assertRaises(ValidationError) as raised:
+            overlapping.clean()
+        self.assertEqual(
+            raised.exception.messages,
+            [CamperBunkAssignment.OVERLAPPING_ASSIGNMENT_ERROR, CamperBunkAssignment.ACTIVE_ASSIGNMENT_ERROR],
+        )
+        # Saving an existing assignment does not clash with itself
+        self.june.end_date = date(2025, 7, 5)
+        self.june.save()
+
+    def test_save_leaves_both_rules_to_the_database(self):
+        august = CamperBunkAssignment(
+            camper=self.camper,
+            bunk=self.bunk,
+            start_date=date(2025, 8, 1),
+            end_date=date(2025, 8, 31),
+        )
+        with CaptureQueriesContext(connection) as queries:
+            with self.assertRaisesMessage(ValidationError, CamperBunkAssignment.ACTIVE_ASSIGNMENT_ERROR):
+                august.save()
+        # No read before the write
+        self.assertFalse([query for query in queries.captured_queries if query["sql"].startswith("SELECT")])
+        august.is_active = False
+        august.save()
+
+    def test_full_clean_checks_the_rules_once(self):
+        august = CamperBunkAssignment(
+            camper=self.camper,
+            bunk=self.bunk,
+            start_date=date(2025, 8, 1),
+            end_date=date(2025, 8, 31),
+        )
+        # clean() covers both constraints, so they are not validated again
+        with CaptureQueriesContext(connection) as queries, self.assertRaises(ValidationError) as raised:
+            august.full_clean()
+        self.assertEqual(raised.exception.messages, [CamperBunkAssignment.ACTIVE_ASSIGNMENT_ERROR])
+        assignment_queries = [
+            query for query in queries.captured_queries
+            if 'FROM "campers_camperbunkassignment"' in query["sql"]
+        ]
+        self.assertEqual(len(assignment_queries), 1)
+
+    def test_database_rejects_overlapping_active_assignments(self):
+        # Bulk writes skip clean(), so the constraints have to catch them
+        july, august = CamperBunkAssignment.objects.bulk_create([
+            CamperBunkAssignment(
+                camper=self.camper,
+                bunk=self.bunk,
+                start_date=date(2025, 6, 30),
+                end_date=date(2025, 7, 31),
+                is_active=False,
+            ),
+            CamperBunkAssignment(
+                camper=self.camper,
+                bunk=self.bunk,
+                start_date=date(2025, 8, 1),
+                end_date=date(2025, 8, 31),
+                is_active=False,
+            ),
+        ])
+        with self.assertRaises(IntegrityError) as raised, transaction.atomic():
+            CamperBunkAssignment.objects.filter(pk=july.pk).update(is_active=True)
+        self.assertEqual(
+            CamperBunkAssignment.violation_message(raised.exception),
+            CamperBunkAssignment.OVERLAPPING_ASSIGNMENT_ERROR,
+        )
+        with self.assertRaises(IntegrityError) as raised, transaction.atomic():
+            CamperBunkAssignment.objects.filter(pk=august.pk).update(is_active=True)
+        self.assertEqual(
+            CamperBunkAssignment.violation_message(raised.exception),
+            CamperBunkAssignment.ACTIVE_ASSIGNMENT_ERROR,
+        )
+
+        july.is_active = True
+        with self.assertRaisesMessage(ValidationError, CamperBunkAssignment.OVERLAPPING_ASSIGNMENT_ERROR):
+            july.save()
@@ -0,0 +1,128 @@
+from django.contrib import admin
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.shortcuts import render
+from django.urls import path
+from django.urls import reverse
+
+from .models import ImportJob
+from .models import ImportRun
+from .services import CHANGELIST_URLS
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "importer",
+        "status",
+        "dry_run",
+        "total_rows",
+        "success_count",
+        "error_count",
+        "created_by",
+        "created_at",
+        "finished_at",
+    )
+    list_filter = ("importer", "status", "dry_run")
+    readonly_fields = (
+        "importer",
+        "csv_file",
+        "dry_run",
+        "options",
+        "status",
+        "total_rows",
+        "processed_rows",
+        "success_count",
+        "error_count",
+        "errors",
+        "run",
+        "created_by",
+        "created_at",
+        "started_at",
+        "finished_at",
+    )
+
+    def has_add_permission(self, request):
+        # Jobs are created by the import views of each model admin
+        return False
+
+    def get_urls(self):
+        urls = super().get_urls()
+        custom_urls = [
+            path(
+                "<int:job_id>/progress/",
+                self.admin_site.admin_view(self.progress_view),
+                name="imports_importjob_progress",
+            ),
+            path(
+                "<int:job_id>/status/",
+                self.admin_site.admin_view(self.status_view),
+                name="imports_importjob_status",
+            ),
+        ]
+        return custom_urls + urls
+
+    def progress_view(self, request, job_id):
+        """Page that polls the job status until the worker finishes it."""
+        job = get_object_or_404(ImportJob, pk=job_id)
+        context = {
+            **self.admin_site.each_context(request),
+            "job": job,
+            "title": f"Import job #{job.pk}",
+            "opts": self.opts,
+            "status_url": reverse("admin:imports_importjob_status", args=[job.pk]),
+            "changelist_url": reverse(CHANGELIST_URLS[job.importer]),
+        }
+        return render(request, "admin/imports/importjob/progress.html", context)
+
+    def status_view(self, request, job_id):
+        job = get_object_or_404(ImportJob, pk=job_id)
+        return JsonResponse({
+            "id": job.pk,
+            "importer": job.get_importer_display(),
+            "status": job.status,
+            "finished": job.is_finished,
+            "dry_run": job.dry_run,
+            "total_rows": job.total_rows,
+            "processed_rows": job.processed_rows,
+            "success_count": job.success_count,
+            "error_count": job.error_count,
+            "errors": job.errors,
+            "run": job.run_id,
+        })
+
+
+@admin.register(ImportRun)
+class ImportRunAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "importer",
+        "status",
+        "rows_committed",
+        "attempts",
+        "success_count",
+        "error_count",
+        "created_at",
+        "finished_at",
+    )
+    list_filter = ("importer", "status")
+    search_fields = ("file_hash",)
+    readonly_fields = (
+        "importer",
+        "file_hash",
+        "options",
+        "status",
+        "rows_committed",
+        "attempts",
+        "success_count",
+        "error_count",
+        "errors",
+        "created_at",
+        "checkpointed_at",
+        "finished_at",
+    )
+
+    def has_add_permission(self, request):
+        # Runs are recorded by the import worker
+        return False
@@ -0,0 +1,53 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from imports.services import claim_next_job
+from imports.services import requeue_stale_jobs
+from imports.services import run_job
+
+
+class Command(BaseCommand):
+    help = "Runs queued CSV import jobs. Keeps polling the job table unless --once is given."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process every queued job and exit instead of polling",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=5.0,
+            help="Seconds to wait between polls when the queue is empty",
+        )
+
+    def handle(self, *args, **options):
+        once = options["once"]
+        poll_interval = options["poll_interval"]
+
+        while True:
+            # Jobs left running by a worker that died go back on the queue
+            requeued = requeue_stale_jobs()
+            if requeued:
+                self.stdout.write(f"Requeued {requeued} stalled jobs")
+            job = claim_next_job()
+            if job is None:
+                if once:
+                    return
+                time.sleep(poll_interval)
+                continue
+
+            self.stdout.write(f"Running {job}")
+            job = run_job(job)
+            if job.status == job.SKIPPED:
+                self.stdout.write(f"Skipped {job}: the file was already imported by run #{job.run_id}")
+                continue
+            style = self.style.SUCCESS if job.status == job.SUCCEEDED else self.style.ERROR
+            self.stdout.write(
+                style(
+                    f"Finished {job}: {job.success_count} imported, "
+                    f"{job.error_count} errors",
+                ),
+            )
@@ -0,0 +1,48 @@
+# Generated by Django 5.0.13 on 2026-10-16 22:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('imports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('importer', models.CharField(choices=[('units', 'Units'), ('cabins', 'Cabins'), ('bunks', 'Bunks'), ('campers', 'Campers'), ('assignments', 'Camper bunk assignments'), ('bunk_logs', 'Bunk logs')], max_length=32)),
+                ('file_hash', models.CharField(max_length=64)),
+                ('options', models.JSONField(blank=True, default=dict)),
+                ('status', models.CharField(choices=[('running', 'Running'), ('failed', 'Failed'), ('completed', 'Completed')], default='running', max_length=16)),
+                ('rows_committed', models.PositiveIntegerField(default=0)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('success_count', models.PositiveIntegerField(default=0)),
+                ('error_count', models.PositiveIntegerField(default=0)),
+                ('errors', models.JSONField(blank=True, default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('checkpointed_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'import run',
+                'verbose_name_plural': 'import runs',
+                'ordering': ['-created_at'],
+                'constraints': [models.UniqueConstraint(fields=('importer', 'file_hash', 'options'), name='importrun_unique_file')],
+            },
+        ),
+        migrations.AlterField(
+            model_name='importjob',
+            name='status',
+            field=models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed'), ('skipped', 'Skipped (already imported)')], default='queued', max_length=16),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='run',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to='imports.importrun'),
+        ),
+    ]
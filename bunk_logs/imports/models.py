@@ -0,0 +1,135 @@
+from django.conf import settings
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class ImportJob(models.Model):
+    """CSV import queued from the admin and run by the process_import_jobs worker."""
+
+    UNITS = "units"
+    CABINS = "cabins"
+    BUNKS = "bunks"
+    CAMPERS = "campers"
+    ASSIGNMENTS = "assignments"
+    BUNK_LOGS = "bunk_logs"
+
+    IMPORTER_CHOICES = [
+        (UNITS, "Units"),
+        (CABINS, "Cabins"),
+        (BUNKS, "Bunks"),
+        (CAMPERS, "Campers"),
+        (ASSIGNMENTS, "Camper bunk assignments"),
+        (BUNK_LOGS, "Bunk logs"),
+    ]
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (SUCCEEDED, "Succeeded"),
+        (FAILED, "Failed"),
+        (SKIPPED, "Skipped (already imported)"),
+    ]
+
+    importer = models.CharField(max_length=32, choices=IMPORTER_CHOICES)
+    csv_file = models.FileField(upload_to="imports/%Y/%m/%d/")
+    dry_run = models.BooleanField(default=False)
+    # Extra keyword arguments for the importer, e.g. default_counselor_email
+    options = models.JSONField(default=dict, blank=True)
+
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=QUEUED)
+    total_rows = models.PositiveIntegerField(null=True, blank=True)
+    processed_rows = models.PositiveIntegerField(default=0)
+    success_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    # Ledger entry for the file; dry runs write nothing and have none
+    run = models.ForeignKey(
+        "ImportRun",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="jobs",
+    )
+
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="import_jobs",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("import job")
+        verbose_name_plural = _("import jobs")
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="importjob_status_created_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.get_importer_display()} import #{self.pk} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.SUCCEEDED, self.FAILED, self.SKIPPED)
+
+
+class ImportRun(models.Model):
+    """
+    Ledger entry for one file imported by one importer with one set of options.
+
+    Jobs for an identical upload share a run: the file is matched by its
+    SHA-256 hash. ``rows_committed`` is the cursor of the last batch saved,
+    so a job for a run that was interrupted resumes after it, and a job for
+    a completed run is skipped. Counts and errors add up over the attempts
+    that finished.
+    """
+
+    RUNNING = "running"
+    FAILED = "failed"
+    COMPLETED = "completed"
+
+    STATUS_CHOICES = [
+        (RUNNING, "Running"),
+        (FAILED, "Failed"),
+        (COMPLETED, "Completed"),
+    ]
+
+    importer = models.CharField(max_length=32, choices=ImportJob.IMPORTER_CHOICES)
+    file_hash = models.CharField(max_length=64)
+    options = models.JSONField(default=dict, blank=True)
+
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=RUNNING)
+    rows_committed = models.PositiveIntegerField(default=0)
+    attempts = models.PositiveIntegerField(default=0)
+    success_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    checkpointed_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = _("import run")
+        verbose_name_plural = _("import runs")
+        ordering = ["-created_at"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["importer", "file_hash", "options"],
+                name="importrun_unique_file",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_importer_display()} run #{self.pk} ({self.status}, {self.rows_committed} rows)"
@@ -0,0 +1,236 @@
+import hashlib
+import logging
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from bunklogs.services.imports import import_bunk_logs_from_csv
+from bunks.services.imports import import_bunks_from_csv
+from bunks.services.imports import import_cabins_from_csv
+from bunks.services.imports import import_units_from_csv
+from campers.services.imports import import_bunk_assignments_from_csv
+from campers.services.imports import import_campers_from_csv
+
+from .models import ImportJob
+from .models import ImportRun
+
+logger = logging.getLogger(__name__)
+
+# Keep job rows small; error_count still reflects every failed row
+MAX_STORED_ERRORS = 1000
+
+IMPORTERS = {
+    ImportJob.UNITS: import_units_from_csv,
+    ImportJob.CABINS: import_cabins_from_csv,
+    ImportJob.BUNKS: import_bunks_from_csv,
+    ImportJob.CAMPERS: import_campers_from_csv,
+    ImportJob.ASSIGNMENTS: import_bunk_assignments_from_csv,
+    ImportJob.BUNK_LOGS: import_bunk_logs_from_csv,
+}
+
+# Where the progress page links back to once a job is done
+CHANGELIST_URLS = {
+    ImportJob.UNITS: "admin:bunks_unit_changelist",
+    ImportJob.CABINS: "admin:bunks_cabin_changelist",
+    ImportJob.BUNKS: "admin:bunks_bunk_changelist",
+    ImportJob.CAMPERS: "admin:campers_camper_changelist",
+    ImportJob.ASSIGNMENTS: "admin:campers_camperbunkassignment_changelist",
+    ImportJob.BUNK_LOGS: "admin:bunklogs_bunklog_changelist",
+}
+
+
+class ImportRunError(ValueError):
+    ALREADY_RUNNING = "An identical file is still being imported by run #{}"
+
+
+def enqueue_import(
+    importer: str,
+    csv_file,
+    *,
+    dry_run: bool = False,
+    user=None,
+    options: dict[str, Any] | None = None,
+) -> ImportJob:
+    """Store the uploaded file and queue it for the import worker."""
+    return ImportJob.objects.create(
+        importer=importer,
+        csv_file=csv_file,
+        dry_run=dry_run,
+        options=options or {},
+        created_by=user,
+    )
+
+
+def claim_next_job() -> ImportJob | None:
+    """
+    Take the oldest queued job and mark it running.
+    SKIP LOCKED lets several workers poll the same table without
+    picking up the same job.
+    """
+    with transaction.atomic():
+        job = (
+            ImportJob.objects.select_for_update(skip_locked=True)
+            .filter(status=ImportJob.QUEUED)
+            .order_by("created_at")
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = ImportJob.RUNNING
+        job.started_at = timezone.now()
+        job.save(update_fields=["status", "started_at"])
+    return job
+
+
+def requeue_stale_jobs() -> int:
+    """
+    Put running jobs whose worker has died back on the queue, returning how
+    many were requeued. A job is stale once its run has not checkpointed
+    within IMPORT_RUN_STALE_AFTER; when claimed again, start_run resumes the
+    run after its cursor. A dry run has no run, so it is requeued once it
+    started that long ago; running it again is harmless as it writes nothing.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.IMPORT_RUN_STALE_AFTER)
+    return (
+        ImportJob.objects.filter(status=ImportJob.RUNNING)
+        .filter(Q(run__checkpointed_at__lt=cutoff) | Q(run__isnull=True, started_at__lt=cutoff))
+        .update(status=ImportJob.QUEUED)
+    )
+
+
+def _normalize_result(result: dict[str, Any]) -> tuple[int, list]:
+    """Importers report slightly different shapes; reduce them to (successes, errors)."""
+    errors = result.get("errors", [])
+    if "success_count" in result:
+        return result["success_count"], errors
+    # import_bunks_from_csv reports created/updated counts instead
+    return result.get("created", 0) + result.get("updated", 0), errors
+
+
+def file_hash(csv_file) -> str:
+    """SHA-256 of a stored upload, read a chunk at a time."""
+    digest = hashlib.sha256()
+    with csv_file.open("rb") as stored:
+        for chunk in stored.chunks():
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _record_counts(run: ImportRun, earlier: tuple[int, int, list], result: dict[str, Any]) -> None:
+    """Set a run's counts to those of its earlier attempts plus this attempt's so far."""
+    success_count, errors = _normalize_result(result)
+    earlier_success, earlier_error_count, earlier_errors = earlier
+    run.success_count = earlier_success + success_count
+    run.error_count = earlier_error_count + len(errors)
+    run.errors = earlier_errors + errors[:max(MAX_STORED_ERRORS - len(earlier_errors), 0)]
+
+
+def start_run(job: ImportJob) -> ImportRun:
+    """
+    Find or create the ledger entry for a job's file and claim it for the job.
+    A completed run is returned as it is, for the caller to skip the job. A
+    run still checkpointing within IMPORT_RUN_STALE_AFTER belongs to another
+    live job; any other unfinished run is resumed.
+    """
+    digest = file_hash(job.csv_file)
+    with transaction.atomic():
+        run, created = ImportRun.objects.select_for_update().get_or_create(
+            importer=job.importer,
+            file_hash=digest,
+            options=job.options,
+        )
+        if run.status == ImportRun.COMPLETED:
+            return run
+        now = timezone.now()
+        if (
+            not created
+            and run.status == ImportRun.RUNNING
+            and run.checkpointed_at is not None
+            and run.checkpointed_at > now - timedelta(seconds=settings.IMPORT_RUN_STALE_AFTER)
+        ):
+            raise ImportRunError(ImportRunError.ALREADY_RUNNING.format(run.pk))
+        run.status = ImportRun.RUNNING
+        run.attempts += 1
+        run.checkpointed_at = now
+        run.save(update_fields=["status", "attempts", "checkpointed_at"])
+    return run
+
+
+def run_job(job: ImportJob) -> ImportJob:
+    """
+    Run a claimed job and record its counts and errors.
+
+    Jobs that write are tracked by an ImportRun: the run's cursor moves
+    after every committed batch, together with the counts and errors so
+    far, and an interrupted run picks up after its cursor the next time the
+    same file is imported, adding to the counts its earlier attempts
+    checkpointed. If the worker dies between a batch commit and its
+    checkpoint, that batch is imported again on resume, which is harmless
+    as every importer upserts.
+    """
+    importer = IMPORTERS[job.importer]
+    run = None
+    earlier = None
+
+    def record_progress(rows_done, result):
+        job.processed_rows = rows_done
+        job.save(update_fields=["processed_rows"])
+        if run is not None:
+            run.rows_committed = rows_done
+            run.checkpointed_at = timezone.now()
+            _record_counts(run, earlier, result)
+            run.save(update_fields=["rows_committed", "checkpointed_at", "success_count", "error_count", "errors"])
+
+    try:
+        job.processed_rows = 0
+        if not job.dry_run:
+            run = start_run(job)
+            job.run = run
+            if run.status == ImportRun.COMPLETED:
+                job.status = ImportJob.SKIPPED
+                job.finished_at = timezone.now()
+                job.save()
+                return job
+            earlier = (run.success_count, run.error_count, run.errors)
+            job.processed_rows = run.rows_committed
+            # requeue_stale_jobs goes by the run's checkpoints from here on
+            job.save(update_fields=["run", "processed_rows"])
+
+        # Stream the stored upload straight into the importer, which
+        # decodes, validates and writes it a batch at a time
+        with job.csv_file.open("rb") as stored:
+            result = importer(
+                stored.chunks(),
+                dry_run=job.dry_run,
+                progress=record_progress,
+                start_row=job.processed_rows,
+                **job.options,
+            )
+        success_count, errors = _normalize_result(result)
+        job.success_count = success_count
+        job.error_count = len(errors)
+        job.errors = errors[:MAX_STORED_ERRORS]
+        job.total_rows = job.processed_rows
+        job.status = ImportJob.SUCCEEDED
+        if run is not None:
+            run.status = ImportRun.COMPLETED
+            run.rows_committed = job.processed_rows
+            _record_counts(run, earlier, result)
+            run.checkpointed_at = run.finished_at = timezone.now()
+            run.save()
+    except Exception as e:
+        logger.exception("Import job %s failed", job.pk)
+        job.status = ImportJob.FAILED
+        job.errors = [f"Import failed: {e!s}"]
+        job.error_count = 1
+        if run is not None:
+            run.status = ImportRun.FAILED
+            run.save(update_fields=["status"])
+
+    job.finished_at = timezone.now()
+    job.save()
+    return job
@@ -0,0 +1,99 @@
+"""
+Streaming CSV input for the importers.
+
+Importers accept a path or any iterable of bytes chunks, such as
+``UploadedFile.chunks()`` or the chunks of a stored ``FieldFile``.
+``csv_dict_reader`` decodes the chunks incrementally and feeds
+``csv.DictReader`` one line at a time, and ``iter_batches`` groups the rows
+into fixed-size lists. An importer validates and writes one batch before the
+next is read, so memory use is bounded by the batch size rather than the
+file, nothing is copied to disk, and the first batch is saved while the
+rest of the upload is still being parsed. ``report_result`` hands an
+importer's running result to its ``progress`` callback after each batch.
+"""
+import codecs
+import csv
+import os
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from itertools import batched
+from itertools import islice
+from typing import Any
+
+CSV_ENCODING = "utf-8-sig"
+CHUNK_SIZE = 64 * 1024
+
+# A path, an object with a chunks() method, or an iterable of bytes (or str) chunks
+CsvSource = str | os.PathLike | Iterable[bytes] | Any
+
+# Called with the rows handled so far and the import's result up to them
+Progress = Callable[[int, dict[str, Any]], None]
+
+
+def iter_chunks(source: CsvSource, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes | str]:
+    """Yield the raw chunks of ``source`` without reading it all at once."""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as csv_file:
+            while chunk := csv_file.read(chunk_size):
+                yield chunk
+    elif hasattr(source, "chunks"):
+        yield from source.chunks(chunk_size)
+    else:
+        yield from source
+
+
+def iter_lines(chunks: Iterable[bytes | str], encoding: str = CSV_ENCODING) -> Iterator[str]:
+    """
+    Decode chunks incrementally and yield lines with their newline kept, so
+    quoted fields spanning lines still parse. A multi-byte character or a
+    line split across chunks is held back until the rest arrives.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ""
+    for chunk in chunks:
+        pending += decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def csv_dict_reader(source: CsvSource, *, encoding: str = CSV_ENCODING) -> csv.DictReader:
+    """A ``csv.DictReader`` over ``source`` that reads it chunk by chunk."""
+    return csv.DictReader(iter_lines(iter_chunks(source), encoding))
+
+
+def iter_batches(
+    rows: Iterable,
+    size: int,
+    *,
+    skip: int = 0,
+    progress: Callable[[int], None] | None = None,
+) -> Iterator[list]:
+    """
+    Yield lists of up to ``size`` rows. ``progress`` is called with the
+    number of rows handled so far once the caller has finished each batch.
+    The first ``skip`` rows are read and dropped, and count as handled, so
+    a resumed import reports progress through the whole file.
+    """
+    rows = iter(rows)
+    done = sum(1 for _ in islice(rows, skip))
+    for batch in batched(rows, size):
+        yield list(batch)
+        done += len(batch)
+        if progress is not None:
+            progress(done)
+
+
+def report_result(progress: Progress | None, result: dict[str, Any]) -> Callable[[int], None] | None:
+    """
+    Adapt an importer's ``progress`` callback for ``iter_batches``: each
+    call also receives ``result``, the counts and errors the importer has
+    gathered so far, so a checkpoint can record them with its row count.
+    """
+    if progress is None:
+        return None
+    return lambda done: progress(done, result)
@@ -0,0 +1,177 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.test import override_settings
+from django.utils import timezone
+
+from bunks.models import Cabin
+from bunks.services import imports as cabin_imports
+from bunks.services.imports import import_cabins_from_csv
+from imports.models import ImportJob
+from imports.models import ImportRun
+from imports.services import claim_next_job
+from imports.services import enqueue_import
+from imports.services import file_hash
+from imports.services import requeue_stale_jobs
+from imports.services import run_job
+from imports.streaming import csv_dict_reader
+from imports.streaming import iter_batches
+
+
+class ImportJobTest(TestCase):
+    def _enqueue(self, content, *, dry_run=False):
+        upload = SimpleUploadedFile("cabins.csv", content.encode(), content_type="text/csv")
+        return enqueue_import(ImportJob.CABINS, upload, dry_run=dry_run)
+
+    def test_worker_claims_and_runs_queued_job(self):
+        job = self._enqueue("name,capacity\nCabin A,10\nCabin B,12\n")
+        self.assertEqual(job.status, ImportJob.QUEUED)
+
+        claimed = claim_next_job()
+        self.assertEqual(claimed.pk, job.pk)
+        self.assertEqual(claimed.status, ImportJob.RUNNING)
+        self.assertIsNone(claim_next_job())
+
+        run_job(claimed)
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.SUCCEEDED)
+        self.assertEqual(job.total_rows, 2)
+        self.assertEqual(job.processed_rows, 2)
+        self.assertEqual(job.success_count, 2)
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(Cabin.objects.count(), 2)
+
+    def test_dry_run_job_writes_nothing(self):
+        self._enqueue("name,capacity\nCabin A,10\n", dry_run=True)
+        run_job(claim_next_job())
+        self.assertFalse(Cabin.objects.exists())
+
+
+class ImportRunTest(TestCase):
+    CONTENT = "name,capacity\n" + "".join(f"Cabin {i},10\n" for i in range(5))
+
+    def _run(self):
+        upload = SimpleUploadedFile("cabins.csv", self.CONTENT.encode(), content_type="text/csv")
+        enqueue_import(ImportJob.CABINS, upload)
+        return run_job(claim_next_job())
+
+    def test_identical_upload_is_skipped(self):
+        first = self._run()
+        self.assertEqual(first.status, ImportJob.SUCCEEDED)
+        self.assertEqual(first.run.status, ImportRun.COMPLETED)
+        self.assertEqual(first.run.rows_committed, 5)
+
+        second = self._run()
+        self.assertEqual(second.status, ImportJob.SKIPPED)
+        self.assertEqual(second.run, first.run)
+        self.assertEqual(first.run.jobs.count(), 2)
+        self.assertEqual(Cabin.objects.count(), 5)
+
+    def test_interrupted_run_resumes_after_its_cursor(self):
+        upload = SimpleUploadedFile("cabins.csv", self.CONTENT.encode(), content_type="text/csv")
+        job = enqueue_import(ImportJob.CABINS, upload)
+        # A worker died after committing two rows and never checkpointed again
+        run = ImportRun.objects.create(
+            importer=ImportJob.CABINS,
+            file_hash=file_hash(job.csv_file),
+            rows_committed=2,
+            attempts=1,
+            success_count=2,
+        )
+
+        job = run_job(claim_next_job())
+        self.assertEqual(job.status, ImportJob.SUCCEEDED)
+        self.assertEqual(job.success_count, 3)
+        self.assertEqual(job.total_rows, 5)
+        run.refresh_from_db()
+        self.assertEqual((run.status, run.rows_committed, run.attempts), (ImportRun.COMPLETED, 5, 2))
+        # The ledger counts the rows of both attempts
+        self.assertEqual(run.success_count, 5)
+        self.assertEqual(
+            sorted(Cabin.objects.values_list("name", flat=True)),
+            ["Cabin 2", "Cabin 3", "Cabin 4"],
+        )
+
+    def test_interrupted_attempt_keeps_its_checkpointed_counts(self):
+        upload = SimpleUploadedFile("cabins.csv", self.CONTENT.encode(), content_type="text/csv")
+        enqueue_import(ImportJob.CABINS, upload, options={"batch_size": 2})
+        import_batch = cabin_imports._import_cabin_batch
+
+        def fail_on_third_batch(rows, **kwargs):
+            if Cabin.objects.count() == 4:
+                raise RuntimeError("Worker lost")
+            return import_batch(rows, **kwargs)
+
+        with mock.patch.object(cabin_imports, "_import_cabin_batch", side_effect=fail_on_third_batch):
+            job = run_job(claim_next_job())
+        self.assertEqual(job.status, ImportJob.FAILED)
+        self.assertEqual((job.run.rows_committed, job.run.success_count), (4, 4))
+
+        upload = SimpleUploadedFile("cabins.csv", self.CONTENT.encode(), content_type="text/csv")
+        enqueue_import(ImportJob.CABINS, upload, options={"batch_size": 2})
+        job = run_job(claim_next_job())
+        self.assertEqual(job.success_count, 1)
+        job.run.refresh_from_db()
+        self.assertEqual((job.run.status, job.run.success_count), (ImportRun.COMPLETED, 5))
+
+    @override_settings(IMPORT_RUN_STALE_AFTER=60)
+    def test_job_of_a_dead_worker_is_requeued_and_resumed(self):
+        upload = SimpleUploadedFile("cabins.csv", self.CONTENT.encode(), content_type="text/csv")
+        enqueue_import(ImportJob.CABINS, upload)
+        job = claim_next_job()
+        # The worker checkpointed two rows and died
+        job.run = ImportRun.objects.create(
+            importer=ImportJob.CABINS,
+            file_hash=file_hash(job.csv_file),
+            rows_committed=2,
+            attempts=1,
+            success_count=2,
+            checkpointed_at=timezone.now(),
+        )
+        job.save()
+        self.assertEqual(requeue_stale_jobs(), 0)
+
+        ImportRun.objects.update(checkpointed_at=timezone.now() - timedelta(minutes=2))
+        self.assertEqual(requeue_stale_jobs(), 1)
+        job = run_job(claim_next_job())
+        self.assertEqual(job.status, ImportJob.SUCCEEDED)
+        self.assertEqual((job.run.rows_committed, job.run.success_count), (5, 5))
+
+
+class StreamingCsvTest(TestCase):
+    def test_reader_handles_rows_split_across_chunks(self):
+        content = '\ufeffname,notes\r\nCafé,"two\nlines"\r\nLodge,plain\r\n'.encode()
+        # One-byte chunks split the BOM, the multi-byte é and every line ending
+        rows = list(csv_dict_reader(content[i:i + 1] for i in range(len(content))))
+        self.assertEqual(rows, [
+            {"name": "Café", "notes": "two\nlines"},
+            {"name": "Lodge", "notes": "plain"},
+        ])
+
+    def test_importer_writes_each_batch_as_it_streams(self):
+        upload = SimpleUploadedFile(
+            "cabins.csv",
+            ("name,capacity\n" + "".join(f"Cabin {i},10\n" for i in range(5))).encode(),
+            content_type="text/csv",
+        )
+        saved_per_batch = []
+
+        def progress(rows_done, result):
+            saved_per_batch.append((rows_done, result["success_count"], Cabin.objects.count()))
+
+        result = import_cabins_from_csv(upload.chunks(chunk_size=8), batch_size=2, progress=progress)
+        self.assertEqual(result["success_count"], 5)
+        self.assertEqual(saved_per_batch, [(2, 2, 2), (4, 4, 4), (5, 5, 5)])
+
+    def test_batches_report_progress_after_each_batch(self):
+        seen = []
+        batches = list(iter_batches(range(5), 2, progress=seen.append))
+        self.assertEqual(batches, [[0, 1], [2, 3], [4]])
+        self.assertEqual(seen, [2, 4, 5])
+
+        seen.clear()
+        batches = list(iter_batches(range(5), 2, skip=3, progress=seen.append))
+        self.assertEqual(batches, [[3, 4]])
+        self.assertEqual(seen, [5])
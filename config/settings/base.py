@@ -97,6 +97,7 @@ LOCAL_APPS = [
     "bunk_logs.bunklogs",
     "bunk_logs.tickets",
     "bunk_logs.api",
+    "bunk_logs.imports",
     # Your stuff: custom apps go here
 ]
 # https://docs.djangoproject.com/en/dev/ref/settings/#installed-apps
@@ -148,6 +149,7 @@ AUTH_PASSWORD_VALIDATORS = [
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "bunk_logs.api.middleware.QueryMetricsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -335,11 +337,13 @@ ACCOUNT_LOGOUT_REDIRECT_URL = 'http://localhost:5173/signin'
 # django-rest-framework - https://www.django-rest-framework.org/api-guide/settings/
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "bunk_logs.api.authentication.CachedJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",  # Keep for admin use
     ],
     "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.IsAuthenticated"],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_PAGINATION_CLASS": "bunk_logs.api.pagination.KeysetCursorPagination",
+    "PAGE_SIZE": env.int("API_PAGE_SIZE", default=100),
 }
 
 # django-cors-headers - https://github.com/adamchainz/django-cors-headers#setup
@@ -458,3 +462,34 @@ INTERNAL_IPS = [
 ]
 
 
+
+# Bunk log roster cache
+# ------------------------------------------------------------------------------
+# Seconds to keep /api/v1/bunklogs/<bunk_id>/logs/<date>/ responses cached.
+# Writes invalidate the affected keys, so these are only upper bounds.
+BUNKLOG_ROSTER_CACHE_TIMEOUT = env.int("BUNKLOG_ROSTER_CACHE_TIMEOUT", default=60 * 5)
+BUNKLOG_ROSTER_CACHE_PAST_TIMEOUT = env.int("BUNKLOG_ROSTER_CACHE_PAST_TIMEOUT", default=60 * 60 * 24)
+
+# API access scope cache
+# ------------------------------------------------------------------------------
+# Seconds a user's cached access scope (their bunks and units) is kept; it is
+# also dropped whenever counselor, unit head or bunk unit assignments change.
+ACCESS_SCOPE_CACHE_TIMEOUT = env.int("ACCESS_SCOPE_CACHE_TIMEOUT", default=3600)
+# Upper bound in seconds on how long an access token's user principal is
+# cached; it never outlives the token, and saving the user drops it. A bulk
+# update() sends no signal, so a user deactivated that way keeps
+# authenticating until their principals expire.
+AUTH_PRINCIPAL_CACHE_TIMEOUT = env.int("AUTH_PRINCIPAL_CACHE_TIMEOUT", default=60 * 5)
+
+# Camper care watchlist cache
+# ------------------------------------------------------------------------------
+# Seconds each bunk's camper risk scores are kept; log writes to a bunk also
+# drop its scores straight away.
+CAMPER_RISK_CACHE_TIMEOUT = env.int("CAMPER_RISK_CACHE_TIMEOUT", default=60 * 60)
+
+# Import run ledger
+# ------------------------------------------------------------------------------
+# Seconds without a checkpoint after which a running import run is taken to
+# have died, so a new job for the same file resumes it instead of failing and
+# the import worker puts the run's job back on the queue.
+IMPORT_RUN_STALE_AFTER = env.int("IMPORT_RUN_STALE_AFTER", default=60 * 15)